@@ -0,0 +1,352 @@
+# availability.py
+"""
+팀 가능 시간 계산용 비트마스크 엔진.
+
+- (날짜, 블록)마다 '바쁜 팀원' 집합을 정수 비트마스크로 저장
+  (i번째 비트 = user_ids[i]가 그 블록에 일정이 있음)
+- 블록별 가능 인원 수 = 전체 인원 - popcount(바쁜 마스크)
+- 전원 가능 = 바쁜 마스크가 0
+
+팀원 수가 수백 명이어도 블록 하나당 정수 연산 한 번이라
+users × blocks × days 파이썬 루프를 돌 필요가 없다.
+
+- AvailabilityCube: 여러 팀 / 긴 기간용 users × days × blocks 큐브
+- TeamAvailability: 큐브를 한 팀의 팀원들로 제한한 뷰
+- TeamAvailability.best_slots: 연속 블록 구간을 참석 가능 인원순으로 상위 k개 추천
+
+일정 추가/이동/삭제는 add_schedule / remove_schedule로 해당 블록만 고치고,
+실제로 바뀐 (날짜, 블록) 칸만 돌려준다. (전체 재계산 X)
+"""
+import heapq
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils import get_block_count
+
+
+def block_mask(start_block: int, end_block: int) -> int:
+    """start_block ~ end_block(포함)을 나타내는 블록 비트마스크 (1블록 = 0번 비트)"""
+    if end_block < start_block:
+        return 0
+    return ((1 << (end_block - start_block + 1)) - 1) << (start_block - 1)
+
+
+@dataclass(frozen=True)
+class MeetingSlot:
+    """추천 회의 시간 한 건: date의 start_block ~ end_block(포함) 연속 구간"""
+    date: date
+    start_block: int
+    end_block: int
+    available: int  # 구간 전체에 참석 가능한 팀원 수
+    free_members: Tuple[str, ...]
+
+
+class AvailabilityCube:
+    """
+    users × days × blocks 가용성 큐브 (start ~ end 포함).
+
+    _busy[d][b - 1] = 그 날짜/블록에 바쁜 사용자들의 user 비트마스크
+    → 사용자 축은 정수 하나에 눌러 담고, 팀별 합계는
+      popcount(바쁜 마스크 & 팀 마스크) 한 번으로 끝낸다.
+
+    여러 팀 / 학기 단위 집계도 스케줄 row 한 번 훑어서 만든 큐브 하나로
+    다시 조회하지 않고 계산할 수 있다.
+    """
+
+    def __init__(self, user_ids: Iterable[str], start: date, end: date):
+        self.user_ids: List[str] = list(dict.fromkeys(user_ids))
+        self.user_index: Dict[str, int] = {uid: i for i, uid in enumerate(self.user_ids)}
+        self.start = start
+        self.end = end
+
+        self.days: List[date] = []
+        d = start
+        while d <= end:
+            self.days.append(d)
+            d += timedelta(days=1)
+
+        self._busy: Dict[date, List[int]] = {d: [0] * get_block_count(d) for d in self.days}
+        # (날짜, 블록, user 인덱스) → 겹쳐 있는 일정 수
+        # 일정 하나를 빼도 같은 칸에 다른 일정이 남아 있으면 비트를 유지하기 위함
+        self._refs: Dict[Tuple[date, int, int], int] = {}
+
+    @classmethod
+    def from_rows(
+        cls, user_ids: Iterable[str], rows: Iterable[Dict], start: date, end: date
+    ) -> "AvailabilityCube":
+        """schedules row(user_id, date, start_block, end_block) 목록을 한 번 훑어서 생성"""
+        cube = cls(user_ids, start, end)
+        for row in rows:
+            start_block = row.get("start_block", row.get("block", 1))
+            end_block = row.get("end_block", start_block)
+            cube.mark_busy(row["user_id"], row["date"], start_block, end_block)
+        return cube
+
+    @property
+    def size(self) -> int:
+        return len(self.user_ids)
+
+    # --- 갱신 ---
+    def mark_busy(self, user_id: str, d, start_block: int, end_block: int):
+        """user_id가 d의 start_block~end_block에 일정이 있음을 표시"""
+        self.add_schedule(user_id, d, start_block, end_block)
+
+    def add_schedule(self, user_id: str, d, start_block: int, end_block: int) -> List[Tuple[date, int]]:
+        """
+        일정 하나 추가 (증분 갱신).
+        반환: 가능 여부가 실제로 바뀐 (날짜, 블록) 칸 리스트
+        """
+        return self._apply(user_id, d, start_block, end_block, +1)
+
+    def remove_schedule(self, user_id: str, d, start_block: int, end_block: int) -> List[Tuple[date, int]]:
+        """
+        일정 하나 삭제 (증분 갱신).
+        반환: 가능 여부가 실제로 바뀐 (날짜, 블록) 칸 리스트
+        """
+        return self._apply(user_id, d, start_block, end_block, -1)
+
+    def _apply(self, user_id: str, d, start_block: int, end_block: int, delta: int) -> List[Tuple[date, int]]:
+        if isinstance(d, str):
+            d = date.fromisoformat(d[:10])
+        blocks = self._busy.get(d)
+        idx = self.user_index.get(user_id)
+        if blocks is None or idx is None:
+            # 기간 밖이거나 큐브에 없는 사용자의 일정은 무시
+            return []
+
+        bit = 1 << idx
+        changed: List[Tuple[date, int]] = []
+        for b in range(max(start_block, 1), min(end_block, len(blocks)) + 1):
+            key = (d, b, idx)
+            before = self._refs.get(key, 0)
+            after = max(before + delta, 0)
+            if after:
+                self._refs[key] = after
+            else:
+                self._refs.pop(key, None)
+
+            if before == 0 and after > 0:
+                blocks[b - 1] |= bit
+                changed.append((d, b))
+            elif before > 0 and after == 0:
+                blocks[b - 1] &= ~bit
+                changed.append((d, b))
+        return changed
+
+    # --- 사용자 마스크 ---
+    def members_mask(self, user_ids: Iterable[str] | None = None) -> int:
+        """user_id 목록 → user 비트마스크 (None이면 전체 사용자)"""
+        if user_ids is None:
+            return (1 << self.size) - 1
+        mask = 0
+        for uid in user_ids:
+            idx = self.user_index.get(uid)
+            if idx is not None:
+                mask |= 1 << idx
+        return mask
+
+    # --- 조회 ---
+    def busy_mask(self, d: date, block: int, members: int = -1) -> int:
+        """해당 블록에 바쁜 사용자 비트마스크 (members 마스크로 제한)"""
+        blocks = self._busy.get(d, [])
+        if not 1 <= block <= len(blocks):
+            return 0
+        return blocks[block - 1] & members
+
+    def counts(self, d: date, members: int | None = None) -> Dict[int, int]:
+        """{블록: 가능 인원 수} (members: user 비트마스크, None이면 전체)"""
+        if members is None:
+            members = self.members_mask()
+        n = members.bit_count()
+        return {
+            b: n - (busy & members).bit_count()
+            for b, busy in enumerate(self._busy.get(d, []), start=1)
+        }
+
+    def range_counts(self, members: int | None = None) -> Dict[date, Dict[int, int]]:
+        """{날짜: {블록: 가능 인원 수}}"""
+        return {d: self.counts(d, members) for d in self.days}
+
+    def ratios(self, d: date, members: int | None = None) -> Dict[int, float]:
+        """{블록: 가능 인원 비율(0.0~1.0)}"""
+        if members is None:
+            members = self.members_mask()
+        n = members.bit_count()
+        if n == 0:
+            return {b: 0.0 for b in range(1, len(self._busy.get(d, [])) + 1)}
+        return {b: cnt / n for b, cnt in self.counts(d, members).items()}
+
+    def team_sums(self, teams: Dict[str, Iterable[str]]) -> Dict[str, Dict[date, Dict[int, int]]]:
+        """
+        여러 팀의 기간 전체 가능 인원 수를 한 번에 계산.
+
+        teams: {team_id: [user_id, ...]}
+        반환: {team_id: {날짜: {블록: 가능 인원 수}}}
+        """
+        return {tid: self.range_counts(self.members_mask(uids)) for tid, uids in teams.items()}
+
+    def slice(self, start: date, end: date) -> "AvailabilityCube":
+        """start ~ end 기간만 잘라낸 큐브 (사용자 축은 그대로)"""
+        sub = AvailabilityCube(self.user_ids, start, end)
+        for d in sub.days:
+            if d in self._busy:
+                sub._busy[d] = list(self._busy[d])
+        sub._refs = {k: v for k, v in self._refs.items() if start <= k[0] <= end}
+        return sub
+
+    def copy(self) -> "AvailabilityCube":
+        """같은 기간 / 사용자의 독립된 복사본 (원본을 고쳐도 영향 X)"""
+        return self.slice(self.start, self.end)
+
+    def team(self, user_ids: Iterable[str]) -> "TeamAvailability":
+        """특정 팀원들로 제한한 뷰"""
+        return TeamAvailability(self, user_ids)
+
+
+class TeamAvailability:
+    """
+    AvailabilityCube를 한 팀의 팀원들로 제한한 뷰.
+
+    블록별 가능 인원 수 = 팀원 수 - popcount(바쁜 마스크 & 팀 마스크)
+    """
+
+    def __init__(self, cube: AvailabilityCube, user_ids: Iterable[str]):
+        self.cube = cube
+        self.user_ids: List[str] = [uid for uid in dict.fromkeys(user_ids) if uid in cube.user_index]
+        self.mask = cube.members_mask(self.user_ids)
+
+    @classmethod
+    def from_rows(
+        cls, user_ids: Iterable[str], rows: Iterable[Dict], start: date, end: date
+    ) -> "TeamAvailability":
+        """schedules row(user_id, date, start_block, end_block) 목록으로부터 생성"""
+        user_ids = list(user_ids)
+        return cls(AvailabilityCube.from_rows(user_ids, rows, start, end), user_ids)
+
+    @property
+    def size(self) -> int:
+        return len(self.user_ids)
+
+    @property
+    def days(self) -> List[date]:
+        return self.cube.days
+
+    def copy(self) -> "TeamAvailability":
+        """큐브까지 복사한 독립된 뷰 (공유 중인 객체를 고치지 않고 새 버전을 만들 때)"""
+        return TeamAvailability(self.cube.copy(), self.user_ids)
+
+    # --- 갱신 ---
+    def mark_busy(self, user_id: str, d, start_block: int, end_block: int):
+        self.cube.mark_busy(user_id, d, start_block, end_block)
+
+    def add_schedule(self, user_id: str, d, start_block: int, end_block: int) -> List[Tuple[date, int]]:
+        """팀원 일정 추가. 반환: 가능 인원 수가 바뀐 (날짜, 블록) 칸"""
+        if user_id not in self.user_ids:
+            return []
+        return self.cube.add_schedule(user_id, d, start_block, end_block)
+
+    def remove_schedule(self, user_id: str, d, start_block: int, end_block: int) -> List[Tuple[date, int]]:
+        """팀원 일정 삭제. 반환: 가능 인원 수가 바뀐 (날짜, 블록) 칸"""
+        if user_id not in self.user_ids:
+            return []
+        return self.cube.remove_schedule(user_id, d, start_block, end_block)
+
+    def move_schedule(self, user_id: str, old: Tuple, new: Tuple) -> List[Tuple[date, int]]:
+        """
+        팀원 일정 이동. old / new = (날짜, start_block, end_block)
+        반환: 가능 인원 수가 바뀐 (날짜, 블록) 칸 (제자리로 돌아온 칸은 제외)
+        """
+        removed = self.remove_schedule(user_id, *old)
+        added = self.add_schedule(user_id, *new)
+        # 빠졌다가 다시 들어간 칸은 결과적으로 변화 없음
+        return [c for c in removed if c not in added] + [c for c in added if c not in removed]
+
+    # --- 조회 ---
+    def busy_mask(self, d: date, block: int) -> int:
+        """해당 블록에 바쁜 팀원들의 user 비트마스크"""
+        return self.cube.busy_mask(d, block, self.mask)
+
+    def counts(self, d: date) -> Dict[int, int]:
+        """{블록: 가능 인원 수} (존재하지 않는 날짜면 {})"""
+        return self.cube.counts(d, self.mask)
+
+    def range_counts(self) -> Dict[date, Dict[int, int]]:
+        """{날짜: {블록: 가능 인원 수}} - suggest_team_range 반환 형식"""
+        return self.cube.range_counts(self.mask)
+
+    def ratios(self, d: date) -> Dict[int, float]:
+        """{블록: 가능 인원 비율(0.0~1.0)}"""
+        return self.cube.ratios(d, self.mask)
+
+    def common_free_mask(self, d: date) -> int:
+        """팀원 전원이 가능한 블록들의 블록 비트마스크"""
+        mask = 0
+        for b in range(1, len(self.cube._busy.get(d, [])) + 1):
+            if not self.busy_mask(d, b):
+                mask |= 1 << (b - 1)
+        return mask
+
+    def free_members(self, d: date, block: int) -> List[str]:
+        """해당 블록에 가능한 팀원 user_id 리스트"""
+        busy = self.busy_mask(d, block)
+        return [uid for uid in self.user_ids if not busy >> self.cube.user_index[uid] & 1]
+
+    def best_slots(
+        self,
+        duration_blocks: int,
+        top_k: int = 5,
+        required_members: Optional[Iterable[str]] = None,
+        quorum: Optional[int] = None,
+    ) -> List[MeetingSlot]:
+        """
+        duration_blocks개 연속 블록 구간 중 참석 가능 인원이 많은 순으로 top_k개.
+        (동률이면 이른 날짜/블록 먼저)
+
+        - 날짜마다 블록 창을 밀면서 바쁜 마스크를 OR → 가능 인원 = popcount(팀 마스크 & ~OR)
+        - required_members: 이 팀원들이 전부 가능한 구간만
+        - quorum: 가능 인원이 이 수 이상인 구간만
+        - 후보는 크기 top_k 힙으로만 들고 있으므로 학기 단위 기간도 메모리 걱정 없음
+        """
+        if duration_blocks < 1 or top_k < 1 or self.size == 0:
+            return []
+
+        required = self.cube.members_mask(required_members) & self.mask if required_members else 0
+        min_count = quorum or 0
+
+        # (가능 인원, -날짜 순번, -시작 블록, 바쁜 마스크) 최소 힙 → 가장 나쁜 후보가 맨 앞
+        heap: List[Tuple[int, int, int, int]] = []
+        for day_idx, d in enumerate(self.cube.days):
+            busy = [m & self.mask for m in self.cube._busy.get(d, [])]
+            for s in range(len(busy) - duration_blocks + 1):
+                window = 0
+                for m in busy[s:s + duration_blocks]:
+                    window |= m
+                if window & required:
+                    continue
+                count = self.size - window.bit_count()
+                if count < min_count:
+                    continue
+
+                item = (count, -day_idx, -(s + 1), window)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        slots = []
+        for count, neg_day, neg_start, window in sorted(heap, reverse=True):
+            start_block = -neg_start
+            slots.append(
+                MeetingSlot(
+                    date=self.cube.days[-neg_day],
+                    start_block=start_block,
+                    end_block=start_block + duration_blocks - 1,
+                    available=count,
+                    free_members=tuple(
+                        uid for uid in self.user_ids
+                        if not window >> self.cube.user_index[uid] & 1
+                    ),
+                )
+            )
+        return slots
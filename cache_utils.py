@@ -0,0 +1,68 @@
+# cache_utils.py
+"""
+캐시들이 같이 쓰는 UI 없는 도우미 (flet import 없음).
+
+- LRUCache: 크기 제한 LRU (세션 주간 캐시, 팀 캐시, 라우트 캐시)
+- week_start_of: 날짜가 속한 주의 월요일 (캐시 키)
+"""
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Hashable, List
+
+
+def week_start_of(d) -> date:
+    """날짜(또는 'YYYY-MM-DD...' 문자열)가 속한 주의 월요일"""
+    d = _as_date(d)
+    return d - timedelta(days=d.weekday())
+
+
+def _as_date(d) -> date:
+    """date / datetime / 'YYYY-MM-DD...' 문자열 → date"""
+    if isinstance(d, str):
+        return date.fromisoformat(d[:10])
+    if isinstance(d, datetime):
+        return d.date()
+    return d
+
+
+class LRUCache:
+    """크기 제한이 있는 단순 LRU (가장 오래 안 쓴 항목부터 버림)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._data.keys())
+
+    def values(self) -> List[object]:
+        # 순서(최근 사용)는 건드리지 않음
+        return list(self._data.values())
+
+    def items(self) -> List[tuple]:
+        # 순서(최근 사용)는 건드리지 않음
+        return list(self._data.items())
+
+    def get(self, key: Hashable, default=None):
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: Hashable, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
@@ -7,3 +7,10 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 DEFAULT_CITY = "Daegu,KR"  # 학교 위치 대충
+
+# /debug/queries(쿼리 계측 화면)를 볼 수 있는 이메일 (쉼표로 구분, 비어 있으면 아무도 못 봄)
+DEBUG_ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.getenv("PLANMASTER_DEBUG_ADMINS", "").split(",")
+    if email.strip()
+}
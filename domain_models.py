@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import date
 from typing import List, Optional, Dict
-from supabase_client import supabase
+from supabase_client import get_supabase
 
 
 @dataclass
@@ -13,11 +13,11 @@ class User:
     @classmethod
     def get_or_create(cls, email: str, name: str) -> "User":
         # 이미 있는지 확인
-        res = supabase.table("users").select("*").eq("email", email).execute()
+        res = get_supabase().table("users").select("*").eq("email", email).execute()
         if res.data:
             row = res.data[0]
         else:
-            res = supabase.table("users").insert({"email": email, "name": name}).execute()
+            res = get_supabase().table("users").insert({"email": email, "name": name}).execute()
             row = res.data[0]
         return cls(id=row["id"], email=row["email"], name=row["name"])
 
@@ -27,7 +27,7 @@ class User:
 from dataclasses import dataclass
 from datetime import date
 from typing import Optional, Dict, List
-from supabase_client import supabase
+from supabase_client import get_supabase
 
 
 @dataclass
@@ -71,7 +71,7 @@ class Schedule:
         is_available: bool,
         team_id: Optional[str] = None,
     ) -> "Schedule":
-        res = supabase.table("schedules").insert({
+        res = get_supabase().table("schedules").insert({
             "user_id": user_id,
             "date": date.isoformat(),
             "start_block": start_block,
@@ -84,6 +84,40 @@ class Schedule:
         }).execute()
         return cls.from_row(res.data[0])
 
+    @staticmethod
+    def save_checked(
+        user_id: str,
+        date: date,
+        start_block: int,
+        end_block: int,
+        title: str,
+        description: str,
+        is_movable: Optional[bool] = None,
+        is_available: Optional[bool] = None,
+        schedule_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        중복 체크 + insert(schedule_id 없음) / update(schedule_id 있음)를 RPC 한 번으로.
+        함수 정의: sql/save_schedule_checked.sql (겹침 제약: sql/schedules_no_overlap.sql)
+
+        반환 예시:
+            {"status": "ok", "schedule": {...}, "previous": {...} 또는 None}
+            {"status": "conflict", "conflict_title": "팀 회의"}
+            {"status": "not_found"}
+        """
+        res = get_supabase().rpc("save_schedule_checked", {
+            "p_user_id": user_id,
+            "p_date": date.isoformat(),
+            "p_start_block": start_block,
+            "p_end_block": end_block,
+            "p_title": title,
+            "p_description": description,
+            "p_is_movable": is_movable,
+            "p_is_available": is_available,
+            "p_id": schedule_id,
+        }).execute()
+        return res.data or {}
+
     @property
     def blocks(self) -> List[int]:
         """이 스케줄이 차지하는 블록 리스트 (e.g. [1,2,3])"""
@@ -98,98 +132,172 @@ class Team:
     leader_id: str
 
     @classmethod
-    def create(cls, name: str, leader_id: str) -> "Team":
-        res = supabase.table("teams").insert({
-            "name": name,
-            "leader_id": leader_id
-        }).execute()
-        row = res.data[0]
-        # 팀장도 team_members에 leader로 넣기
-        supabase.table("team_members").insert({
-            "team_id": row["id"],
-            "user_id": leader_id,
-            "role": "leader"
+    def create(cls, name: str, leader_id: str, member_ids: Optional[List[str]] = None) -> "Team":
+        # 팀 + 팀장(leader) + 팀원(member)을 RPC 한 번으로 생성 (한 트랜잭션)
+        # 함수 정의: sql/create_team_with_members.sql
+        res = get_supabase().rpc("create_team_with_members", {
+            "p_name": name,
+            "p_leader_id": leader_id,
+            "p_member_ids": list(member_ids or []),
         }).execute()
+        row = res.data[0] if isinstance(res.data, list) else res.data
         return cls(id=row["id"], name=row["name"], leader_id=row["leader_id"])
 
     @classmethod
     def get_user_teams(cls, user_id: str) -> List["Team"]:
-        # team_members 조인 대신 두 번 조회 (단순하게)
-        member_res = supabase.table("team_members").select("team_id").eq("user_id", user_id).execute()
-        team_ids = [m["team_id"] for m in member_res.data]
-        if not team_ids:
-            return []
-        res = supabase.table("teams").select("*").in_("id", team_ids).execute()
-        return [cls(id=row["id"], name=row["name"], leader_id=row["leader_id"]) for row in res.data]
+        # team_members → teams 임베딩(PostgREST 조인)으로 한 번에 조회
+        res = (
+            get_supabase().table("team_members")
+            .select("teams(id,name,leader_id)")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        teams = []
+        for m in res.data or []:
+            row = m.get("teams")
+            if row:
+                teams.append(cls(id=row["id"], name=row["name"], leader_id=row["leader_id"]))
+        return teams
 
 
 # domain_models.py 안 어딘가에 이미 있을 것:
 from datetime import date
-from supabase_client import supabase
+from supabase_client import get_supabase
 from utils import get_block_count
+from availability import AvailabilityCube, MeetingSlot, TeamAvailability
 
 
 class ScheduleManager:
     @staticmethod
     def suggest_team_blocks(team_id: str, day: date) -> dict[int, int]:
         """
-        새 스키마 기준 팀 공통 가능 인원 수 계산.
+        새 스키마 기준 팀 공통 가능 인원 수 계산 (하루치).
 
-        - team_members에서 team_id에 속한 user_id 리스트를 가져온 뒤
-        - schedules에서 해당 날짜(day)의 일정들을 불러오고
-        - 각 user가 바쁜(block이 포함된) 블록을 표시
-        - 블록별로 '바쁘지 않은(user에게 schedule이 없는) 사람 수'를 리턴
+        suggest_team_range(team_id, day, day)의 얇은 래퍼.
 
         반환값 예시: {1: 3, 2: 2, 3: 5}  # 블록: 가능 인원 수
         """
+        return ScheduleManager.suggest_team_range(team_id, day, day).get(day, {})
 
-        # 1) 팀원 목록 가져오기
+    @staticmethod
+    def suggest_team_range(team_id: str, start: date, end: date) -> dict[date, dict[int, int]]:
+        """
+        start ~ end(포함) 기간의 날짜별/블록별 팀 공통 가능 인원 수 계산.
+
+        team_availability()로 비트마스크를 만든 뒤 블록별 popcount로 센다.
+        → 기간 길이와 상관없이 왕복 2번.
+
+        반환값 예시: {date(2025, 3, 3): {1: 3, 2: 2, 3: 5}, ...}
+        팀원이 없으면 {}.
+        """
+        avail = ScheduleManager.team_availability(team_id, start, end)
+        if avail.size == 0:
+            return {}
+        return avail.range_counts()
+
+    @staticmethod
+    def find_best_slots(
+        team_id: str,
+        start: date,
+        end: date,
+        duration_blocks: int,
+        top_k: int = 5,
+        required_members: Optional[List[str]] = None,
+        quorum: Optional[int] = None,
+    ) -> List[MeetingSlot]:
+        """
+        start ~ end(포함) 기간에서 duration_blocks개 연속 블록 회의 시간 추천.
+
+        team_availability()로 비트마스크를 한 번 만든 뒤 날짜별로 블록 창을 민다.
+        → 기간 길이와 상관없이 왕복 2번.
+
+        반환값: 참석 가능 인원이 많은 순 MeetingSlot 리스트 (최대 top_k개)
+        """
+        avail = ScheduleManager.team_availability(team_id, start, end)
+        return avail.best_slots(duration_blocks, top_k, required_members, quorum)
+
+    @staticmethod
+    def team_schedules(team_id: str, start: date, end: date) -> tuple[list[str], list[dict]]:
+        """
+        팀원 목록 + start ~ end(포함) 기간 팀원들의 일정 row (재배치 최적화용).
+        movable / available 여부와 제목까지 가져온다. → 왕복 2번.
+
+        반환값: ([user_id, ...], [schedules row, ...])
+        """
         res_members = (
-            supabase.table("team_members")
+            get_supabase().table("team_members")
             .select("user_id")
             .eq("team_id", team_id)
             .execute()
         )
-        members = res_members.data or []
-        user_ids = [m["user_id"] for m in members]
-
+        user_ids = list(dict.fromkeys(m["user_id"] for m in res_members.data or []))
         if not user_ids:
-            return {}
+            return [], []
 
-        # 2) 해당 날짜의 모든 스케줄 가져오기 (팀원들만)
-        #    schedules 테이블 새 스키마: user_id, date, start_block, end_block, ...
         res_sched = (
-            supabase.table("schedules")
-            .select("user_id,start_block,end_block")
-            .eq("date", day.isoformat())
+            get_supabase().table("schedules")
+            .select("id,user_id,date,start_block,end_block,title,is_movable")
+            .gte("date", start.isoformat())
+            .lte("date", end.isoformat())
             .in_("user_id", user_ids)
             .execute()
         )
-        sched_rows = res_sched.data or []
+        return user_ids, res_sched.data or []
 
-        # 3) 각 user가 '바쁜' 블록들 집합 만들기
-        busy_blocks_by_user: dict[str, set[int]] = {uid: set() for uid in user_ids}
+    @staticmethod
+    def team_availability(team_id: str, start: date, end: date) -> TeamAvailability:
+        """
+        start ~ end(포함) 기간의 팀 가능 시간 비트마스크(TeamAvailability)를 만든다.
 
-        for row in sched_rows:
-            uid = row["user_id"]
-            start_block = row.get("start_block", row.get("block", 1))
-            end_block = row.get("end_block", start_block)
+        availability_cube([team_id], ...)의 얇은 래퍼.
+        """
+        cube, members_by_team = ScheduleManager.availability_cube([team_id], start, end)
+        return cube.team(members_by_team.get(team_id, []))
 
-            for b in range(start_block, end_block + 1):
-                busy_blocks_by_user.setdefault(uid, set()).add(b)
+    @staticmethod
+    def availability_cube(
+        team_ids: List[str], start: date, end: date
+    ) -> tuple[AvailabilityCube, dict[str, list[str]]]:
+        """
+        여러 팀의 start ~ end(포함) 기간 가용성 큐브를 만든다. (배치 집계용)
 
-        # 4) 날짜에 따라 존재하는 블록 수 (평일 3, 주말 5 등)
-        max_block = get_block_count(day)
+        - team_members에서 team_ids에 속한 멤버십을 한 번에 가져오고
+        - schedules에서 기간 전체의 일정들을 한 번에 불러온 뒤
+        - (날짜, 블록)별 바쁜 사용자 비트마스크를 채운다
+        → 팀 수 / 기간 길이와 상관없이 왕복 2번.
 
-        # 5) 블록별 '가능 인원 수' 계산
-        result: dict[int, int] = {}
-        for b in range(1, max_block + 1):
-            available_count = 0
-            for uid in user_ids:
-                # 해당 유저가 그 블록에 바쁘지 않으면 가능
-                if b not in busy_blocks_by_user.get(uid, set()):
-                    available_count += 1
-            result[b] = available_count
+        반환값: (큐브, {team_id: [user_id, ...]})
+        팀 단위 숫자는 cube.team(...) / cube.team_sums(...)로 계산.
+        """
 
-        return result
+        # 1) 팀원 목록 가져오기
+        res_members = (
+            get_supabase().table("team_members")
+            .select("team_id,user_id")
+            .in_("team_id", team_ids)
+            .execute()
+        )
+        members = res_members.data or []
+
+        members_by_team: dict[str, list[str]] = {tid: [] for tid in team_ids}
+        for m in members:
+            members_by_team.setdefault(m["team_id"], []).append(m["user_id"])
+
+        user_ids = list(dict.fromkeys(m["user_id"] for m in members))
+        if not user_ids:
+            return AvailabilityCube([], start, end), members_by_team
+
+        # 2) 기간 내 모든 스케줄 가져오기 (팀원들만)
+        #    schedules 테이블 새 스키마: user_id, date, start_block, end_block, ...
+        res_sched = (
+            get_supabase().table("schedules")
+            .select("user_id,date,start_block,end_block")
+            .gte("date", start.isoformat())
+            .lte("date", end.isoformat())
+            .in_("user_id", user_ids)
+            .execute()
+        )
+        sched_rows = res_sched.data or []
 
+        # 3) (날짜, 블록)별 바쁜 사용자 비트마스크
+        return AvailabilityCube.from_rows(user_ids, sched_rows, start, end), members_by_team
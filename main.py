@@ -1,13 +1,33 @@
 # main.py
 import flet as ft
 
-from ui.views_login import LoginView
-from ui.views_dashboard import DashboardView
-from ui.views_team import TeamView
-from ui.views_schedule_editor import ScheduleEditorView
-from ui.views_schedule_edit import ScheduleEditView
-from ui.views_team_editor import TeamEditorView
-from ui.views_timetable import TimetableView
+from cache_utils import LRUCache
+
+VIEW_CACHE_MAX_ROUTES = 4  # 세션당 재사용할 화면 수 (대시보드, 타임테이블, 최근 팀 화면들)
+
+# 뷰 모듈은 라우트에 처음 들어갈 때 import 한다 (시작 시 로그인 화면만 필요)
+# 두 번째부터는 sys.modules에 있으므로 비용 X
+
+_warmed_up = False
+
+
+def warm_up():
+    """
+    첫 화면을 그린 뒤 백그라운드에서 나머지 뷰 모듈 + Supabase 클라이언트를 미리 준비.
+    (로그인 버튼을 누를 때 그 비용을 치르지 않도록, 프로세스당 한 번)
+    """
+    import ui.views_dashboard  # noqa: F401
+    import ui.views_timetable  # noqa: F401
+    from supabase_client import get_supabase
+
+    get_supabase()
+
+
+def is_cacheable_route(route: str) -> bool:
+    """다시 들어왔을 때 그대로 재사용해도 되는 화면 (입력 폼인 편집 화면은 매번 새로)"""
+    if route in ("/dashboard", "/timetable"):
+        return True
+    return route.startswith("/team/") and route != "/team/new"
 
 
 def main(page: ft.Page):
@@ -16,10 +36,17 @@ def main(page: ft.Page):
     page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
     page.scroll = ft.ScrollMode.AUTO
 
-    # --- 공통 레이아웃: 사이드바 + 컨텐츠 (로그인 이후에만 사용) ---
-    def build_shell(content: ft.Control) -> ft.Control:
-        user_name = page.session.get("user_name") or "사용자"
+    # --- 세션별 라우트 캐시: route → 만들어 둔 뷰 (LRU) ---
+    # 다시 붙이면 Flet이 did_mount를 다시 부르고, 뷰는 그때 백그라운드로 새로고침한다
+    view_cache = LRUCache(VIEW_CACHE_MAX_ROUTES)
+    view_cache_owner: str | None = None
+
+    # --- 공통 레이아웃: 사이드바 + 컨텐츠 (로그인 이후에만 사용, 한 번만 만듦) ---
+    shell: ft.Control | None = None
+    shell_body = ft.Container(expand=True, padding=10)
+    user_name_text = ft.Text("", size=14, color=ft.Colors.GREY)
 
+    def build_shell() -> ft.Control:
         def goto_dashboard(e):
             page.go("/dashboard")
 
@@ -30,7 +57,14 @@ def main(page: ft.Page):
             page.go("/schedule/new")
 
         def goto_logout(e):
+            from ui.update_batcher import close_snack
+            from ui.widgets_date_picker import close_date_picker
+
+            # 세션 공용 DatePicker / SnackBar는 page.open()으로 붙어 있으므로 닫고 떼어 낸다 (다음 로그인 때 새로)
+            close_date_picker(page)
+            close_snack(page)
             page.session.clear()
+            view_cache.clear()
             page.go("/login")
 
         sidebar = ft.Container(
@@ -39,7 +73,7 @@ def main(page: ft.Page):
             content=ft.Column(
                 controls=[
                     ft.Text("PlanMaster", size=20, weight=ft.FontWeight.BOLD),
-                    ft.Text(user_name, size=14, color=ft.Colors.GREY),
+                    user_name_text,
                     ft.Divider(),
                     ft.TextButton("대시보드", on_click=goto_dashboard),
                     ft.TextButton("타임테이블", on_click=goto_timetable),
@@ -56,61 +90,107 @@ def main(page: ft.Page):
             controls=[
                 sidebar,
                 ft.VerticalDivider(width=1),
-                ft.Container(content=content, expand=True, padding=10),
+                shell_body,
             ],
             expand=True,
         )
 
+    def build_view(route: str) -> ft.Control:
+        """라우트별 컨텐츠 생성"""
+        if route == "/dashboard":
+            from ui.views_dashboard import DashboardView
+
+            return DashboardView(page)
+
+        if route == "/timetable":
+            from ui.views_timetable import TimetableView
+
+            return TimetableView(page)
+
+        if route == "/schedule/new":
+            from ui.views_schedule_editor import ScheduleEditorView
+
+            return ScheduleEditorView(page)
+
+        if route.startswith("/schedule/edit/"):
+            from ui.views_schedule_edit import ScheduleEditView
+
+            schedule_id = route.split("/schedule/edit/")[1]
+            return ScheduleEditView(page, schedule_id)
+
+        if route == "/team/new":
+            from ui.views_team_editor import TeamEditorView
+
+            return TeamEditorView(page)
+
+        if route == "/debug/queries":
+            # 숨김 디버그 페이지 (사이드바 링크 없음, PLANMASTER_DEBUG_ADMINS만 / 나머지는 404)
+            from ui.views_debug import QueryDebugView, can_view_query_stats
+
+            if can_view_query_stats(page):
+                return QueryDebugView(page)
+
+        if route.startswith("/team/"):
+            from ui.views_team import TeamView
+
+            team_id = route.split("/team/")[1]
+            return TeamView(page, team_id)
+
+        # 404
+        return ft.Column(
+            controls=[
+                ft.Text("404 - 페이지를 찾을 수 없습니다."),
+                ft.TextButton("대시보드로", on_click=lambda e: page.go("/dashboard")),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
     # --- 라우트 변경 핸들러 (컨트롤 기반) ---
     def route_change(e: ft.RouteChangeEvent):
+        global _warmed_up
+        nonlocal shell, view_cache_owner
         route = page.route
-        page.controls.clear()  # 화면 비우기
 
         # 1) 로그인 페이지 (사이드바 없이)
         if route in ("/", "/login"):
+            from ui.views_login import LoginView
+
+            page.controls.clear()
             page.controls.append(LoginView(page))
             page.update()
+            if not _warmed_up:
+                _warmed_up = True
+                page.run_thread(warm_up)
             return
 
         # 2) 나머지는 로그인 필요
-        if not page.session.get("user_id"):
+        user_id = page.session.get("user_id")
+        if not user_id:
             page.go("/login")
             return
 
-        # 3) 라우트별 컨텐츠 선택
-        if route == "/dashboard":
-            content = DashboardView(page)
-
-        elif route == "/timetable":
-            content = TimetableView(page)
-
-        elif route == "/schedule/new":
-            content = ScheduleEditorView(page)
-
-        elif route.startswith("/schedule/edit/"):
-            schedule_id = route.split("/schedule/edit/")[1]
-            content = ScheduleEditView(page, schedule_id)
-
-        elif route == "/team/new":
-            content = TeamEditorView(page)
-
-        elif route.startswith("/team/"):
-            team_id = route.split("/team/")[1]
-            content = TeamView(page, team_id)
-
-        else:
-            # 404
-            content = ft.Column(
-                controls=[
-                    ft.Text("404 - 페이지를 찾을 수 없습니다."),
-                    ft.TextButton("대시보드로", on_click=lambda e: page.go("/dashboard")),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            )
-
-        # 4) 로그인 이후 화면은 전부 사이드바로 감싸기
-        page.controls.append(build_shell(content))
+        # 다른 사용자로 로그인했으면 이전 사용자의 화면은 버림
+        if view_cache_owner != user_id:
+            view_cache.clear()
+            view_cache_owner = user_id
+
+        # 3) 라우트별 컨텐츠: 캐시에 있으면 재사용, 없으면 새로
+        content = view_cache.get(route)
+        if content is None:
+            content = build_view(route)
+            if is_cacheable_route(route):
+                view_cache.put(route, content)
+
+        # 4) 사이드바는 그대로 두고 컨텐츠 자리만 교체
+        if shell is None:
+            shell = build_shell()
+        user_name_text.value = page.session.get("user_name") or "사용자"
+        shell_body.content = content
+
+        if page.controls != [shell]:
+            page.controls.clear()
+            page.controls.append(shell)
         page.update()
 
     page.on_route_change = route_change
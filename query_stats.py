@@ -0,0 +1,151 @@
+# query_stats.py
+"""
+Supabase 쿼리 계측 결과 집계 (프로세스 전체 공유).
+
+supabase_client의 계측 래퍼가 쿼리마다
+    (호출한 뷰, 테이블, 작업, 필터 모양, row 수, 바이트, 걸린 시간)
+을 record()로 넘기면, 호출한 뷰별 / 뷰 안의 쿼리 모양별로 모아서
+p50 / p95 / p99를 계산한다. (샘플은 키마다 최근 QUERY_SAMPLE_SIZE개만 보관)
+
+바이트는 일부 쿼리에서만 잰다 (size=None이면 안 잰 것).
+→ bytes = 전체 row 수 × 잰 쿼리들의 row당 바이트 (추정치)
+
+호출한 뷰는 repository.run_db가 부른 쪽 스택에서 찾아 contextvar로 DB 스레드까지 넘긴다.
+    예: "TimetableView._load_week_async"
+
+결과는 snapshot() / to_json()으로 내보내고, /debug/queries 화면에서 볼 수 있다.
+"""
+import json
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+QUERY_SAMPLE_SIZE = 512  # 키별로 보관하는 최근 소요 시간 샘플 수
+UNKNOWN_SOURCE = "(unknown)"
+
+# 지금 실행 중인 쿼리를 부른 뷰 (run_db가 설정, DB 스레드로 전달됨)
+query_source: ContextVar[str] = ContextVar("query_source", default=UNKNOWN_SOURCE)
+
+
+def caller_view(skip: int = 2) -> Optional[str]:
+    """스택을 거슬러 올라가 처음 만나는 ui.* 모듈의 함수 이름 (예: TeamView.load_team_info)"""
+    frame = sys._getframe(skip)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith("ui."):
+            code = frame.f_code
+            return getattr(code, "co_qualname", code.co_name)
+        frame = frame.f_back
+    return None
+
+
+class _Series:
+    """한 키의 호출 수 / 합계 + 최근 소요 시간 샘플"""
+
+    __slots__ = ("calls", "errors", "rows", "sized_rows", "sized_bytes", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        # 바이트를 잰 쿼리들만의 row 수 / 바이트 합
+        self.sized_rows = 0
+        self.sized_bytes = 0
+        self.samples: Deque[float] = deque(maxlen=QUERY_SAMPLE_SIZE)
+
+    def add(self, rows: int, size: Optional[int], ms: float, error: bool):
+        self.calls += 1
+        self.errors += int(error)
+        self.rows += rows
+        if size is not None:
+            self.sized_rows += rows
+            self.sized_bytes += size
+        self.samples.append(ms)
+
+    @property
+    def bytes(self) -> int:
+        """전체 응답 바이트 추정치 (잰 쿼리들의 row당 바이트 기준)"""
+        if not self.sized_rows:
+            return 0
+        return round(self.rows * self.sized_bytes / self.sized_rows)
+
+    def to_dict(self) -> Dict:
+        samples = sorted(self.samples)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "ms": {
+                "p50": _percentile(samples, 50),
+                "p95": _percentile(samples, 95),
+                "p99": _percentile(samples, 99),
+                "max": round(samples[-1], 2) if samples else 0.0,
+            },
+        }
+
+
+def _percentile(sorted_samples: List[float], p: int) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, -(-p * len(sorted_samples) // 100))  # ceil
+    return round(sorted_samples[rank - 1], 2)
+
+
+class QueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        # 뷰 -> 전체
+        self._by_source: Dict[str, _Series] = {}
+        # 뷰 -> "테이블 작업 필터모양" -> 시리즈
+        self._by_query: Dict[str, Dict[str, _Series]] = {}
+
+    def record(
+        self,
+        table: str,
+        operation: str,
+        filters: str,
+        rows: int,
+        size: Optional[int],
+        ms: float,
+        error: bool = False,
+    ):
+        source = query_source.get()
+        key = f"{table} {operation} {filters}".rstrip()
+        with self._lock:
+            self._by_source.setdefault(source, _Series()).add(rows, size, ms, error)
+            self._by_query.setdefault(source, {}).setdefault(key, _Series()).add(rows, size, ms, error)
+
+    def snapshot(self) -> Dict:
+        """뷰별 / 쿼리별 집계 (호출 수 많은 순)"""
+        with self._lock:
+            sources = {}
+            for source, series in sorted(self._by_source.items(), key=lambda kv: -kv[1].calls):
+                entry = series.to_dict()
+                entry["queries"] = {
+                    key: s.to_dict()
+                    for key, s in sorted(self._by_query[source].items(), key=lambda kv: -kv[1].calls)
+                }
+                sources[source] = entry
+            return {
+                "since": datetime.fromtimestamp(self._started_at).isoformat(timespec="seconds"),
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+                "sources": sources,
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._started_at = time.time()
+            self._by_source.clear()
+            self._by_query.clear()
+
+
+query_stats = QueryStats()
@@ -0,0 +1,307 @@
+# repository.py
+"""
+뷰에서 쓰는 비동기 데이터 접근 계층.
+
+supabase 클라이언트는 동기(blocking)라서 이벤트 핸들러에서 바로 부르면
+조회가 끝날 때까지 Flet 세션이 멈춘다.
+→ 크기가 정해진 스레드 풀에서 실행하고 asyncio로 기다린다.
+
+뷰에서는
+    rows = await repository.fetch_week_schedules(user_id, week_start)
+처럼 쓰고, 먼저 스켈레톤을 그린 뒤 데이터가 오면 채운다.
+
+CPU를 오래 쓰는 계산(일정 재배치 최적화)은 이벤트 루프/GIL을 막지 않도록
+별도 프로세스 풀에서 돌린다 (run_cpu).
+"""
+import asyncio
+import contextvars
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from supabase_client import get_supabase
+from domain_models import User, Schedule, Team, ScheduleManager
+from availability import TeamAvailability
+from team_cache import team_list_cache, team_week_cache
+from rescheduler import RESCHEDULE_TIME_BUDGET, ReschedulePlan, RescheduleProblem, optimize
+from cache_utils import week_start_of
+from query_stats import caller_view, query_source
+
+T = TypeVar("T")
+
+DB_MAX_WORKERS = 8  # 동시에 진행할 수 있는 DB 요청 수 (전체 세션 공유)
+CPU_MAX_WORKERS = 2  # 동시에 돌릴 수 있는 무거운 계산 수 (전체 세션 공유)
+
+_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="db")
+# 프로세스 풀은 처음 쓸 때 만든다 (시작 시간에 영향 X)
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+
+
+async def run_db(fn: Callable[..., T], *args) -> T:
+    """동기 DB 함수를 공용 스레드 풀에서 실행하고 결과를 기다린다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, _with_source(), fn, *args)
+
+
+def _submit_db(fn: Callable[..., T], *args) -> Future:
+    """run_db와 같지만 기다리지 않고 Future를 돌려줌 (공유 캐시 single-flight용)"""
+    return _executor.submit(_with_source(), fn, *args)
+
+
+def _with_source() -> Callable:
+    """
+    쿼리 계측용: 부른 뷰 이름을 contextvar에 담아 DB 스레드로 넘기는 ctx.run
+    (run_in_executor는 contextvar를 자동으로 넘기지 않음)
+    """
+    ctx = contextvars.copy_context()
+    source = caller_view(3)
+    if source is not None:
+        ctx.run(query_source.set, source)
+    return ctx.run
+
+
+async def run_cpu(fn: Callable[..., T], *args) -> T:
+    """CPU 계산을 공용 프로세스 풀에서 실행하고 결과를 기다린다. (fn, args는 pickle 가능해야 함)"""
+    global _cpu_executor
+    if _cpu_executor is None:
+        # fork는 DB 스레드 풀 / 락 / Flet 소켓을 가진 프로세스를 그대로 복제한다 → spawn으로 깨끗하게 시작
+        _cpu_executor = ProcessPoolExecutor(
+            max_workers=CPU_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cpu_executor, fn, *args)
+
+
+# ---------- users ----------
+async def get_or_create_user(email: str, name: str) -> User:
+    return await run_db(User.get_or_create, email, name)
+
+
+# ---------- teams ----------
+async def fetch_user_teams(user_id: str) -> List[Team]:
+    """내 팀 목록 (캐시에 있으면 쿼리 없이, 같은 사용자를 동시에 요청하면 조회는 한 번)"""
+    fut = team_list_cache.get_or_submit(user_id, lambda: _submit_db(Team.get_user_teams, user_id))
+    teams = await asyncio.shield(asyncio.wrap_future(fut))
+    # 공유 Future의 결과 리스트를 세션끼리 나눠 쓰지 않도록 복사
+    return list(teams)
+
+
+async def fetch_team_info(team_id: str) -> Tuple[Optional[str], int]:
+    """(팀 이름 or None, 팀원 수)"""
+
+    def _query():
+        res_team = get_supabase().table("teams").select("name").eq("id", team_id).execute()
+        name = res_team.data[0]["name"] if res_team.data else None
+
+        res_members = (
+            get_supabase().table("team_members")
+            .select("user_id")
+            .eq("team_id", team_id)
+            .execute()
+        )
+        return name, len(res_members.data or [])
+
+    return await run_db(_query)
+
+
+async def fetch_team_availability(team_id: str, start: date, end: date) -> TeamAvailability:
+    return await run_db(ScheduleManager.team_availability, team_id, start, end)
+
+
+async def fetch_team_week_availability(team_id: str, week_start: date) -> TeamAvailability:
+    """
+    week_start(월) ~ +6일 팀 가용성.
+    모든 세션이 공유하는 캐시를 거치고, 같은 팀/주를 동시에 요청하면 계산은 한 번만 한다.
+    """
+    week_end = week_start + timedelta(days=6)
+    fut = team_week_cache.get_or_submit(
+        team_id,
+        week_start,
+        lambda: _submit_db(ScheduleManager.team_availability, team_id, week_start, week_end),
+    )
+    # 기다리던 세션 하나가 취소돼도 공유 계산은 계속되도록 shield
+    return await asyncio.shield(asyncio.wrap_future(fut))
+
+
+async def propose_reschedule(
+    team_id: str,
+    day: date,
+    start_block: int,
+    end_block: int,
+    time_budget: float = RESCHEDULE_TIME_BUDGET,
+    max_moves: Optional[int] = None,
+) -> ReschedulePlan:
+    """
+    day의 start_block~end_block에 더 많은 팀원이 모이도록
+    같은 주(월~일) 안에서 movable 일정 이동을 제안 (실제로 옮기지는 않음).
+    """
+    week_start = week_start_of(day)
+    week_end = week_start + timedelta(days=6)
+    member_ids, rows = await run_db(ScheduleManager.team_schedules, team_id, week_start, week_end)
+    problem = RescheduleProblem.from_rows(
+        member_ids, rows, day, start_block, end_block, week_start, week_end
+    )
+    return await run_cpu(optimize, problem, time_budget, max_moves)
+
+
+async def search_users(
+    query: str, after: Optional[Tuple[Optional[str], str]] = None, limit: int = 20
+) -> List[Dict]:
+    """
+    팀원 후보 검색: 이름 또는 이메일이 query로 시작하는 users (이름 nulls last, id순)
+    after=(name, id)를 주면 그 다음부터 limit개 (keyset 페이지네이션, 이름 없는 사용자면 name=None)
+    """
+    # PostgREST 패턴/구분 문자는 검색어에서 뺌
+    prefix = "".join(ch for ch in query if ch not in '*%_,()"\\')
+
+    filters = []
+    if prefix:
+        filters.append(f"or(name.ilike.{_quote(prefix + '*')},email.ilike.{_quote(prefix + '*')})")
+    if after is not None:
+        name, user_id = after
+        if name is None:
+            # 이름 없는 사용자는 맨 뒤에 모여 있음 → 그 안에서 id만 비교
+            filters.append(f"and(name.is.null,id.gt.{_quote(user_id)})")
+        else:
+            # name.gt는 NULL을 못 잡으므로 뒤에 오는 이름 없는 사용자를 따로 포함
+            filters.append(
+                f"or(name.gt.{_quote(name)},and(name.eq.{_quote(name)},id.gt.{_quote(user_id)}),name.is.null)"
+            )
+
+    def _query():
+        q = get_supabase().table("users").select("id,name,email")
+        if filters:
+            q = q.or_(f"and({','.join(filters)})")
+        res = q.order("name", nullsfirst=False).order("id").limit(limit).execute()
+        return res.data or []
+
+    return await run_db(_query)
+
+
+def _quote(value: str) -> str:
+    """PostgREST 필터 값 따옴표 처리 (쉼표/괄호가 들어 있어도 안전하게)"""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+async def create_team(name: str, leader_id: str, member_ids: List[str]) -> Team:
+    """팀 + 팀원들을 RPC 한 번(한 트랜잭션)으로 생성"""
+    team = await run_db(Team.create, name, leader_id, member_ids)
+    # 새 팀에 들어간 사람들의 팀 목록 캐시는 버림
+    team_list_cache.invalidate([leader_id, *member_ids])
+    return team
+
+
+# ---------- schedules ----------
+async def fetch_week_schedules(user_id: str, week_start: date) -> List[Dict]:
+    """week_start(월) ~ +6일 내 일정 (날짜순)"""
+    return await fetch_schedules_between(user_id, week_start, week_start + timedelta(days=6))
+
+
+async def fetch_schedules_between(user_id: str, start: date, end: date) -> List[Dict]:
+    """start ~ end(포함) 기간 내 일정 (날짜순)"""
+
+    def _query():
+        res = (
+            get_supabase().table("schedules")
+            .select("*")
+            .eq("user_id", user_id)
+            .gte("date", start.isoformat())
+            .lte("date", end.isoformat())
+            .order("date")
+            .execute()
+        )
+        return res.data or []
+
+    return await run_db(_query)
+
+
+async def fetch_schedules_page(
+    user_id: str, start: date, end: date, offset: int, limit: int
+) -> List[Dict]:
+    """start ~ end(포함) 기간 내 일정 중 offset부터 limit개 (날짜, 블록순)"""
+
+    def _query():
+        res = (
+            get_supabase().table("schedules")
+            .select("*")
+            .eq("user_id", user_id)
+            .gte("date", start.isoformat())
+            .lte("date", end.isoformat())
+            .order("date")
+            .order("start_block")
+            .order("id")
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return res.data or []
+
+    return await run_db(_query)
+
+
+async def fetch_schedule(schedule_id: str) -> Optional[Dict]:
+    def _query():
+        res = get_supabase().table("schedules").select("*").eq("id", schedule_id).execute()
+        rows = res.data or []
+        return rows[0] if rows else None
+
+    return await run_db(_query)
+
+
+async def save_schedule(
+    user_id: str,
+    day: date,
+    start_block: int,
+    end_block: int,
+    title: str,
+    description: str,
+    is_movable: Optional[bool] = None,
+    is_available: Optional[bool] = None,
+    schedule_id: Optional[str] = None,
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    중복 체크 + 저장을 한 번에 (schedule_id 없으면 추가, 있으면 수정).
+    반환: (저장된 row, None) 또는 겹치는 일정이 있으면 (None, 그 일정 제목)
+    """
+    # 쓰기 전에 번호를 받아 둠 → 쓰기 도중 캐시에 들어간 팀 주간 가용성은 증분 대신 다시 계산
+    write = team_week_cache.begin_write()
+    result = await run_db(
+        Schedule.save_checked,
+        user_id, day, start_block, end_block, title, description,
+        is_movable, is_available, schedule_id,
+    )
+
+    status = result.get("status")
+    if status == "conflict":
+        return None, result.get("conflict_title") or "(제목 없음)"
+    if status != "ok":
+        raise LookupError("일정을 찾을 수 없습니다.")
+
+    saved = result["schedule"]
+    previous = result.get("previous")
+    team_week_cache.apply_schedule_change(
+        user_id,
+        old=_block_range(previous) if previous else None,
+        new=_block_range(saved),
+        write=write,
+    )
+    return saved, None
+
+
+async def delete_schedule(schedule_id: str):
+    def _query():
+        res = get_supabase().table("schedules").delete().eq("id", schedule_id).execute()
+        return res.data or []
+
+    write = team_week_cache.begin_write()
+    deleted = await run_db(_query)
+    for r in deleted:
+        team_week_cache.apply_schedule_change(r["user_id"], old=_block_range(r), write=write)
+
+
+def _block_range(row: Dict) -> Tuple:
+    """schedules row → (날짜, start_block, end_block)"""
+    start_block = row.get("start_block", row.get("block", 1))
+    end_block = row.get("end_block", start_block)
+    return row["date"], start_block, end_block
@@ -0,0 +1,269 @@
+# rescheduler.py
+"""
+movable 일정 재배치 최적화.
+
+팀 회의 후보 시간(target)에 못 오는 팀원들의 movable 일정을
+기간 안의 다른 빈 블록으로 옮겨서, target에 참석 가능한 팀원 수를 최대화한다.
+
+- 일정은 각자 것이므로 팀원별로 독립된 문제로 쪼개진다
+  (한 팀원을 비우려면 target과 겹치는 그 사람 일정을 전부 옮겨야 함)
+- 팀원별로: 옮길 일정마다 (날짜, 블록) 후보를 이동 거리순으로 놓고
+  날짜별 블록 비트마스크 위에서 분기 한정(branch and bound)
+  → 처음 찾는 해가 곧 greedy 해, 남은 시간 동안 총 이동 거리를 줄여 나감
+- 이동 수 제한(max_moves)이 있으면 필요한 이동이 적은 팀원부터 비움
+  (팀원 한 명 = 가치 1이라 이 순서가 최적)
+- time_budget 초가 지나면 그때까지 찾은 가장 좋은 해를 돌려준다
+
+입력/출력은 모두 pickle 가능한 dataclass라 프로세스 풀에서도 돌릴 수 있다.
+(repository.propose_reschedule 참고)
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from availability import block_mask
+from utils import get_block_count
+
+RESCHEDULE_TIME_BUDGET = 1.0  # 초
+DAY_MOVE_COST = 10  # 하루 옮기는 비용 (블록 하나 옮기는 비용 = 1)
+
+
+@dataclass(frozen=True)
+class ScheduleMove:
+    """일정 하나를 old → new (날짜, start_block, end_block)로 옮기는 제안"""
+    schedule_id: str
+    user_id: str
+    title: str
+    old: Tuple[date, int, int]
+    new: Tuple[date, int, int]
+
+
+@dataclass
+class ReschedulePlan:
+    target: Tuple[date, int, int]
+    available_before: int  # 아무것도 안 옮겼을 때 target에 가능한 팀원 수
+    available_after: int  # moves를 적용하면 가능한 팀원 수
+    freed_members: List[str] = field(default_factory=list)
+    moves: List[ScheduleMove] = field(default_factory=list)
+    complete: bool = True  # False면 time_budget 안에 탐색을 다 끝내지 못함
+
+
+@dataclass
+class _Blocker:
+    """target과 겹쳐서 옮겨야 하는 일정"""
+    schedule_id: str
+    title: str
+    date: date
+    start_block: int
+    end_block: int
+
+    @property
+    def length(self) -> int:
+        return self.end_block - self.start_block + 1
+
+
+@dataclass
+class RescheduleProblem:
+    target_date: date
+    target_start: int
+    target_end: int
+    days: List[date]  # 일정을 옮겨 놓을 수 있는 날짜들
+    member_ids: List[str]
+    # user_id -> {날짜: 일정이 있는 블록 마스크} (target과 겹치는 일정은 제외)
+    occupied: Dict[str, Dict[date, int]]
+    # user_id -> target과 겹치는 일정들 (옮길 수 없는 일정이 있으면 그 팀원은 빠짐)
+    blockers: Dict[str, List[_Blocker]]
+    fixed_members: List[str]  # 옮길 수 없는 일정 때문에 비울 수 없는 팀원
+
+    @classmethod
+    def from_rows(
+        cls,
+        member_ids: Iterable[str],
+        rows: Iterable[Dict],
+        target_date: date,
+        target_start: int,
+        target_end: int,
+        start: date,
+        end: date,
+    ) -> "RescheduleProblem":
+        """
+        schedules row(id, user_id, date, start_block, end_block, title, is_movable)
+        목록으로부터 문제를 만든다. start ~ end(포함)가 옮길 수 있는 기간.
+
+        히트맵 / best_slots(AvailabilityCube)와 같은 기준: 일정이 있는 블록은 모두 '바쁨'
+        (is_available 값과 상관없이) → 제안 결과와 히트맵 숫자가 어긋나지 않음
+        """
+        member_ids = list(dict.fromkeys(member_ids))
+        target_mask = block_mask(target_start, target_end)
+
+        days = []
+        d = start
+        while d <= end:
+            days.append(d)
+            d += timedelta(days=1)
+
+        occupied: Dict[str, Dict[date, int]] = {uid: {} for uid in member_ids}
+        blockers: Dict[str, List[_Blocker]] = {uid: [] for uid in member_ids}
+        fixed = set()
+
+        for row in rows:
+            uid = row["user_id"]
+            if uid not in occupied:
+                continue
+            d = date.fromisoformat(str(row["date"])[:10])
+            start_block = row.get("start_block", row.get("block", 1))
+            end_block = row.get("end_block", start_block)
+            mask = block_mask(start_block, end_block)
+
+            blocks_target = d == target_date and mask & target_mask
+            if not blocks_target:
+                occupied[uid][d] = occupied[uid].get(d, 0) | mask
+            elif row.get("is_movable"):
+                blockers[uid].append(
+                    _Blocker(row["id"], row.get("title") or "", d, start_block, end_block)
+                )
+            else:
+                fixed.add(uid)
+
+        return cls(
+            target_date=target_date,
+            target_start=target_start,
+            target_end=target_end,
+            days=days,
+            member_ids=member_ids,
+            occupied=occupied,
+            blockers=blockers,
+            fixed_members=[uid for uid in member_ids if uid in fixed],
+        )
+
+
+def optimize(
+    problem: RescheduleProblem,
+    time_budget: float = RESCHEDULE_TIME_BUDGET,
+    max_moves: Optional[int] = None,
+) -> ReschedulePlan:
+    """
+    target에 참석 가능한 팀원 수가 최대가 되도록 movable 일정 이동을 제안.
+    (같은 인원이면 이동 수, 그다음 총 이동 거리가 작은 쪽)
+    """
+    deadline = time.monotonic() + time_budget
+    target = (problem.target_date, problem.target_start, problem.target_end)
+
+    fixed = set(problem.fixed_members)
+    already_free = [
+        uid for uid in problem.member_ids if uid not in fixed and not problem.blockers[uid]
+    ]
+    # 옮기면 비울 수 있는 팀원 후보: 필요한 이동이 적은 사람부터
+    candidates = sorted(
+        (uid for uid in problem.member_ids if uid not in fixed and problem.blockers[uid]),
+        key=lambda uid: len(problem.blockers[uid]),
+    )
+
+    plan = ReschedulePlan(
+        target=target,
+        available_before=len(already_free),
+        available_after=len(already_free),
+    )
+    moves_left = max_moves if max_moves is not None else float("inf")
+
+    for uid in candidates:
+        if len(problem.blockers[uid]) > moves_left:
+            # 뒤의 후보들은 이동이 더 많이 필요하므로 여기서 끝
+            break
+        if time.monotonic() >= deadline:
+            plan.complete = False
+            break
+
+        moves, exhausted = _solve_member(problem, uid, deadline)
+        if not exhausted:
+            plan.complete = False
+        if moves is None:
+            continue
+
+        plan.moves.extend(moves)
+        plan.freed_members.append(uid)
+        plan.available_after += 1
+        moves_left -= len(moves)
+
+    return plan
+
+
+def _solve_member(
+    problem: RescheduleProblem, user_id: str, deadline: float
+) -> Tuple[Optional[List[ScheduleMove]], bool]:
+    """
+    한 팀원의 blocker 일정들을 서로/다른 일정/target과 안 겹치게 옮기는 최소 비용 배치.
+    반환: (이동 리스트 또는 해가 없으면 None, 탐색을 끝까지 했는지)
+    """
+    occupied = dict(problem.occupied[user_id])
+    # target 칸에는 다시 넣을 수 없음
+    target_mask = block_mask(problem.target_start, problem.target_end)
+    occupied[problem.target_date] = occupied.get(problem.target_date, 0) | target_mask
+
+    # 긴 일정부터 (놓을 곳이 적어서 먼저 정해야 가지치기가 잘 됨)
+    blockers = sorted(problem.blockers[user_id], key=lambda b: -b.length)
+    options = [_placements(problem.days, occupied, b) for b in blockers]
+
+    best: List[Optional[Tuple[int, List[Tuple[date, int]]]]] = [None]
+    chosen: List[Tuple[date, int]] = []
+    exhausted = [True]
+
+    def search(i: int, cost: int):
+        if time.monotonic() >= deadline:
+            exhausted[0] = False
+            return
+        if best[0] is not None and cost >= best[0][0]:
+            return  # 한정: 이미 찾은 해보다 비쌈
+        if i == len(blockers):
+            best[0] = (cost, list(chosen))
+            return
+
+        length = blockers[i].length
+        for place_cost, d, start_block in options[i]:
+            if best[0] is not None and cost + place_cost >= best[0][0]:
+                break  # 후보가 비용순이라 뒤는 전부 더 비쌈
+            mask = block_mask(start_block, start_block + length - 1)
+            if occupied.get(d, 0) & mask:
+                continue
+            occupied[d] = occupied.get(d, 0) | mask
+            chosen.append((d, start_block))
+            search(i + 1, cost + place_cost)
+            chosen.pop()
+            occupied[d] &= ~mask
+            if not exhausted[0]:
+                return
+
+    search(0, 0)
+
+    if best[0] is None:
+        return None, exhausted[0]
+
+    moves = []
+    for blocker, (d, start_block) in zip(blockers, best[0][1]):
+        moves.append(
+            ScheduleMove(
+                schedule_id=blocker.schedule_id,
+                user_id=user_id,
+                title=blocker.title,
+                old=(blocker.date, blocker.start_block, blocker.end_block),
+                new=(d, start_block, start_block + blocker.length - 1),
+            )
+        )
+    return moves, exhausted[0]
+
+
+def _placements(
+    days: List[date], occupied: Dict[date, int], blocker: _Blocker
+) -> List[Tuple[int, date, int]]:
+    """blocker를 놓을 수 있는 (비용, 날짜, 시작 블록) 후보, 비용(이동 거리)순"""
+    result = []
+    for d in days:
+        busy = occupied.get(d, 0)
+        for start_block in range(1, get_block_count(d) - blocker.length + 2):
+            if busy & block_mask(start_block, start_block + blocker.length - 1):
+                continue
+            cost = abs((d - blocker.date).days) * DAY_MOVE_COST + abs(start_block - blocker.start_block)
+            result.append((cost, d, start_block))
+    result.sort()
+    return result
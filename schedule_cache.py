@@ -0,0 +1,178 @@
+# schedule_cache.py
+"""
+세션별 주간 스케줄 캐시.
+
+- TimetableView가 주 이동할 때마다 같은 주를 다시 select 하지 않도록
+  week_start(월요일) → schedules row 리스트를 LRU로 들고 있는다.
+- 일정 추가/수정/삭제 시에는 해당 주만 패치(또는 무효화)한다.
+- 캐시된 주는 날짜별 블록 점유 인덱스도 만들어 두고,
+  편집 화면의 겹침 검사를 네트워크 없이 바로 처리한다 (find_conflict).
+"""
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from availability import block_mask
+from cache_utils import LRUCache, _as_date, week_start_of
+
+if TYPE_CHECKING:
+    import flet as ft
+
+WEEK_CACHE_SESSION_KEY = "week_cache"
+WEEK_CACHE_MAX_WEEKS = 8  # 세션당 최대 보관 주 수
+
+
+class DayBlockIndex:
+    """
+    하루치 일정의 블록 점유 인덱스.
+
+    - occupied: 그날 일정이 있는 블록 전체 비트마스크 → 안 겹치면 정수 연산 한 번으로 끝
+    - entries: (블록 마스크, row) → 겹칠 때만 어떤 일정인지 찾음 (하루 일정은 몇 개 안 됨)
+    """
+
+    __slots__ = ("occupied", "entries")
+
+    def __init__(self):
+        self.occupied = 0
+        self.entries: List[tuple] = []
+
+    def add(self, row: Dict):
+        start_block = row.get("start_block", row.get("block", 1))
+        end_block = row.get("end_block", start_block)
+        mask = block_mask(start_block, end_block)
+        self.occupied |= mask
+        self.entries.append((mask, row))
+
+    def find(self, mask: int, exclude_id: Optional[str] = None) -> Optional[Dict]:
+        if not self.occupied & mask:
+            return None
+        for row_mask, row in self.entries:
+            if row_mask & mask and row["id"] != exclude_id:
+                return row
+        return None
+
+
+class WeekScheduleCache:
+    """
+    한 사용자의 주간 schedules row 캐시.
+
+    rows는 load_week_schedules의 select("*") 결과 그대로(date 순 정렬) 보관한다.
+    """
+
+    def __init__(self, user_id: str, max_weeks: int = WEEK_CACHE_MAX_WEEKS):
+        self.user_id = user_id
+        self._weeks = LRUCache(max_weeks)
+        # 쓰기(추가/수정/삭제)가 있을 때마다 증가 → 백그라운드 조회 결과가 낡았는지 판단
+        self.version = 0
+        # week_start -> {날짜: DayBlockIndex} (처음 검사할 때 만들고, 그 주가 바뀌면 버림)
+        self._indexes: Dict[date, Dict[date, DayBlockIndex]] = {}
+
+    # --- 조회/저장 ---
+    def get(self, week_start: date) -> Optional[List[Dict]]:
+        rows = self._weeks.get(week_start)
+        return list(rows) if rows is not None else None
+
+    def put(self, week_start: date, rows: List[Dict]):
+        self._weeks.put(week_start, list(rows))
+        self._indexes.pop(week_start, None)
+
+    def put_if_unchanged(self, week_start: date, rows: List[Dict], version: int) -> bool:
+        """
+        조회 시작 시점(version) 이후 쓰기가 없었고, 그 사이 다른 곳에서 채우지 않았을 때만 저장.
+        (prefetch 도중 일정이 바뀌면 낡은 결과로 덮어쓰지 않기 위함)
+        """
+        if version != self.version or week_start in self._weeks:
+            return False
+        self.put(week_start, rows)
+        return True
+
+    def contains(self, week_start: date) -> bool:
+        return week_start in self._weeks
+
+    def touch(self, week_start: date):
+        """최근 사용으로 표시 (LRU에서 밀려나지 않게)"""
+        self._weeks.get(week_start)
+
+    def invalidate(self, d):
+        """d가 속한 주를 버림"""
+        self.version += 1
+        week_start = week_start_of(d)
+        self._weeks.pop(week_start)
+        self._indexes.pop(week_start, None)
+
+    def clear(self):
+        self.version += 1
+        self._weeks.clear()
+        self._indexes.clear()
+
+    # --- 쓰기 반영 (write-through) ---
+    def upsert_row(self, row: Dict):
+        """
+        추가/수정된 row 반영.
+        - 기존 주에서 같은 id를 빼고 (날짜가 바뀐 수정 대비)
+        - 새 날짜의 주가 캐시에 있으면 그 주에만 끼워 넣음
+        """
+        self.remove_row(row["id"])
+        self.version += 1
+
+        week_start = week_start_of(row["date"])
+        rows = self._weeks.get(week_start)
+        if rows is None:
+            return
+        rows.append(row)
+        rows.sort(key=lambda r: str(r["date"])[:10])
+        self._indexes.pop(week_start, None)
+
+    def remove_row(self, schedule_id: str):
+        """삭제된 일정 id를 캐시된 모든 주에서 제거"""
+        self.version += 1
+        for week_start, rows in self._weeks.items():
+            kept = [r for r in rows if r["id"] != schedule_id]
+            if len(kept) != len(rows):
+                rows[:] = kept
+                self._indexes.pop(week_start, None)
+
+    # --- 겹침 검사 (네트워크 X) ---
+    def covers(self, d) -> bool:
+        """d가 속한 주가 캐시에 있는지 (없으면 find_conflict로 판단할 수 없음)"""
+        return week_start_of(d) in self._weeks
+
+    def find_conflict(
+        self, d, start_block: int, end_block: int, exclude_id: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        d 날짜의 [start_block, end_block]와 겹치는 캐시된 일정 row (없으면 None).
+        exclude_id: 수정 중인 자기 자신은 제외
+        d가 속한 주가 캐시에 없으면 None이므로 covers()로 먼저 확인할 것.
+        """
+        d = _as_date(d)
+        day_index = self._week_index(week_start_of(d)).get(d)
+        if day_index is None:
+            return None
+        return day_index.find(block_mask(start_block, end_block), exclude_id)
+
+    def _week_index(self, week_start: date) -> Dict[date, DayBlockIndex]:
+        rows = self._weeks.get(week_start)
+        if rows is None:
+            self._indexes.pop(week_start, None)
+            return {}
+
+        index = self._indexes.get(week_start)
+        if index is None:
+            index = {}
+            for row in rows:
+                index.setdefault(_as_date(row["date"]), DayBlockIndex()).add(row)
+            # LRU에서 밀려난 주의 인덱스도 같이 정리
+            for ws in [ws for ws in self._indexes if ws not in self._weeks]:
+                del self._indexes[ws]
+            self._indexes[week_start] = index
+        return index
+
+
+def get_week_cache(page: "ft.Page") -> WeekScheduleCache:
+    """현재 세션(로그인 사용자)의 주간 캐시. 없거나 사용자가 바뀌었으면 새로 만든다."""
+    user_id = page.session.get("user_id")
+    cache = page.session.get(WEEK_CACHE_SESSION_KEY)
+    if not isinstance(cache, WeekScheduleCache) or cache.user_id != user_id:
+        cache = WeekScheduleCache(user_id)
+        page.session.set(WEEK_CACHE_SESSION_KEY, cache)
+    return cache
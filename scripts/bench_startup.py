@@ -0,0 +1,129 @@
+# scripts/bench_startup.py
+"""
+콜드 스타트 → LoginView 첫 프레임까지 걸리는 시간 측정.
+
+매 회 새 파이썬 프로세스에서
+    import main → main.main(page) → "/login" 라우트 → 첫 page.update()
+까지의 시간을 잰다. (Flet 클라이언트 왕복은 빼고 서버 쪽 비용만)
+
+첫 프레임 시점에 supabase / postgrest / gotrue가 import 돼 있으면 지연 로딩이 깨진 것이므로 실패로 본다.
+(httpx는 flet 자체가 import 하므로 참고용으로만 보여 줌)
+
+사용:
+    python scripts/bench_startup.py --runs 10
+    python scripts/bench_startup.py --runs 10 --max-ms 300   # 넘으면 exit 1
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 자식 프로세스에서 실행되는 코드
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+
+import flet as ft
+
+# flet이 이미 끌고 온 모듈은 지연 로딩 판정에서 뺀다
+after_flet = set(sys.modules)
+
+import main
+
+t_import = time.perf_counter()
+
+
+class _Session(dict):
+    def set(self, key, value):
+        self[key] = value
+
+
+class BenchPage:
+    # main.main / LoginView가 쓰는 만큼만 흉내 내는 page
+    def __init__(self):
+        self.session = _Session()
+        self.controls = []
+        self.overlay = []
+        self.route = "/"
+        self.on_route_change = None
+        self.first_frame = None
+        self.threads = []
+
+    def go(self, route):
+        self.route = route
+        if self.on_route_change:
+            self.on_route_change(None)
+
+    def update(self, *controls):
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter()
+
+    def run_thread(self, handler, *args):
+        # 워밍업은 첫 프레임 이후 백그라운드 작업이므로 측정에서 제외
+        self.threads.append(handler)
+
+
+page = BenchPage()
+main.main(page)
+
+print(json.dumps({
+    "import_ms": (t_import - t0) * 1000,
+    "first_frame_ms": (page.first_frame - t0) * 1000,
+    "view": type(page.controls[0]).__name__ if page.controls else None,
+    "backend_loaded": [
+        m for m in ("supabase", "postgrest", "gotrue")
+        if m in sys.modules and m not in after_flet
+    ],
+    "httpx_loaded": "httpx" in sys.modules,
+    "view_modules": sorted(m for m in sys.modules if m.startswith("ui.views_")),
+}))
+"""
+
+
+def run_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LoginView time-to-first-frame 측정")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="중앙값이 이 값을 넘으면 실패")
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    first_frame = sorted(r["first_frame_ms"] for r in results)
+    imports = [r["import_ms"] for r in results]
+    last = results[-1]
+
+    median = statistics.median(first_frame)
+    print(f"runs            : {args.runs}")
+    print(f"view            : {last['view']}")
+    print(f"import main     : median {statistics.median(imports):.1f} ms")
+    print(f"first frame     : median {median:.1f} ms, "
+          f"min {first_frame[0]:.1f} ms, max {first_frame[-1]:.1f} ms")
+    print(f"backend loaded  : {', '.join(last['backend_loaded']) or '-'}")
+    print(f"httpx loaded    : {last['httpx_loaded']} (참고용, flet이 import)")
+    print(f"view modules    : {', '.join(last['view_modules'])}")
+
+    failed = bool(last["backend_loaded"])
+    if failed:
+        print(f"FAIL: 첫 프레임 전에 {', '.join(last['backend_loaded'])} import됨")
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median {median:.1f} ms > {args.max_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
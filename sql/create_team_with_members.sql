@@ -0,0 +1,32 @@
+-- sql/create_team_with_members.sql
+-- 팀 + 팀원(team_members)을 한 트랜잭션으로 생성하는 RPC.
+-- 앱에서는 supabase.rpc("create_team_with_members", {...}) 한 번으로 호출한다.
+-- (두 번째 insert가 실패해도 팀만 덩그러니 남는 일이 없음)
+
+create or replace function public.create_team_with_members(
+    p_name text,
+    p_leader_id uuid,
+    p_member_ids uuid[] default '{}'
+)
+returns public.teams
+language plpgsql
+as $$
+declare
+    new_team public.teams;
+begin
+    insert into public.teams (id, name, leader_id)
+    values (gen_random_uuid(), p_name, p_leader_id)
+    returning * into new_team;
+
+    -- 팀장은 leader, 나머지는 member (중복/팀장 본인은 제외)
+    insert into public.team_members (id, team_id, user_id, role)
+    values (gen_random_uuid(), new_team.id, p_leader_id, 'leader');
+
+    insert into public.team_members (id, team_id, user_id, role)
+    select gen_random_uuid(), new_team.id, m.user_id, 'member'
+    from (select distinct unnest(p_member_ids) as user_id) m
+    where m.user_id is not null and m.user_id <> p_leader_id;
+
+    return new_team;
+end;
+$$;
@@ -0,0 +1,89 @@
+-- sql/save_schedule_checked.sql
+-- 일정 추가/수정을 중복 체크와 함께 한 번에 처리하는 RPC.
+-- 앱에서는 supabase.rpc("save_schedule_checked", {...}) 한 번으로 호출한다.
+--
+-- - 같은 사용자/같은 날짜에 블록 범위가 겹치는 일정은 제약 조건 schedules_no_overlap으로 막음
+--   (두 클라이언트가 동시에 저장해도 둘 다 들어가는 일이 없음)
+--   제약은 sql/schedules_no_overlap.sql 마이그레이션에서 한 번만 추가 → 그 파일을 먼저 적용
+-- - 이 파일은 함수 정의만 있으므로 몇 번이고 다시 실행해도 됨 (create or replace)
+-- - p_is_movable / p_is_available이 null이면 건드리지 않음
+--     추가: 테이블 컬럼 기본값 그대로, 수정: 저장돼 있던 값 그대로
+-- - 반환값 (jsonb)
+--     {"status": "ok", "schedule": 저장된 row, "previous": 수정 전 row 또는 null}
+--     {"status": "conflict", "conflict_title": 겹치는 일정 제목}
+--     {"status": "not_found"}  -- 수정할 일정이 없거나 내 일정이 아님
+
+create or replace function public.save_schedule_checked(
+    p_user_id uuid,
+    p_date date,
+    p_start_block int,
+    p_end_block int,
+    p_title text,
+    p_description text default '',
+    p_is_movable boolean default null,
+    p_is_available boolean default null,
+    p_id uuid default null
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    saved public.schedules;
+    previous public.schedules;
+    conflict_title text;
+begin
+    if p_id is null then
+        -- 플래그는 빼고 넣어서 null이면 컬럼 기본값이 들어가게 함
+        insert into public.schedules
+            (user_id, date, start_block, end_block, title, description)
+        values
+            (p_user_id, p_date, p_start_block, p_end_block, p_title, p_description)
+        returning * into saved;
+
+        if p_is_movable is not null or p_is_available is not null then
+            update public.schedules
+            set is_movable = coalesce(p_is_movable, is_movable),
+                is_available = coalesce(p_is_available, is_available)
+            where id = saved.id
+            returning * into saved;
+        end if;
+    else
+        select * into previous
+        from public.schedules
+        where id = p_id and user_id = p_user_id
+        for update;
+
+        if not found then
+            return jsonb_build_object('status', 'not_found');
+        end if;
+
+        update public.schedules
+        set date = p_date,
+            start_block = p_start_block,
+            end_block = p_end_block,
+            title = p_title,
+            description = p_description,
+            is_movable = coalesce(p_is_movable, is_movable),
+            is_available = coalesce(p_is_available, is_available)
+        where id = p_id
+        returning * into saved;
+    end if;
+
+    return jsonb_build_object(
+        'status', 'ok',
+        'schedule', to_jsonb(saved),
+        'previous', to_jsonb(previous)
+    );
+
+exception when exclusion_violation then
+    select s.title into conflict_title
+    from public.schedules s
+    where s.user_id = p_user_id
+      and s.date = p_date
+      and s.id is distinct from p_id
+      and int4range(s.start_block, s.end_block, '[]') && int4range(p_start_block, p_end_block, '[]')
+    limit 1;
+
+    return jsonb_build_object('status', 'conflict', 'conflict_title', conflict_title);
+end;
+$$;
@@ -0,0 +1,46 @@
+-- sql/schedules_no_overlap.sql
+-- 같은 사용자/같은 날짜에 블록 범위가 겹치는 일정을 막는 제약 조건 (마이그레이션, 한 번만 적용).
+-- save_schedule_checked RPC(sql/save_schedule_checked.sql)는 이 제약이 있어야
+-- 동시에 저장해도 겹치는 일정이 둘 다 들어가지 않는다 → 이 파일을 먼저 적용.
+--
+-- 여러 번 실행해도 안전함 (확장 / 제약 모두 없을 때만 만든다).
+--
+-- [적용 전 데이터 정리]
+-- 이미 겹치는 일정이 있으면 제약 추가가 실패한다 (conflicting key value violates exclusion constraint).
+-- 1) 아래 쿼리로 겹치는 쌍을 확인하고
+--
+--     select a.user_id, a.date,
+--            a.id as id_a, a.title as title_a, a.start_block as start_a, a.end_block as end_a,
+--            b.id as id_b, b.title as title_b, b.start_block as start_b, b.end_block as end_b
+--     from public.schedules a
+--     join public.schedules b
+--       on a.user_id = b.user_id
+--      and a.date = b.date
+--      and a.id < b.id
+--      and int4range(a.start_block, a.end_block, '[]') && int4range(b.start_block, b.end_block, '[]')
+--     order by a.user_id, a.date;
+--
+-- 2) 사용자와 확인해서 한쪽을 옮기거나(start_block / end_block / date 수정) 지운 뒤
+-- 3) 결과가 0건이 되면 이 파일을 실행한다.
+-- (어느 일정을 남길지는 사용자 데이터라서 자동으로 지우지 않는다)
+
+create extension if not exists btree_gist;
+
+do $$
+begin
+    if not exists (
+        select 1
+        from pg_constraint
+        where conname = 'schedules_no_overlap'
+          and conrelid = 'public.schedules'::regclass
+    ) then
+        alter table public.schedules
+            add constraint schedules_no_overlap
+            exclude using gist (
+                user_id with =,
+                date with =,
+                int4range(start_block, end_block, '[]') with &&
+            );
+    end if;
+end;
+$$;
@@ -1,4 +1,138 @@
-from supabase import create_client
+# supabase_client.py
+"""
+Supabase 클라이언트는 처음 쓸 때 만든다.
+
+supabase / httpx 패키지 import + create_client가 꽤 무거워서
+모듈 import 시점에 만들면 로그인 화면이 뜨기 전에 그 비용을 전부 치르게 된다.
+→ get_supabase()로만 접근하고, 첫 호출에서 한 번만 생성 (스레드 풀에서 동시에 불려도 안전).
+
+돌려주는 클라이언트는 얇은 계측 래퍼라서 table(...) / rpc(...) 쿼리마다
+테이블, 작업, 필터 모양, row 수, 바이트, 걸린 시간을 query_stats에 기록한다.
+(사용법은 원래 클라이언트와 같음)
+
+바이트는 응답을 다시 JSON으로 직렬화해서 재야 하므로 BYTE_SAMPLE_EVERY번에 한 번만 잰다.
+나머지는 query_stats가 잰 것들의 row당 바이트로 추정한다.
+"""
+import itertools
+import json
+import threading
+import time
+from typing import Optional
+
 from config import SUPABASE_URL, SUPABASE_ANON_KEY
+from query_stats import query_stats
+
+_client = None
+_lock = threading.Lock()
+
+# 작업 종류를 정하는 빌더 메서드
+_OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+BYTE_SAMPLE_EVERY = 10  # 응답 바이트는 이 횟수마다 한 번만 잼 (첫 쿼리는 항상)
+_byte_sample_counter = itertools.count()
+
+
+def get_supabase():
+    """공용 Supabase 클라이언트 (없으면 생성)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from supabase import create_client
+
+                _client = InstrumentedClient(create_client(SUPABASE_URL, SUPABASE_ANON_KEY))
+    return _client
+
+
+class InstrumentedClient:
+    """table() / rpc()만 계측하고 나머지는 원래 클라이언트로 넘김"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str) -> "InstrumentedQuery":
+        return InstrumentedQuery(self._client.table(name), name)
+
+    def rpc(self, fn: str, params: dict | None = None) -> "InstrumentedQuery":
+        return InstrumentedQuery(self._client.rpc(fn, params or {}), f"rpc:{fn}", "rpc")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class InstrumentedQuery:
+    """
+    postgrest 쿼리 빌더 래퍼.
+    체이닝하는 동안 작업 / 필터 모양(값은 빼고 메서드+컬럼만)을 모으고, execute()에서 기록.
+    """
+
+    def __init__(self, builder, table: str, operation: str = "", filters: tuple = ()):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._filters = filters
+
+    def execute(self):
+        started = time.perf_counter()
+        try:
+            res = self._builder.execute()
+        except Exception:
+            self._record(0, None, _elapsed_ms(started), error=True)
+            raise
+        # 걸린 시간은 직렬화 전에 잼 (바이트를 잰 쿼리만 느려 보이지 않게)
+        ms = _elapsed_ms(started)
+        data = getattr(res, "data", None)
+        size = _byte_size(data) if next(_byte_sample_counter) % BYTE_SAMPLE_EVERY == 0 else None
+        self._record(_row_count(data), size, ms)
+        return res
+
+    def _record(self, rows: int, size: Optional[int], ms: float, error: bool = False):
+        query_stats.record(
+            self._table,
+            self._operation or "?",
+            ",".join(self._filters),
+            rows,
+            size,
+            ms,
+            error,
+        )
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if not hasattr(result, "execute"):
+                return result
+            if name in _OPERATIONS:
+                return InstrumentedQuery(result, self._table, name, self._filters)
+            return InstrumentedQuery(
+                result, self._table, self._operation, self._filters + (_filter_shape(name, args),)
+            )
+
+        return call
+
+
+def _filter_shape(method: str, args: tuple) -> str:
+    """eq("user_id", ...) → "eq(user_id)" / or_("...") → "or_" (값은 기록하지 않음)"""
+    if method in ("or_", "filter", "not_") or not args or not isinstance(args[0], str):
+        return method
+    return f"{method}({args[0]})"
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def _row_count(data) -> int:
+    if isinstance(data, list):
+        return len(data)
+    return 0 if data is None else 1
+
 
-supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+def _byte_size(data) -> int:
+    if data is None:
+        return 0
+    return len(json.dumps(data, ensure_ascii=False, default=str).encode("utf-8"))
@@ -0,0 +1,284 @@
+# team_cache.py
+"""
+프로세스 전체(모든 Flet 세션)가 공유하는 팀 관련 캐시.
+
+- TeamListCache: user_id → 내 팀 목록 (대시보드 팀 카드용)
+- TeamWeekCache: (team_id, week_start) → 주간 팀 가용성 (TeamView 히트맵용)
+
+repository의 스레드 풀에서도 접근하므로 lock으로 보호한다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from cache_utils import LRUCache, week_start_of
+
+TEAM_LIST_TTL_SECONDS = 300  # 다른 사람이 나를 팀에 넣은 경우도 5분 안에는 반영
+TEAM_LIST_MAX_USERS = 1000
+
+TEAM_WEEK_TTL_SECONDS = 60  # 팀원 일정 쓰기는 명시적으로 무효화, 그 외 변화는 1분 안에 반영
+TEAM_WEEK_MAX_ENTRIES = 500
+
+logger = logging.getLogger(__name__)
+
+
+class TeamListCache:
+    """
+    user_id별 팀 목록 캐시 (TTL + LRU 크기 제한).
+
+    - 같은 사용자를 동시에 요청하면 조회는 한 번만 한다 (single-flight)
+    - 조회 도중 invalidate()되면 그 조회는 떼어 내고 결과를 캐시에 넣지 않는다
+      → 팀 생성 직후 invalidate가 먼저 끝난 예전 조회 결과로 덮이지 않음
+    """
+
+    def __init__(self, ttl: float = TEAM_LIST_TTL_SECONDS, max_users: int = TEAM_LIST_MAX_USERS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # user_id -> (저장 시각, 팀 목록)
+        self._entries = LRUCache(max_users)
+        # 조회 중인 user_id -> 공유 Future
+        self._inflight: Dict[str, Future] = {}
+
+    def get_or_submit(self, user_id: str, submit: Callable[[], Future]) -> Future:
+        """
+        캐시에 있으면 완료된 Future, 조회 중이면 그 Future,
+        둘 다 아니면 submit()으로 새 조회를 시작하고 그 Future를 돌려준다.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                stored_at, teams = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    done: Future = Future()
+                    done.set_result(list(teams))
+                    return done
+                self._entries.pop(user_id)
+
+            fut = self._inflight.get(user_id)
+            if fut is not None:
+                return fut
+
+            fut = submit()
+            self._inflight[user_id] = fut
+
+        fut.add_done_callback(lambda f: self._on_done(user_id, f))
+        return fut
+
+    def _on_done(self, user_id: str, fut: Future):
+        with self._lock:
+            if self._inflight.get(user_id) is not fut:
+                # 조회 도중 무효화됨 → 저장하지 않음
+                return
+            del self._inflight[user_id]
+            if fut.cancelled() or fut.exception() is not None:
+                return
+            self._entries.put(user_id, (time.monotonic(), list(fut.result())))
+
+    def invalidate(self, user_ids: Iterable[str]):
+        with self._lock:
+            for uid in user_ids:
+                self._entries.pop(uid)
+                # 조회 중이던 것은 무효화 이전 상태일 수 있음 → 다음 요청은 새로 조회
+                self._inflight.pop(uid, None)
+
+
+class TeamWeekCache:
+    """
+    (team_id, week_start)별 주간 팀 가용성 캐시. 모든 세션이 공유한다.
+
+    - 같은 키를 동시에 요청하면 계산은 한 번만 하고 모두 그 결과를 기다린다 (single-flight)
+    - 팀원 일정이 쓰이면 apply_schedule_change()로 해당 블록만 증분 반영하고
+      구독 중인 뷰에 바뀐 칸을 알린다 (이전 상태를 모르면 invalidate_user_week()로 주 단위 폐기)
+    - 계산 도중 무효화되면 그 결과는 캐시에 넣지 않는다 (키별 세대 번호)
+
+    쓰기와 동시에 계산된 항목에는 그 쓰기가 이미 들어가 있을 수도 있다.
+    → 쓰기 전에 begin_write()로 번호를 받고, 그 이후에 저장된 항목은 증분 대신 버리고 다시 계산
+      (같은 일정이 두 번 반영되지 않도록)
+
+    캐시에 들어간 TeamAvailability는 여러 세션이 lock 없이 읽으므로 절대 고치지 않는다.
+    증분 반영은 복사본에 하고 lock 안에서 항목을 통째로 바꿔 끼운다 (copy-on-write).
+    구독 콜백은 async 함수로 받아 구독한 세션의 run_task(보통 page.run_task)로 넘긴다
+    → 쓰기를 한 스레드가 아니라 각 세션의 이벤트 루프에서 UI를 고친다.
+    """
+
+    def __init__(self, ttl: float = TEAM_WEEK_TTL_SECONDS, max_entries: int = TEAM_WEEK_MAX_ENTRIES):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (team_id, week_start) -> (저장 시각, TeamAvailability, 저장 당시 쓰기 번호)
+        self._entries = LRUCache(max_entries)
+        # begin_write()마다 증가하는 쓰기 번호
+        self._write_seq = 0
+        # 계산 중인 키 -> 공유 Future
+        self._inflight: Dict[Tuple[str, date], Future] = {}
+        # 계산 중인 키별 세대 번호 (계산 도중 무효화될 때마다 증가)
+        self._generation: Dict[Tuple[str, date], int] = {}
+        # 키별 변경 구독자: (run_task, callback) - 열려 있는 TeamView들
+        self._listeners: Dict[Tuple[str, date], List[Tuple[Callable, Callable]]] = {}
+
+    def get_or_submit(self, team_id: str, week_start: date, submit: Callable[[], Future]) -> Future:
+        """
+        캐시에 있으면 완료된 Future, 계산 중이면 그 Future,
+        둘 다 아니면 submit()으로 새 계산을 시작하고 그 Future를 돌려준다.
+        """
+        key = (team_id, week_start)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, avail, _ = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    done: Future = Future()
+                    done.set_result(avail)
+                    return done
+                self._entries.pop(key)
+
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut
+
+            generation = self._generation.get(key, 0)
+            fut = submit()
+            self._inflight[key] = fut
+
+        fut.add_done_callback(lambda f: self._on_done(key, f, generation))
+        return fut
+
+    def _on_done(self, key: Tuple[str, date], fut: Future, generation: int):
+        with self._lock:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+            stale = self._generation.pop(key, 0) != generation
+            if fut.cancelled() or fut.exception() is not None or stale:
+                # 실패했거나 계산 도중 무효화됨 → 저장하지 않음
+                return
+            self._entries.put(key, (time.monotonic(), fut.result(), self._write_seq))
+
+    def peek(self, team_id: str, week_start: date):
+        """캐시에 있는 최신 TeamAvailability (없거나 만료됐으면 None, 계산은 시작하지 않음)"""
+        with self._lock:
+            entry = self._entries.get((team_id, week_start))
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                return None
+            return entry[1]
+
+    def invalidate_user_week(self, user_id: str, d):
+        """user_id가 속한 팀들의 d가 포함된 주를 버림"""
+        week_start = week_start_of(d)
+        notify: List[Tuple[Callable, Callable, tuple]] = []
+        with self._lock:
+            for key, (_, avail, _) in self._entries.items():
+                if key[1] == week_start and user_id in avail.user_ids:
+                    self._entries.pop(key)
+                    # 증분 정보가 없으므로 None → 구독자는 전체 다시 계산
+                    for run_task, callback in self._listeners.get(key, []):
+                        notify.append((run_task, callback, (None, None)))
+            # 계산 중인 같은 주는 팀원 여부를 아직 모르므로 모두 무효 처리
+            for key in list(self._inflight.keys()):
+                if key[1] == week_start:
+                    self._generation[key] = self._generation.get(key, 0) + 1
+
+        _dispatch(notify)
+
+    def begin_write(self) -> int:
+        """
+        일정 쓰기를 DB에 보내기 직전에 호출. 반환한 번호를 apply_schedule_change(write=...)에 넘긴다.
+        이 번호 이후에 저장된 항목은 그 쓰기를 이미 읽었을 수 있다.
+        """
+        with self._lock:
+            self._write_seq += 1
+            return self._write_seq
+
+    def apply_schedule_change(
+        self,
+        user_id: str,
+        old: Optional[Tuple] = None,
+        new: Optional[Tuple] = None,
+        write: Optional[int] = None,
+    ):
+        """
+        팀원 일정 한 개의 추가/이동/삭제를 캐시된 가용성에 증분 반영.
+        old / new = (날짜, start_block, end_block), 추가면 old=None, 삭제면 new=None
+        write = 쓰기 전에 받은 begin_write() 번호 (None이면 지금 시작한 것으로 봄)
+
+        - 캐시에 있는 해당 주(들)의 TeamAvailability 복사본에 그 블록들만 고쳐서 바꿔 끼우고
+        - 실제로 바뀐 칸을 구독자(열려 있는 TeamView)에게 알린다
+        - 쓰기 시작 후에 저장된 항목은 이 변경이 이미 들어 있을 수 있으므로 버린다 (다시 계산)
+        """
+        weeks = {week_start_of(x[0]) for x in (old, new) if x is not None}
+        notify: List[Tuple[Callable, Callable, tuple]] = []
+
+        with self._lock:
+            if write is None:
+                self._write_seq += 1
+                write = self._write_seq
+            for key, (stored_at, avail, seq) in self._entries.items():
+                if key[1] not in weeks or user_id not in avail.user_ids:
+                    continue
+                if seq >= write:
+                    self._entries.pop(key)
+                    for run_task, callback in self._listeners.get(key, []):
+                        notify.append((run_task, callback, (None, None)))
+                    continue
+                # 다른 세션이 읽고 있을 수 있으므로 원본은 그대로 두고 새 버전을 만든다
+                updated = avail.copy()
+                if old is not None and new is not None:
+                    changed = updated.move_schedule(user_id, old, new)
+                elif old is not None:
+                    changed = updated.remove_schedule(user_id, *old)
+                else:
+                    changed = updated.add_schedule(user_id, *new)
+                if not changed:
+                    continue
+                # 저장 번호는 원래 읽은 시점 그대로 (다음 쓰기 판단 기준)
+                self._entries.put(key, (stored_at, updated, seq))
+                for run_task, callback in self._listeners.get(key, []):
+                    notify.append((run_task, callback, (updated, changed)))
+
+            # 계산 중인 같은 주는 이 변경이 반영됐는지 모르므로 무효 처리
+            for key in list(self._inflight.keys()):
+                if key[1] in weeks:
+                    self._generation[key] = self._generation.get(key, 0) + 1
+
+        # 알림은 lock 밖에서 각 구독 세션의 루프로 넘김 (여기서 UI를 직접 건드리지 않음)
+        _dispatch(notify)
+
+    def subscribe(
+        self, team_id: str, week_start: date, callback: Callable, run_task: Callable
+    ) -> Callable[[], None]:
+        """
+        (team_id, week_start) 변경 알림 등록. 반환값을 호출하면 해제.
+
+        callback은 async 함수이고 run_task(callback, ...)로 실행된다 (보통 page.run_task).
+        callback(갱신된 TeamAvailability, 바뀐 칸 리스트),
+        캐시가 통째로 무효화되면 callback(None, None)
+        """
+        key = (team_id, week_start)
+        listener = (run_task, callback)
+        with self._lock:
+            self._listeners.setdefault(key, []).append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                listeners = self._listeners.get(key, [])
+                if listener in listeners:
+                    listeners.remove(listener)
+                if not listeners:
+                    self._listeners.pop(key, None)
+
+        return unsubscribe
+
+
+def _dispatch(notify: List[Tuple[Callable, Callable, tuple]]):
+    """(run_task, callback, args)마다 구독 세션의 루프에 콜백 실행을 맡김"""
+    for run_task, callback, args in notify:
+        try:
+            run_task(callback, *args)
+        except Exception:
+            # 이미 닫힌 세션 등 → 다른 구독자에게는 계속 알림
+            logger.exception("팀 가용성 변경 알림 전달 실패: %r", callback)
+
+
+team_list_cache = TeamListCache()
+team_week_cache = TeamWeekCache()
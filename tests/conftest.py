@@ -0,0 +1,6 @@
+# tests/conftest.py
+# 저장소 루트의 모듈(availability, rescheduler 등)을 그대로 import 하기 위해 경로 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
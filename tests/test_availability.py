@@ -0,0 +1,195 @@
+# tests/test_availability.py
+from datetime import date, timedelta
+
+from availability import AvailabilityCube, TeamAvailability, block_mask
+
+MON = date(2026, 10, 12)  # 월요일 (평일 3블록, 주말 5블록)
+SUN = MON + timedelta(days=6)
+
+
+def make_team(user_ids=("u1", "u2", "u3"), rows=()):
+    return TeamAvailability.from_rows(list(user_ids), list(rows), MON, SUN)
+
+
+def row(user_id, d, start_block, end_block):
+    return {"user_id": user_id, "date": d, "start_block": start_block, "end_block": end_block}
+
+
+# --- 기본 집계 ---
+def test_block_mask():
+    assert block_mask(1, 1) == 0b1
+    assert block_mask(2, 3) == 0b110
+    assert block_mask(3, 2) == 0
+
+
+def test_counts_and_common_free_mask():
+    team = make_team(rows=[row("u1", MON, 1, 2), row("u2", MON, 2, 2)])
+    assert team.counts(MON) == {1: 2, 2: 1, 3: 3}
+    assert team.common_free_mask(MON) == 0b100
+    # 주말은 5블록
+    assert team.counts(SUN) == {1: 3, 2: 3, 3: 3, 4: 3, 5: 3}
+    assert team.range_counts()[MON] == team.counts(MON)
+
+
+def test_free_members_and_busy_mask():
+    team = make_team(rows=[row("u2", MON, 1, 1)])
+    assert team.free_members(MON, 1) == ["u1", "u3"]
+    assert team.busy_mask(MON, 1).bit_count() == 1
+    assert team.busy_mask(MON, 9) == 0
+
+
+def test_string_dates_and_rows_outside_range_or_team():
+    team = make_team(
+        rows=[
+            row("u1", MON.isoformat(), 1, 1),
+            row("stranger", MON, 2, 2),
+            row("u2", SUN + timedelta(days=1), 1, 1),
+        ]
+    )
+    assert team.counts(MON) == {1: 2, 2: 3, 3: 3}
+    assert team.counts(SUN + timedelta(days=1)) == {}
+
+
+# --- 큐브 (여러 팀 / 기간) ---
+def test_cube_team_sums_share_one_scan():
+    cube = AvailabilityCube.from_rows(
+        ["a", "b", "c"], [row("a", MON, 1, 1), row("c", MON, 1, 3)], MON, SUN
+    )
+    sums = cube.team_sums({"t1": ["a", "b"], "t2": ["b", "c"]})
+    assert sums["t1"][MON] == {1: 1, 2: 2, 3: 2}
+    assert sums["t2"][MON] == {1: 1, 2: 1, 3: 1}
+
+
+def test_cube_ratios_and_slice():
+    cube = AvailabilityCube.from_rows(["a", "b"], [row("a", MON, 1, 1)], MON, SUN)
+    assert cube.ratios(MON) == {1: 0.5, 2: 1.0, 3: 1.0}
+
+    sub = cube.slice(MON, MON)
+    assert sub.days == [MON]
+    assert sub.counts(MON) == cube.counts(MON)
+
+
+def test_team_view_matches_from_rows():
+    rows = [row("a", MON, 1, 2), row("x", MON, 1, 3)]
+    cube = AvailabilityCube.from_rows(["a", "b", "x"], rows, MON, SUN)
+    team = cube.team(["a", "b"])
+    assert team.size == 2
+    assert team.range_counts() == TeamAvailability.from_rows(["a", "b"], rows, MON, SUN).range_counts()
+
+
+# --- add / remove / move 대칭 ---
+def test_add_then_remove_restores_counts():
+    team = make_team()
+    before = team.range_counts()
+
+    assert team.add_schedule("u1", MON, 1, 2) == [(MON, 1), (MON, 2)]
+    assert team.counts(MON) == {1: 2, 2: 2, 3: 3}
+
+    assert team.remove_schedule("u1", MON, 1, 2) == [(MON, 1), (MON, 2)]
+    assert team.range_counts() == before
+
+
+def test_overlapping_schedules_keep_block_busy_until_last_removed():
+    team = make_team()
+    team.add_schedule("u1", MON, 1, 2)
+    # 같은 칸에 두 번째 일정 → 가능 여부는 안 바뀜 (2블록만 새로 바쁨 X)
+    assert team.add_schedule("u1", MON, 2, 3) == [(MON, 3)]
+
+    # 하나를 빼도 2블록은 다른 일정이 남아 있어서 그대로 바쁨
+    assert team.remove_schedule("u1", MON, 1, 2) == [(MON, 1)]
+    assert team.counts(MON) == {1: 3, 2: 2, 3: 2}
+
+    assert team.remove_schedule("u1", MON, 2, 3) == [(MON, 2), (MON, 3)]
+    assert team.counts(MON) == {1: 3, 2: 3, 3: 3}
+
+
+def test_remove_without_add_does_not_go_negative():
+    team = make_team()
+    assert team.remove_schedule("u1", MON, 1, 3) == []
+    team.add_schedule("u1", MON, 1, 1)
+    assert team.counts(MON)[1] == 2
+
+
+def test_move_and_move_back_is_symmetric():
+    team = make_team(rows=[row("u1", MON, 1, 2), row("u2", MON, 2, 2)])
+    before = team.range_counts()
+    tue = MON + timedelta(days=1)
+
+    changed = team.move_schedule("u1", (MON, 1, 2), (tue, 1, 1))
+    assert sorted(changed) == sorted([(MON, 1), (MON, 2), (tue, 1)])
+
+    back = team.move_schedule("u1", (tue, 1, 1), (MON, 1, 2))
+    assert sorted(back) == sorted(changed)
+    assert team.range_counts() == before
+
+
+def test_move_within_same_day_reports_only_real_changes():
+    team = make_team()
+    team.add_schedule("u1", MON, 1, 2)
+    # 2블록은 빠졌다가 다시 들어감 → 변화 없음
+    assert team.move_schedule("u1", (MON, 1, 2), (MON, 2, 3)) == [(MON, 1), (MON, 3)]
+
+
+def test_schedule_of_non_member_or_outside_range_is_ignored():
+    team = make_team()
+    assert team.add_schedule("stranger", MON, 1, 3) == []
+    assert team.add_schedule("u1", SUN + timedelta(days=1), 1, 1) == []
+    assert team.range_counts() == make_team().range_counts()
+
+
+def test_copy_is_independent():
+    team = make_team(rows=[row("u1", MON, 1, 1)])
+    clone = team.copy()
+    clone.add_schedule("u2", MON, 1, 1)
+    clone.remove_schedule("u1", MON, 1, 1)
+
+    assert team.counts(MON)[1] == 2
+    assert clone.counts(MON)[1] == 2
+    assert team.free_members(MON, 1) == ["u2", "u3"]
+    assert clone.free_members(MON, 1) == ["u1", "u3"]
+
+
+# --- best_slots 순서 ---
+def test_best_slots_orders_by_count_then_date_then_block():
+    tue = MON + timedelta(days=1)
+    rows = [row("u1", d, 1, 3) for d in (MON + timedelta(days=i) for i in range(7))]
+    rows = [r for r in rows if r["date"] not in (MON, tue)]
+    rows += [row("u2", MON, 1, 1), row("u3", tue, 3, 3)]
+    team = make_team(rows=rows)
+
+    slots = team.best_slots(1, top_k=4)
+    assert [(s.date, s.start_block, s.available) for s in slots] == [
+        (MON, 2, 3),
+        (MON, 3, 3),
+        (tue, 1, 3),
+        (tue, 2, 3),
+    ]
+
+
+def test_best_slots_window_uses_all_blocks():
+    team = make_team(rows=[row("u1", MON, 2, 2)])
+    slot = team.best_slots(2, top_k=1)[0]
+    # 월요일 1~2 / 2~3은 u1이 겹침 → 화요일 1~2가 전원 가능
+    assert (slot.date, slot.start_block, slot.end_block) == (MON + timedelta(days=1), 1, 2)
+    assert slot.available == 3
+    assert slot.free_members == ("u1", "u2", "u3")
+
+
+def test_best_slots_required_members_and_quorum():
+    rows = [row("u1", MON + timedelta(days=i), 1, 5) for i in range(7)]
+    rows += [row("u2", MON, 1, 1)]
+    team = make_team(rows=rows)
+
+    assert team.best_slots(1, required_members=["u1"]) == []
+
+    slots = team.best_slots(1, top_k=3, quorum=2)
+    assert all(s.available >= 2 for s in slots)
+    assert (slots[0].date, slots[0].start_block) == (MON, 2)
+
+
+def test_best_slots_longer_than_day_or_empty_team():
+    team = make_team()
+    weekend = [s for s in team.best_slots(5, top_k=10)]
+    assert {s.date.weekday() for s in weekend} == {5, 6}
+    assert make_team(user_ids=()).best_slots(1) == []
+    assert team.best_slots(0) == []
@@ -0,0 +1,106 @@
+# tests/test_rescheduler.py
+from datetime import date, timedelta
+
+from availability import block_mask
+from rescheduler import RescheduleProblem, optimize
+
+MON = date(2026, 10, 12)
+SUN = MON + timedelta(days=6)
+
+
+def sched(schedule_id, user_id, d, start_block, end_block, movable=True):
+    return {
+        "id": schedule_id,
+        "user_id": user_id,
+        "date": d.isoformat(),
+        "start_block": start_block,
+        "end_block": end_block,
+        "title": schedule_id,
+        "is_movable": movable,
+    }
+
+
+def problem(members, rows, start_block=1, end_block=1):
+    return RescheduleProblem.from_rows(members, rows, MON, start_block, end_block, MON, SUN)
+
+
+def assert_moves_are_valid(p, plan):
+    """옮긴 일정이 target / 서로 / 다른 일정과 겹치지 않음"""
+    target_mask = block_mask(p.target_start, p.target_end)
+    placed = {}
+    for move in plan.moves:
+        d, s, e = move.new
+        mask = block_mask(s, e)
+        if d == p.target_date:
+            assert not mask & target_mask
+        assert not p.occupied[move.user_id].get(d, 0) & mask
+        assert not placed.get((move.user_id, d), 0) & mask
+        placed[(move.user_id, d)] = placed.get((move.user_id, d), 0) | mask
+
+
+def test_frees_members_with_movable_blockers():
+    rows = [sched("s1", "u1", MON, 1, 1), sched("s2", "u2", MON, 1, 2)]
+    p = problem(["u1", "u2", "u3"], rows)
+    plan = optimize(p)
+
+    assert plan.available_before == 1
+    assert plan.available_after == 3
+    assert sorted(plan.freed_members) == ["u1", "u2"]
+    assert plan.complete
+    assert_moves_are_valid(p, plan)
+
+
+def test_non_movable_blocker_keeps_member_busy():
+    rows = [
+        sched("fixed", "u1", MON, 1, 1, movable=False),
+        sched("other", "u1", MON, 1, 1),
+        sched("s2", "u2", MON, 1, 1),
+    ]
+    p = problem(["u1", "u2"], rows)
+    plan = optimize(p)
+
+    assert p.fixed_members == ["u1"]
+    assert plan.freed_members == ["u2"]
+    assert all(m.user_id != "u1" for m in plan.moves)
+
+
+def test_max_moves_limits_moves_and_prefers_cheap_members():
+    rows = [
+        sched("a1", "u1", MON, 1, 1),
+        sched("a2", "u1", MON, 1, 1),
+        sched("b1", "u2", MON, 1, 1),
+        sched("c1", "u3", MON, 1, 1),
+    ]
+    p = problem(["u1", "u2", "u3"], rows)
+
+    plan = optimize(p, max_moves=2)
+    assert len(plan.moves) <= 2
+    assert sorted(plan.freed_members) == ["u2", "u3"]
+    assert plan.available_after == 2
+
+    assert optimize(p, max_moves=0).moves == []
+    assert len(optimize(p).moves) == 4
+
+
+def test_moves_prefer_nearest_slot():
+    p = problem(["u1"], [sched("s1", "u1", MON, 1, 1)])
+    plan = optimize(p)
+    # 같은 날 바로 옆 블록이 가장 가까움
+    assert plan.moves[0].new == (MON, 2, 2)
+
+
+def test_schedule_outside_target_does_not_block():
+    rows = [sched("s1", "u1", MON, 2, 3), sched("s2", "u1", MON + timedelta(days=1), 1, 1)]
+    p = problem(["u1"], rows)
+    plan = optimize(p)
+    assert plan.available_before == 1
+    assert plan.moves == []
+
+
+def test_is_available_schedule_still_blocks_target():
+    # 히트맵 / best_slots와 같은 기준: is_available 이어도 그 시간은 바쁨
+    row = sched("s1", "u1", MON, 1, 1)
+    row["is_available"] = True
+    plan = optimize(problem(["u1"], [row]))
+    assert plan.available_before == 0
+    assert plan.available_after == 1
@@ -0,0 +1,141 @@
+# tests/test_schedule_cache.py
+from datetime import date, datetime, timedelta
+
+from schedule_cache import WeekScheduleCache
+
+MON = date(2026, 10, 12)
+TUE = MON + timedelta(days=1)
+
+
+def make_cache(rows):
+    cache = WeekScheduleCache("u1")
+    cache.put(MON, rows)
+    return cache
+
+
+def sched(schedule_id, d, start_block, end_block, title="일정"):
+    return {
+        "id": schedule_id,
+        "user_id": "u1",
+        "date": d.isoformat(),
+        "start_block": start_block,
+        "end_block": end_block,
+        "title": title,
+    }
+
+
+# --- write-through ---
+def test_get_returns_copy_of_cached_rows():
+    cache = make_cache([sched("a", MON, 1, 1)])
+    rows = cache.get(MON)
+    rows.append(sched("b", MON, 2, 2))
+    assert [r["id"] for r in cache.get(MON)] == ["a"]
+    assert cache.get(MON + timedelta(days=7)) is None
+
+
+def test_upsert_moves_row_between_cached_weeks():
+    next_mon = MON + timedelta(days=7)
+    cache = make_cache([sched("a", MON, 1, 1), sched("b", TUE, 2, 2)])
+    cache.put(next_mon, [])
+
+    cache.upsert_row(sched("a", next_mon, 1, 1))
+    assert [r["id"] for r in cache.get(MON)] == ["b"]
+    assert [r["id"] for r in cache.get(next_mon)] == ["a"]
+
+    # 새 row도 날짜 순으로 끼워 넣음
+    cache.upsert_row(sched("c", MON, 3, 3))
+    assert [r["id"] for r in cache.get(MON)] == ["c", "b"]
+
+
+def test_upsert_into_uncached_week_only_removes_old_row():
+    cache = make_cache([sched("a", MON, 1, 1)])
+    cache.upsert_row(sched("a", MON + timedelta(days=14), 1, 1))
+    assert cache.get(MON) == []
+    assert cache.get(MON + timedelta(days=14)) is None
+
+
+def test_remove_row_and_invalidate():
+    cache = make_cache([sched("a", MON, 1, 1), sched("b", TUE, 1, 1)])
+    cache.remove_row("a")
+    assert [r["id"] for r in cache.get(MON)] == ["b"]
+
+    cache.invalidate(TUE.isoformat())
+    assert cache.get(MON) is None
+
+
+def test_oldest_week_is_evicted():
+    cache = WeekScheduleCache("u1", max_weeks=2)
+    weeks = [MON + timedelta(days=7 * i) for i in range(3)]
+    cache.put(weeks[0], [])
+    cache.put(weeks[1], [])
+    cache.get(weeks[0])  # 최근 사용으로 갱신
+    cache.put(weeks[2], [])
+    assert cache.get(weeks[1]) is None
+    assert cache.get(weeks[0]) == []
+
+
+def test_put_if_unchanged_skips_stale_or_filled_weeks():
+    cache = WeekScheduleCache("u1")
+    version = cache.version
+    cache.upsert_row(sched("a", MON, 1, 1))
+    # 조회 도중 쓰기가 있었으면 저장하지 않음
+    assert not cache.put_if_unchanged(MON, [], version)
+    assert cache.get(MON) is None
+
+    assert cache.put_if_unchanged(MON, [sched("a", MON, 1, 1)], cache.version)
+    # 이미 채워진 주는 덮어쓰지 않음
+    assert not cache.put_if_unchanged(MON, [], cache.version)
+    assert [r["id"] for r in cache.get(MON)] == ["a"]
+
+
+def test_overlap_at_shared_block_is_conflict():
+    cache = make_cache([sched("a", MON, 1, 2, "수업")])
+    assert cache.find_conflict(MON, 2, 3)["id"] == "a"
+    assert cache.find_conflict(MON, 1, 1)["id"] == "a"
+
+
+def test_adjacent_blocks_do_not_conflict():
+    cache = make_cache([sched("a", MON, 2, 2)])
+    assert cache.find_conflict(MON, 1, 1) is None
+    assert cache.find_conflict(MON, 3, 3) is None
+
+
+def test_range_covering_existing_schedule_conflicts():
+    cache = make_cache([sched("a", MON, 2, 2)])
+    assert cache.find_conflict(MON, 1, 3)["id"] == "a"
+
+
+def test_other_day_does_not_conflict():
+    cache = make_cache([sched("a", MON, 1, 3)])
+    assert cache.find_conflict(TUE, 1, 3) is None
+
+
+def test_exclude_id_skips_schedule_being_edited():
+    cache = make_cache([sched("a", MON, 1, 2), sched("b", MON, 3, 3)])
+    assert cache.find_conflict(MON, 1, 2, exclude_id="a") is None
+    assert cache.find_conflict(MON, 2, 3, exclude_id="a")["id"] == "b"
+
+
+def test_date_string_and_datetime_inputs():
+    cache = make_cache([sched("a", MON, 1, 1)])
+    assert cache.find_conflict(MON.isoformat(), 1, 1)["id"] == "a"
+    assert cache.find_conflict(datetime(2026, 10, 12, 9, 30), 1, 1)["id"] == "a"
+
+
+def test_uncached_week_is_not_covered():
+    cache = make_cache([sched("a", MON, 1, 1)])
+    next_week = MON + timedelta(days=7)
+    assert not cache.covers(next_week)
+    assert cache.find_conflict(next_week, 1, 1) is None
+
+
+def test_index_follows_writes():
+    cache = make_cache([sched("a", MON, 1, 1)])
+    assert cache.find_conflict(MON, 1, 1) is not None
+
+    cache.upsert_row(sched("a", TUE, 1, 1))
+    assert cache.find_conflict(MON, 1, 1) is None
+    assert cache.find_conflict(TUE, 1, 1)["id"] == "a"
+
+    cache.remove_row("a")
+    assert cache.find_conflict(TUE, 1, 1) is None
@@ -0,0 +1,161 @@
+# tests/test_team_cache.py
+from concurrent.futures import Future
+from datetime import date, timedelta
+
+from availability import TeamAvailability
+from team_cache import TeamListCache, TeamWeekCache
+
+MON = date(2026, 10, 12)
+SUN = MON + timedelta(days=6)
+
+
+def avail(rows=(), user_ids=("u1", "u2")):
+    return TeamAvailability.from_rows(list(user_ids), list(rows), MON, SUN)
+
+
+def fill(cache, value, team_id="t1"):
+    fut = Future()
+    assert cache.get_or_submit(team_id, MON, lambda: fut) is fut
+    fut.set_result(value)
+    return value
+
+
+# --- 팀 목록 ---
+def test_team_list_single_flight():
+    cache = TeamListCache()
+    fut = Future()
+    assert cache.get_or_submit("u1", lambda: fut) is fut
+    assert cache.get_or_submit("u1", lambda: 1 / 0) is fut
+
+    fut.set_result([{"id": "t1"}])
+    assert cache.get_or_submit("u1", lambda: 1 / 0).result() == [{"id": "t1"}]
+
+
+def test_team_list_entry_expires_after_ttl():
+    cache = TeamListCache(ttl=-1)
+    fut = Future()
+    cache.get_or_submit("u1", lambda: fut)
+    fut.set_result([])
+
+    fresh = Future()
+    assert cache.get_or_submit("u1", lambda: fresh) is fresh
+
+
+def test_team_list_invalidate_drops_inflight_result():
+    cache = TeamListCache()
+    stale = Future()
+    cache.get_or_submit("u1", lambda: stale)
+
+    cache.invalidate(["u1"])
+    stale.set_result(["old"])
+
+    fresh = Future()
+    assert cache.get_or_submit("u1", lambda: fresh) is fresh
+    fresh.set_result(["old", "new"])
+    assert cache.get_or_submit("u1", lambda: 1 / 0).result() == ["old", "new"]
+
+
+# --- 팀 주간 가용성 ---
+def test_week_cache_single_flight():
+    cache = TeamWeekCache()
+    fut = Future()
+    assert cache.get_or_submit("t1", MON, lambda: fut) is fut
+    # 계산 중인 키는 새로 submit 하지 않음
+    assert cache.get_or_submit("t1", MON, lambda: 1 / 0) is fut
+
+    fut.set_result(avail())
+    assert cache.get_or_submit("t1", MON, lambda: 1 / 0).result() is fut.result()
+
+
+def test_failed_computation_is_not_cached():
+    cache = TeamWeekCache()
+    fut = Future()
+    cache.get_or_submit("t1", MON, lambda: fut)
+    fut.set_exception(RuntimeError("db"))
+
+    retry = Future()
+    assert cache.get_or_submit("t1", MON, lambda: retry) is retry
+
+
+def test_invalidate_user_week_drops_only_teams_of_that_user():
+    cache = TeamWeekCache()
+    fill(cache, avail(), "t1")
+    other = fill(cache, avail(user_ids=("u3",)), "t2")
+
+    cache.invalidate_user_week("u1", MON + timedelta(days=2))
+    fresh = Future()
+    assert cache.get_or_submit("t1", MON, lambda: fresh) is fresh
+    assert cache.get_or_submit("t2", MON, lambda: 1 / 0).result() is other
+
+
+def test_inflight_computation_is_not_stored_after_invalidate():
+    cache = TeamWeekCache()
+    fut = Future()
+    cache.get_or_submit("t1", MON, lambda: fut)
+
+    cache.invalidate_user_week("u1", MON)
+    fut.set_result(avail())
+
+    fresh = Future()
+    assert cache.get_or_submit("t1", MON, lambda: fresh) is fresh
+
+
+def test_change_is_copy_on_write():
+    cache = TeamWeekCache()
+    original = fill(cache, avail())
+
+    cache.apply_schedule_change("u1", new=(MON, 1, 1), write=cache.begin_write())
+
+    updated = cache.peek("t1", MON)
+    assert updated is not original
+    assert original.counts(MON)[1] == 2
+    assert updated.counts(MON)[1] == 1
+
+
+def test_entry_stored_during_write_is_dropped_not_patched():
+    cache = TeamWeekCache()
+    write = cache.begin_write()
+    # 쓰기 도중 계산된 결과 (새 일정이 이미 들어 있음)
+    fill(cache, avail([{"user_id": "u1", "date": MON, "start_block": 1, "end_block": 1}]))
+
+    cache.apply_schedule_change("u1", new=(MON, 1, 1), write=write)
+    assert cache.peek("t1", MON) is None
+
+
+def test_inflight_computation_is_not_stored_after_change():
+    cache = TeamWeekCache()
+    fut = Future()
+    cache.get_or_submit("t1", MON, lambda: fut)
+
+    cache.apply_schedule_change("u1", new=(MON, 1, 1), write=cache.begin_write())
+    fut.set_result(avail())
+    assert cache.peek("t1", MON) is None
+
+
+def test_listeners_are_dispatched_through_run_task():
+    cache = TeamWeekCache()
+    fill(cache, avail())
+    calls = []
+
+    async def listener(a, changed):
+        pass
+
+    def run_task(callback, *args):
+        calls.append((callback, args))
+
+    def broken_run_task(callback, *args):
+        raise RuntimeError("session closed")
+
+    unsubscribe = cache.subscribe("t1", MON, listener, run_task)
+    cache.subscribe("t1", MON, listener, broken_run_task)
+
+    cache.apply_schedule_change("u2", new=(MON, 2, 3), write=cache.begin_write())
+    assert len(calls) == 1
+    callback, (updated, changed) = calls[0]
+    assert callback is listener
+    assert updated is cache.peek("t1", MON)
+    assert changed == [(MON, 2), (MON, 3)]
+
+    unsubscribe()
+    cache.invalidate_user_week("u2", MON)
+    assert len(calls) == 1
@@ -1,8 +1,25 @@
 # ui/__init__.py
+"""
+뷰 모듈은 실제로 쓸 때 import 한다. (로그인 화면만 필요할 때 나머지 뷰 import 비용 X)
 
-from .views_login import LoginView
-from .views_dashboard import DashboardView
-from .views_team import TeamView
-from .views_schedule_editor import ScheduleEditorView
+    from ui import LoginView  # 이 시점에 ui.views_login만 import
+"""
+import importlib
+
+_VIEW_MODULES = {
+    "LoginView": "views_login",
+    "DashboardView": "views_dashboard",
+    "TeamView": "views_team",
+    "ScheduleEditorView": "views_schedule_editor",
+}
 
 __all__ = ["LoginView", "DashboardView", "TeamView"]
+
+
+def __getattr__(name: str):
+    module_name = _VIEW_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    view = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = view
+    return view
@@ -0,0 +1,146 @@
+# ui/update_batcher.py
+"""
+페이지별 update 묶음 처리.
+
+핸들러에서 self.update() / self.page.update()를 연달아 부르면
+그때마다 diff를 계산해서 소켓으로 보낸다.
+→ 바뀐 컨트롤만 request()로 표시해 두고, 다음 이벤트 루프 tick에 한 번만 flush.
+
+- 표시된 컨트롤 중 조상이 같이 표시된 것은 빼고 가장 작은 서브트리들만 update
+- page 자체가 표시되면 page.update() 한 번
+- 요청마다 reason(부른 핸들러 이름, 예: "TeamView.on_date_change")을 넘기고
+  reason별로 요청 수 / flush 수를 세어 둔다 (stats)
+
+스낵바도 세션당 하나를 재사용하고 page 전체 update 없이 띄운다 (show_snack).
+
+사용 예:
+    request_update(self.page, self, reason="TeamView.on_date_change")
+"""
+import threading
+
+import flet as ft
+
+UPDATE_BATCHER_SESSION_KEY = "update_batcher"
+SNACK_BAR_SESSION_KEY = "snack_bar"
+
+
+class UpdateBatcher:
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self._lock = threading.Lock()
+        self._dirty: list[ft.Control] = []
+        self._reasons: set[str] = set()
+        self._scheduled = False
+        # 호출한 곳 -> {"requests": 요청 수, "flushes": 실제 flush 수, "controls": 보낸 서브트리 수}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def request(self, *controls: ft.Control, reason: str):
+        """controls(없으면 page 전체)를 다음 flush 대상으로 표시"""
+        with self._lock:
+            for c in controls or (self.page,):
+                if not any(c is d for d in self._dirty):
+                    self._dirty.append(c)
+            self._reasons.add(reason)
+            self._stat(reason)["requests"] += 1
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.page.run_task(self._flush_async)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+    # ---------- 내부 ----------
+    async def _flush_async(self):
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, []
+            reasons, self._reasons = self._reasons, set()
+            self._scheduled = False
+
+        roots = _smallest_subtrees(dirty, self.page)
+        if not roots:
+            return
+
+        if any(r is self.page for r in roots):
+            self.page.update()
+            sent = 1
+        else:
+            # 이미 화면에서 떨어진 컨트롤은 보내지 않음
+            roots = [r for r in roots if r.page is not None]
+            if not roots:
+                return
+            self.page.update(*roots)
+            sent = len(roots)
+
+        with self._lock:
+            for reason in reasons:
+                stat = self._stat(reason)
+                stat["flushes"] += 1
+                stat["controls"] += sent
+
+    def _stat(self, reason: str) -> dict[str, int]:
+        return self._stats.setdefault(reason, {"requests": 0, "flushes": 0, "controls": 0})
+
+
+def _smallest_subtrees(dirty: list[ft.Control], page: ft.Page) -> list:
+    """조상이 같이 표시된 컨트롤은 빼고 남은 것들 (page가 있으면 page 하나)"""
+    if any(c is page for c in dirty):
+        return [page]
+    ids = {id(c) for c in dirty}
+    roots = []
+    for c in dirty:
+        parent = getattr(c, "parent", None)
+        covered = False
+        while parent is not None:
+            if id(parent) in ids:
+                covered = True
+                break
+            parent = getattr(parent, "parent", None)
+        if not covered:
+            roots.append(c)
+    return roots
+
+
+def get_update_batcher(page: ft.Page) -> UpdateBatcher:
+    """현재 세션의 update 묶음 처리기 (없으면 생성)"""
+    batcher = page.session.get(UPDATE_BATCHER_SESSION_KEY)
+    if not isinstance(batcher, UpdateBatcher):
+        batcher = UpdateBatcher(page)
+        page.session.set(UPDATE_BATCHER_SESSION_KEY, batcher)
+    return batcher
+
+
+def request_update(page: ft.Page, *controls: ft.Control, reason: str):
+    """get_update_batcher(page).request(...) 줄임 (reason별로 집계)"""
+    get_update_batcher(page).request(*controls, reason=reason)
+
+
+def show_snack(page: ft.Page, msg: str):
+    """
+    세션당 SnackBar 하나를 재사용해서 메시지 표시.
+    page.open()이 SnackBar만 보내므로 page 전체 update는 필요 없음
+    (매번 새 SnackBar를 만들면 overlay에 계속 쌓임)
+    """
+    snack = page.session.get(SNACK_BAR_SESSION_KEY)
+    if not isinstance(snack, ft.SnackBar):
+        snack = ft.SnackBar(ft.Text(msg))
+        page.session.set(SNACK_BAR_SESSION_KEY, snack)
+    else:
+        snack.content = ft.Text(msg)
+    page.open(snack)
+
+
+def close_snack(page: ft.Page):
+    """세션 SnackBar를 닫고 페이지 / 세션에서 떼어 냄 (로그아웃용)"""
+    snack = page.session.get(SNACK_BAR_SESSION_KEY)
+    if not isinstance(snack, ft.SnackBar):
+        return
+    if snack.open:
+        page.close(snack)
+    if snack in page.overlay:
+        page.overlay.remove(snack)
+    page.session.remove(SNACK_BAR_SESSION_KEY)
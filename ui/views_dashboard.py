@@ -1,10 +1,13 @@
 # ui/views_dashboard.py
+import asyncio
 import flet as ft
 from datetime import date, timedelta
 
-from domain_models import Team
+import repository
 from ui.widgets_weather import WeatherHeader
-from supabase_client import supabase
+from ui.widgets_lazy_list import LazyListView
+from ui.update_batcher import request_update, show_snack
+from schedule_cache import get_week_cache
 
 
 class DashboardView(ft.Column):
@@ -34,7 +37,11 @@ class DashboardView(ft.Column):
             on_click=self.on_add_schedule_clicked,
         )
 
-        self.schedule_list = ft.Column(spacing=5)
+        self.schedule_list = LazyListView(
+            build_item=self._build_schedule_row,
+            empty_text="등록된 일정이 없습니다.",
+            item_extent=72,
+        )
 
         schedule_card = ft.Card(
             content=ft.Container(
@@ -95,23 +102,45 @@ class DashboardView(ft.Column):
             ),
         ]
 
-        # 초기 로딩
-
-        self.load_teams()
+        # 초기 로딩은 did_mount에서 비동기로 (먼저 스켈레톤만)
+        self.team_list.controls.append(
+            ft.Text("불러오는 중...", size=12, color=ft.Colors.GREY)
+        )
+        self.schedule_list.controls.append(
+            ft.Text("불러오는 중...", size=12, color=ft.Colors.GREY)
+        )
 
     def did_mount(self):
-        # 날씨 비동기 호출
-        self.page.run_task(self.weather_header.fetch_weather)
-        self.page.update()
+        # 각 카드는 데이터가 오면 스스로 update (여기서 page 전체 update 불필요)
+        self.page.run_task(self.load_all)
+
+    async def load_all(self):
+        """
+        팀 목록 / 다가오는 일정 / 날씨를 동시에 불러온다.
+        각 카드는 자기 데이터가 오는 즉시 따로 갱신되므로
+        전체 대기 시간은 가장 느린 요청 하나 정도.
+        """
+        await asyncio.gather(
+            self.load_teams(),
+            self.load_schedule_list(),
+            self.weather_header.fetch_weather(),
+            return_exceptions=True,
+        )
 
     # ==== 새 스케줄 페이지로 이동 ====
     def on_add_schedule_clicked(self, e):
         self.page.go("/schedule/new")
 
     # ==== 팀 관련 ====
-    def load_teams(self):
+    async def load_teams(self):
+        try:
+            teams = await repository.fetch_user_teams(self.user_id)
+        except Exception as ex:
+            self.team_list.controls.clear()
+            self._show_snack(f"팀 목록 로딩 중 오류: {ex}")
+            return
+
         self.team_list.controls.clear()
-        teams = Team.get_user_teams(self.user_id)
         for t in teams:
             row = ft.Row(
                 controls=[
@@ -124,82 +153,73 @@ class DashboardView(ft.Column):
                 ]
             )
             self.team_list.controls.append(row)
+        request_update(self.page, self.team_list, reason="DashboardView.load_teams")
 
     def on_add_team_clicked(self, e):
         self.page.go("/team/new")
 
     # ==== 일정 목록 로딩 ====
-    def load_schedule_list(self):
+    async def load_schedule_list(self):
         """
         오늘 기준 앞으로 2주 정도의 일정만 리스트로 보여줌.
+        DB에서 페이지 단위로 가져오고, 스크롤하면 다음 페이지를 불러온다.
         """
         try:
             end_date = self.today + timedelta(days=14)
-            res = (
-                supabase.table("schedules")
-                .select("*")
-                .eq("user_id", self.user_id)
-                .gte("date", self.today.isoformat())
-                .lte("date", end_date.isoformat())
-                .order("date")
-                .execute()
-            )
-            rows = res.data or []
-
-            self.schedule_list.controls.clear()
 
-            if not rows:
-                self.schedule_list.controls.append(
-                    ft.Text("등록된 일정이 없습니다.", size=12, color=ft.Colors.GREY)
-                )
-                return
-
-            for r in rows:
-                sid = r["id"]
-                date_str = str(r["date"])[:10]
-                start_block = r.get("start_block", r.get("block", 1))
-                end_block = r.get("end_block", start_block)
-                title = r.get("title") or "(제목 없음)"
-                desc = r.get("description") or ""
-
-                subtitle_parts = [f"{date_str} / {start_block}~{end_block}블록"]
-                if desc:
-                    subtitle_parts.append(desc)
-                subtitle = " | ".join(subtitle_parts)
-
-                row = ft.ListTile(
-                    title=ft.Text(title, weight=ft.FontWeight.BOLD),
-                    subtitle=ft.Text(subtitle, size=12),
-                    trailing=ft.Row(
-                        controls=[
-                            ft.IconButton(
-                                icon=ft.Icons.EDIT,
-                                tooltip="수정 (추후 구현)",
-                                data=sid,
-                                on_click=self.on_edit_schedule_clicked,
-                            ),
-                            ft.IconButton(
-                                icon=ft.Icons.DELETE,
-                                tooltip="삭제",
-                                data=sid,
-                                icon_color=ft.Colors.RED,
-                                on_click=self.on_delete_schedule_clicked,
-                            ),
-                        ],
-                        spacing=0,
-                    ),
+            async def load_page(offset: int, limit: int) -> list[dict]:
+                return await repository.fetch_schedules_page(
+                    self.user_id, self.today, end_date, offset, limit
                 )
-                self.schedule_list.controls.append(row)
+
+            await self.schedule_list.show_loader(load_page)
 
         except Exception as ex:
             self._show_snack(f"일정 로딩 중 오류: {ex}")
 
-    def on_delete_schedule_clicked(self, e):
+    def _build_schedule_row(self, r: dict) -> ft.Control:
+        sid = r["id"]
+        date_str = str(r["date"])[:10]
+        start_block = r.get("start_block", r.get("block", 1))
+        end_block = r.get("end_block", start_block)
+        title = r.get("title") or "(제목 없음)"
+        desc = r.get("description") or ""
+
+        subtitle_parts = [f"{date_str} / {start_block}~{end_block}블록"]
+        if desc:
+            subtitle_parts.append(desc)
+        subtitle = " | ".join(subtitle_parts)
+
+        return ft.ListTile(
+            title=ft.Text(title, weight=ft.FontWeight.BOLD),
+            subtitle=ft.Text(subtitle, size=12),
+            trailing=ft.Row(
+                controls=[
+                    ft.IconButton(
+                        icon=ft.Icons.EDIT,
+                        tooltip="수정 (추후 구현)",
+                        data=sid,
+                        on_click=self.on_edit_schedule_clicked,
+                    ),
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE,
+                        tooltip="삭제",
+                        data=sid,
+                        icon_color=ft.Colors.RED,
+                        on_click=self.on_delete_schedule_clicked,
+                    ),
+                ],
+                spacing=0,
+            ),
+        )
+
+    async def on_delete_schedule_clicked(self, e):
         schedule_id = e.control.data
         try:
-            supabase.table("schedules").delete().eq("id", schedule_id).execute()
+            await repository.delete_schedule(schedule_id)
+            get_week_cache(self.page).remove_row(schedule_id)
             self._show_snack("일정이 삭제되었습니다.")
-            self.load_schedule_list()
+            await self.load_schedule_list()
         except Exception as ex:
             self._show_snack(f"삭제 중 오류: {ex}")
 
@@ -210,5 +230,4 @@ class DashboardView(ft.Column):
         # self.page.go(f"/schedule/edit/{schedule_id}")
 
     def _show_snack(self, msg: str):
-        self.page.open(ft.SnackBar(ft.Text(msg)))
-        self.page.update()
+        show_snack(self.page, msg)
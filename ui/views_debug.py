@@ -0,0 +1,130 @@
+# ui/views_debug.py
+import flet as ft
+
+from config import DEBUG_ADMIN_EMAILS
+from query_stats import query_stats
+from ui.update_batcher import get_update_batcher, request_update, show_snack
+
+
+def can_view_query_stats(page: ft.Page) -> bool:
+    """로그인한 사용자가 PLANMASTER_DEBUG_ADMINS에 있는지 (없으면 /debug/queries는 404)"""
+    email = (page.session.get("user_email") or "").strip().lower()
+    return bool(email) and email in DEBUG_ADMIN_EMAILS
+
+
+class QueryDebugView(ft.Column):
+    """
+    숨김 디버그 페이지 (/debug/queries, 사이드바에 링크 없음).
+    PLANMASTER_DEBUG_ADMINS 환경 변수에 적힌 이메일로 로그인한 사용자만 열 수 있다.
+
+    - 화면(뷰 함수)별 Supabase 왕복 수 / row / 바이트 / p50·p95·p99 (프로세스 전체)
+    - 펼치면 그 화면에서 나간 쿼리 모양별 같은 통계
+    - 이 세션의 update flush 수 (핸들러별)
+    - JSON 복사 / 초기화
+    """
+
+    def __init__(self, page: ft.Page):
+        super().__init__()
+        self.page = page
+        self.expand = True
+        self.scroll = ft.ScrollMode.AUTO
+
+        self.summary_text = ft.Text("", size=12, color=ft.Colors.GREY)
+        self.source_list = ft.Column(spacing=4)
+        self.update_table = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("핸들러")),
+                ft.DataColumn(ft.Text("요청"), numeric=True),
+                ft.DataColumn(ft.Text("flush"), numeric=True),
+                ft.DataColumn(ft.Text("서브트리"), numeric=True),
+            ],
+        )
+
+        self.controls = [
+            ft.Row(
+                controls=[
+                    ft.Text("쿼리 계측", size=22, weight=ft.FontWeight.BOLD),
+                    ft.Container(expand=True),
+                    ft.OutlinedButton("새로고침", icon=ft.Icons.REFRESH, on_click=self.on_refresh_clicked),
+                    ft.OutlinedButton("JSON 복사", icon=ft.Icons.CONTENT_COPY, on_click=self.on_export_clicked),
+                    ft.OutlinedButton("초기화", icon=ft.Icons.DELETE_SWEEP, on_click=self.on_reset_clicked),
+                ],
+                vertical_alignment=ft.CrossAxisAlignment.CENTER,
+            ),
+            self.summary_text,
+            ft.Divider(),
+            ft.Text("화면별 Supabase 왕복", size=16, weight=ft.FontWeight.BOLD),
+            self.source_list,
+            ft.Divider(),
+            ft.Text("이 세션의 update flush", size=16, weight=ft.FontWeight.BOLD),
+            self.update_table,
+        ]
+        self._render()
+
+    # === 버튼 ===
+    def on_refresh_clicked(self, e):
+        self._render()
+        request_update(self.page, self, reason="QueryDebugView.on_refresh_clicked")
+
+    def on_export_clicked(self, e):
+        self.page.set_clipboard(query_stats.to_json())
+        show_snack(self.page, "계측 결과(JSON)를 클립보드에 복사했습니다.")
+
+    def on_reset_clicked(self, e):
+        # 계측은 프로세스 전체 공유 → 관리자만 비울 수 있음 (화면을 연 뒤 권한이 바뀐 경우도 다시 확인)
+        if not can_view_query_stats(self.page):
+            show_snack(self.page, "초기화 권한이 없습니다.")
+            return
+        query_stats.reset()
+        self._render()
+        request_update(self.page, self, reason="QueryDebugView.on_reset_clicked")
+
+    # === 그리기 ===
+    def _render(self):
+        snapshot = query_stats.snapshot()
+        sources = snapshot["sources"]
+        total_calls = sum(s["calls"] for s in sources.values())
+        self.summary_text.value = (
+            f"{snapshot['since']} 이후 · 총 {total_calls}회 · 갱신 {snapshot['generated_at']}"
+        )
+
+        if not sources:
+            self.source_list.controls = [ft.Text("아직 기록된 쿼리가 없습니다.", size=12, color=ft.Colors.GREY)]
+        else:
+            self.source_list.controls = [
+                ft.ExpansionTile(
+                    title=ft.Text(source, weight=ft.FontWeight.BOLD),
+                    subtitle=ft.Text(self._format_stats(stats), size=12),
+                    controls=[
+                        ft.ListTile(
+                            title=ft.Text(query, size=12),
+                            subtitle=ft.Text(self._format_stats(q), size=11),
+                            dense=True,
+                        )
+                        for query, q in stats["queries"].items()
+                    ],
+                )
+                for source, stats in sources.items()
+            ]
+
+        update_stats = get_update_batcher(self.page).stats()
+        self.update_table.rows = [
+            ft.DataRow(
+                cells=[
+                    ft.DataCell(ft.Text(reason, size=12)),
+                    ft.DataCell(ft.Text(str(s["requests"]))),
+                    ft.DataCell(ft.Text(str(s["flushes"]))),
+                    ft.DataCell(ft.Text(str(s["controls"]))),
+                ]
+            )
+            for reason, s in sorted(update_stats.items(), key=lambda kv: -kv[1]["flushes"])
+        ]
+
+    @staticmethod
+    def _format_stats(stats: dict) -> str:
+        ms = stats["ms"]
+        errors = f" · 오류 {stats['errors']}" if stats["errors"] else ""
+        return (
+            f"{stats['calls']}회 · {stats['rows']} rows · ~{stats['bytes'] / 1024:.1f} KB · "
+            f"p50 {ms['p50']}ms / p95 {ms['p95']}ms / p99 {ms['p99']}ms{errors}"
+        )
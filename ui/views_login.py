@@ -1,6 +1,7 @@
 # ui/views_login.py
 import flet as ft
-from domain_models import User
+import repository
+from ui.update_batcher import request_update
 
 
 class LoginView(ft.Column):
@@ -24,19 +25,19 @@ class LoginView(ft.Column):
             self.error_text,
         ]
 
-    def on_login_clicked(self, e):
+    async def on_login_clicked(self, e):
         email = self.email_field.value.strip()
         name = self.name_field.value.strip()
         if not email or not name:
             self.error_text.value = "이메일과 이름을 모두 입력하세요."
-            self.update()
+            request_update(self.page, self, reason="LoginView.on_login_clicked")
             return
 
         try:
-            user = User.get_or_create(email=email, name=name)
+            user = await repository.get_or_create_user(email, name)
         except Exception as ex:
             self.error_text.value = f"로그인 실패: {ex}"
-            self.update()
+            request_update(self.page, self, reason="LoginView.on_login_clicked")
             return
 
         # 세션 저장
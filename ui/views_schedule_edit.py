@@ -2,8 +2,12 @@
 import flet as ft
 import datetime
 
-from supabase_client import supabase
+import repository
 from utils import get_block_count
+from cache_utils import week_start_of
+from schedule_cache import get_week_cache
+from ui.widgets_date_picker import SharedDatePicker, get_date_picker
+from ui.update_batcher import request_update, show_snack
 
 
 class ScheduleEditView(ft.Column):
@@ -22,6 +26,8 @@ class ScheduleEditView(ft.Column):
 
         # 상태
         self.selected_date: datetime.date | None = None
+        # 겹침 검사용으로 불러오는 중인 주 (중복 조회 방지)
+        self._loading_week: datetime.date | None = None
 
         # --- UI 컨트롤 ---
         self.title_field = ft.TextField(label="일정 이름", width=350)
@@ -35,11 +41,13 @@ class ScheduleEditView(ft.Column):
             label="시작 블록",
             width=150,
             options=[ft.dropdown.Option(str(i)) for i in range(1, 6)],
+            on_change=self.on_blocks_changed,
         )
         self.end_block_dd = ft.Dropdown(
             label="끝 블록",
             width=150,
             options=[ft.dropdown.Option(str(i)) for i in range(1, 6)],
+            on_change=self.on_blocks_changed,
         )
 
         self.desc_field = ft.TextField(
@@ -55,8 +63,8 @@ class ScheduleEditView(ft.Column):
             "취소", on_click=lambda e: self.page.go("/timetable")
         )
 
-        # DatePicker는 did_mount에서 생성
-        self.date_picker: ft.DatePicker | None = None
+        # 세션 공용 DatePicker (did_mount에서 가져옴)
+        self.date_picker: SharedDatePicker | None = None
 
         header = ft.Row(
             controls=[
@@ -75,6 +83,9 @@ class ScheduleEditView(ft.Column):
             spacing=10,
         )
 
+        # 드롭다운을 바꿀 때마다 보여주는 겹침 경고
+        self.conflict_text = ft.Text("", size=12, color=ft.Colors.RED, visible=False)
+
         button_row = ft.Row(
             controls=[self.save_button, self.cancel_button],
             spacing=10,
@@ -86,6 +97,7 @@ class ScheduleEditView(ft.Column):
             self.title_field,
             ft.Row([self.date_button]),
             block_row,
+            self.conflict_text,
             self.desc_field,
             ft.Container(height=10),
             button_row,
@@ -93,37 +105,26 @@ class ScheduleEditView(ft.Column):
 
     # --- 라이프사이클 ---
     def did_mount(self):
-        # DatePicker overlay 등록
-        self.date_picker = ft.DatePicker(
-            on_change=self.on_date_change,
-            first_date=datetime.date(2024, 1, 1),
-            last_date=datetime.date(2026, 12, 31),
-        )
-        self.page.overlay.append(self.date_picker)
+        # 세션 공용 DatePicker 연결
+        self.date_picker = get_date_picker(self.page)
 
-        # 일정 데이터 로드
-        self.load_schedule()
+        # 일정 데이터 로드 (비동기, 다 채운 뒤 한 번 update)
+        self.page.run_task(self.load_schedule)
 
-        self.update()
-        self.page.update()
+    def will_unmount(self):
+        # 떠난 뒤에는 날짜 선택 콜백을 받지 않음
+        if self.date_picker:
+            self.date_picker.release(self)
 
     # --- 일정 로딩 ---
-    def load_schedule(self):
+    async def load_schedule(self):
         try:
-            res = (
-                supabase.table("schedules")
-                .select("*")
-                .eq("id", self.schedule_id)
-                .execute()
-            )
-            rows = res.data or []
-            if not rows:
+            row = await repository.fetch_schedule(self.schedule_id)
+            if not row:
                 self._show_snack("일정을 찾을 수 없습니다.")
                 self.page.go("/timetable")
                 return
 
-            row = rows[0]
-
             # 본인 일정인지 확인
             if row.get("user_id") != self.user_id:
                 self._show_snack("이 일정을 수정할 권한이 없습니다.")
@@ -152,6 +153,9 @@ class ScheduleEditView(ft.Column):
 
             self.start_block_dd.value = str(start_block)
             self.end_block_dd.value = str(end_block)
+            self._check_conflict()
+
+            request_update(self.page, self, reason="ScheduleEditView.load_schedule")
 
         except Exception as ex:
             self._show_snack(f"일정 로딩 중 오류: {ex}")
@@ -160,16 +164,14 @@ class ScheduleEditView(ft.Column):
     # --- DatePicker 관련 ---
     def open_date_picker(self, e):
         if self.date_picker:
-            self.page.open(self.date_picker)
+            self.date_picker.open(self, self.on_date_change, value=self.selected_date)
 
-    def on_date_change(self, e):
-        if not self.date_picker:
-            return
-        self.selected_date = self.date_picker.value
+    def on_date_change(self, selected: datetime.date):
+        self.selected_date = selected
         self.date_button.text = str(self.selected_date)
         self._update_block_dropdowns_for_date()
-        self.update()
-        self.page.update()
+        self._check_conflict()
+        request_update(self.page, self, reason="ScheduleEditView.on_date_change")
 
     def _update_block_dropdowns_for_date(self):
         """
@@ -202,8 +204,65 @@ class ScheduleEditView(ft.Column):
         clamp_value(self.start_block_dd)
         clamp_value(self.end_block_dd)
 
+    # --- 겹침 실시간 검사 ---
+    def on_blocks_changed(self, e):
+        self._check_conflict()
+        request_update(self.page, self.conflict_text, reason="ScheduleEditView.on_blocks_changed")
+
+    def _selected_blocks(self) -> tuple[int, int] | None:
+        try:
+            start_block = int(self.start_block_dd.value)
+            end_block = int(self.end_block_dd.value)
+        except (TypeError, ValueError):
+            return None
+        if start_block > end_block:
+            return None
+        return start_block, end_block
+
+    def _check_conflict(self) -> dict | None:
+        """
+        캐시된 주간 일정으로 지금 고른 날짜/블록이 다른 일정과 겹치는지 바로 검사 (네트워크 X).
+        그 주가 캐시에 없으면 한 번 불러와서 다시 검사한다. update는 호출하는 쪽에서.
+        """
+        conflict = None
+        blocks = self._selected_blocks()
+        cache = get_week_cache(self.page)
+        if self.selected_date and blocks is not None:
+            if cache.covers(self.selected_date):
+                conflict = cache.find_conflict(
+                    self.selected_date, *blocks, exclude_id=self.schedule_id
+                )
+            else:
+                week_start = week_start_of(self.selected_date)
+                if self._loading_week != week_start:
+                    self._loading_week = week_start
+                    self.page.run_task(self._load_week_for_check, week_start)
+
+        if conflict is not None:
+            exist_title = conflict.get("title") or "(제목 없음)"
+            self.conflict_text.value = f"이 시간대에는 이미 '{exist_title}' 일정이 있습니다."
+        self.conflict_text.visible = conflict is not None
+        return conflict
+
+    async def _load_week_for_check(self, week_start: datetime.date):
+        cache = get_week_cache(self.page)
+        version = cache.version
+        try:
+            rows = await repository.fetch_week_schedules(self.user_id, week_start)
+        except Exception:
+            # 검사만 못 할 뿐, 저장할 때 DB가 다시 확인함
+            return
+        finally:
+            if self._loading_week == week_start:
+                self._loading_week = None
+
+        cache.put_if_unchanged(week_start, rows, version)
+        if self.selected_date and cache.covers(self.selected_date) and self.page:
+            self._check_conflict()
+            request_update(self.page, self.conflict_text, reason="ScheduleEditView._load_week_for_check")
+
     # --- 저장 ---
-    def on_save_clicked(self, e):
+    async def on_save_clicked(self, e):
         # 1. 입력값 검증
         title = (self.title_field.value or "").strip()
         if not title:
@@ -231,53 +290,52 @@ class ScheduleEditView(ft.Column):
 
         description = (self.desc_field.value or "").strip()
 
-        # 2. 중복 일정 체크 (자기 자신 제외)
+        # 2. 캐시 검사는 화면 경고용일 뿐 (다른 기기에서 고친 일정이 반영 안 됐을 수 있음)
+        #    → 저장 여부는 항상 RPC가 정함
+        cache = get_week_cache(self.page)
+        local_conflict = cache.find_conflict(
+            self.selected_date, start_block, end_block, exclude_id=self.schedule_id
+        )
+
+        # 3. 중복 체크(자기 자신 제외) + 업데이트를 RPC 한 번으로
         try:
-            res = (
-                supabase.table("schedules")
-                .select("id,start_block,end_block,title")
-                .eq("user_id", self.user_id)
-                .eq("date", self.selected_date.isoformat())
-                .execute()
+            saved, exist_title = await repository.save_schedule(
+                self.user_id,
+                self.selected_date,
+                start_block,
+                end_block,
+                title,
+                description,
+                schedule_id=self.schedule_id,
             )
-            existing = res.data or []
-
-            for r in existing:
-                if r["id"] == self.schedule_id:
-                    continue
-                s = r.get("start_block", r.get("block", 1))
-                e_ = r.get("end_block", s)
-
-                # [start_block, end_block] vs [s, e_] 겹치면 충돌
-                if not (end_block < s or start_block > e_):
-                    exist_title = r.get("title") or "(제목 없음)"
-                    self._show_snack(
-                        f"해당 시간대에 이미 '{exist_title}' 일정이 있습니다."
-                    )
-                    return
-
-        except Exception as ex:
-            self._show_snack(f"중복 체크 중 오류: {ex}")
-            return
+            if exist_title is not None:
+                if local_conflict is None:
+                    # 캐시가 DB보다 오래됨 → 그 주를 다시 불러와 경고도 갱신
+                    cache.invalidate(self.selected_date)
+                    self._check_conflict()
+                    request_update(self.page, self.conflict_text, reason="ScheduleEditView.on_save_clicked")
+                self._show_snack(
+                    f"해당 시간대에 이미 '{exist_title}' 일정이 있습니다."
+                )
+                return
 
-        # 3. 업데이트
-        try:
-            row = {
-                "date": self.selected_date.isoformat(),
-                "start_block": start_block,
-                "end_block": end_block,
-                "title": title,
-                "description": description,
-            }
-            supabase.table("schedules").update(row).eq("id", self.schedule_id).execute()
+            if local_conflict is not None:
+                # 캐시에만 남아 있던 일정과 겹쳤던 것 → 이전 주에서 빼고 새 주는 버림 (다음에 새로 불러옴)
+                cache.remove_row(self.schedule_id)
+                cache.invalidate(self.selected_date)
+            else:
+                # 날짜가 바뀌었으면 이전 주에서 빠지고 새 주에 들어감
+                cache.upsert_row(saved)
             self._show_snack("일정이 수정되었습니다.")
             self.page.go("/timetable")
 
+        except LookupError:
+            # 그 사이 다른 곳에서 삭제됨
+            cache.remove_row(self.schedule_id)
+            self._show_snack("일정을 찾을 수 없습니다.")
         except Exception as ex:
             self._show_snack(f"일정 수정 중 오류: {ex}")
 
     # --- 공통 스낵바 ---
     def _show_snack(self, msg: str):
-        self.page.snack_bar = ft.SnackBar(ft.Text(msg))
-        self.page.snack_bar.open = True
-        self.page.update()
+        show_snack(self.page, msg)
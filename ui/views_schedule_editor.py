@@ -1,9 +1,13 @@
 # ui/views_schedule_editor.py
 import flet as ft
-from datetime import date, datetime
-from supabase_client import supabase
+from datetime import date
+import repository
 from domain_models import Schedule
+from cache_utils import week_start_of
+from schedule_cache import get_week_cache
 from utils import get_block_count
+from ui.widgets_date_picker import SharedDatePicker, get_date_picker
+from ui.update_batcher import request_update, show_snack
 
 
 class ScheduleEditorView(ft.Column):
@@ -23,8 +27,11 @@ class ScheduleEditorView(ft.Column):
         self.user_id = page.session.get("user_id")
         self.selected_date: date = date.today()
 
-        # DatePicker 인스턴스는 did_mount에서 생성
-        self.date_picker: ft.DatePicker | None = None
+        # 세션 공용 DatePicker (did_mount에서 가져옴)
+        self.date_picker: SharedDatePicker | None = None
+
+        # 겹침 검사용으로 불러오는 중인 주 (중복 조회 방지)
+        self._loading_week: date | None = None
 
         # ---------- 1) 스케줄 이름 ----------
         self.title_field = ft.TextField(
@@ -65,6 +72,7 @@ class ScheduleEditorView(ft.Column):
             width=150,
             options=block_options,
             value="1",
+            on_change=self.on_blocks_changed,
         )
 
         self.block_end_dd = ft.Dropdown(
@@ -72,6 +80,7 @@ class ScheduleEditorView(ft.Column):
             width=150,
             options=block_options,
             value="3",  # 기본은 평일 3블록 기준
+            on_change=self.on_blocks_changed,
         )
 
         block_row = ft.Row(
@@ -79,6 +88,9 @@ class ScheduleEditorView(ft.Column):
             spacing=10,
         )
 
+        # 드롭다운을 바꿀 때마다 보여주는 겹침 경고
+        self.conflict_text = ft.Text("", size=12, color=ft.Colors.RED, visible=False)
+
         # ---------- 4) 추가 설정 ----------
         self.is_movable_cb = ft.Checkbox(
             label="이 스케줄은 시간 조정 가능(movable)", value=True
@@ -131,6 +143,7 @@ class ScheduleEditorView(ft.Column):
                     # 블록 범위
                     ft.Text("블록 범위 (1~5)", size=14),
                     block_row,
+                    self.conflict_text,
                     ft.Divider(),
                     # 추가 설정
                     ft.Text("추가 설정", size=14),
@@ -153,72 +166,122 @@ class ScheduleEditorView(ft.Column):
 
     def did_mount(self):
         """
-        페이지에 붙은 후 DatePicker를 overlay에 추가.
+        페이지에 붙은 후 세션 공용 DatePicker 연결.
         """
-        self.date_picker = ft.DatePicker(
-            on_change=self.on_date_change,
-            first_date=date(2024, 1, 1),
-            last_date=date(2026, 12, 31),
-        )
-        self.page.overlay.append(self.date_picker)
-        self.page.update()
+        self.date_picker = get_date_picker(self.page)
+        self._check_conflict()
+        request_update(self.page, self.conflict_text, reason="ScheduleEditorView.did_mount")
+
+    def will_unmount(self):
+        # 떠난 뒤에는 날짜 선택 콜백을 받지 않음
+        if self.date_picker:
+            self.date_picker.release(self)
 
     def open_date_picker(self, e):
         """
         날짜 버튼 클릭 → DatePicker 열기
         """
         if self.date_picker:
-            self.page.open(self.date_picker)
+            self.date_picker.open(self, self.on_date_change, value=self.selected_date)
 
-    def on_date_change(self, e):
+    def on_date_change(self, selected: date):
         """
         DatePicker에서 날짜가 선택되었을 때:
         - selected_date만 갱신
         - 버튼 텍스트 & 안내 텍스트만 변경
         (블록 드롭다운은 건드리지 않는다)
         """
-        try:
-            raw = getattr(e.control, "value", None)
-            if raw is None:
-                raw = getattr(e, "data", None)
-
-            if isinstance(raw, date):
-                selected = raw
-            elif isinstance(raw, str) and raw:
-                selected = datetime.fromisoformat(raw).date()
-            else:
-                return
-
-            self.selected_date = selected
-            self.date_button.text = str(self.selected_date)
-            self.selected_date_text.value = self._format_selected_date()
-
-            # 전체를 새로 그려도 되지만, 여기서는 이 뷰만 업데이트
-            self.update()
-        except Exception as ex:
-            self._show_snack(f"날짜 변경 중 오류: {ex}")
+        self.selected_date = selected
+        self.date_button.text = str(self.selected_date)
+        self.selected_date_text.value = self._format_selected_date()
+        self._check_conflict()
+
+        # 바뀐 컨트롤만 (다음 tick에 한 번에)
+        request_update(
+            self.page,
+            self.date_button,
+            self.selected_date_text,
+            self.conflict_text,
+            reason="ScheduleEditorView.on_date_change",
+        )
 
     def _format_selected_date(self) -> str:
         return f"선택된 날짜: {self.selected_date.strftime('%Y-%m-%d')}"
 
+    # ---------- 겹침 실시간 검사 ----------
+
+    def on_blocks_changed(self, e):
+        self._check_conflict()
+        request_update(self.page, self.conflict_text, reason="ScheduleEditorView.on_blocks_changed")
+
+    def _selected_blocks(self) -> tuple[int, int] | None:
+        try:
+            start_block = int(self.block_start_dd.value)
+            end_block = int(self.block_end_dd.value)
+        except (TypeError, ValueError):
+            return None
+        if start_block > end_block:
+            return None
+        return start_block, end_block
+
+    def _check_conflict(self) -> dict | None:
+        """
+        캐시된 주간 일정으로 지금 고른 날짜/블록이 겹치는지 바로 검사 (네트워크 X).
+        그 주가 캐시에 없으면 한 번 불러와서 다시 검사한다. update는 호출하는 쪽에서.
+        """
+        conflict = None
+        blocks = self._selected_blocks()
+        cache = get_week_cache(self.page)
+        if blocks is not None:
+            if cache.covers(self.selected_date):
+                conflict = cache.find_conflict(self.selected_date, *blocks)
+            else:
+                week_start = week_start_of(self.selected_date)
+                if self._loading_week != week_start:
+                    self._loading_week = week_start
+                    self.page.run_task(self._load_week_for_check, week_start)
+
+        if conflict is not None:
+            exist_title = conflict.get("title") or "(제목 없음)"
+            self.conflict_text.value = f"이 시간대에는 이미 '{exist_title}' 일정이 있습니다."
+        self.conflict_text.visible = conflict is not None
+        return conflict
+
+    async def _load_week_for_check(self, week_start: date):
+        cache = get_week_cache(self.page)
+        version = cache.version
+        try:
+            rows = await repository.fetch_week_schedules(self.user_id, week_start)
+        except Exception:
+            # 검사만 못 할 뿐, 저장할 때 DB가 다시 확인함
+            return
+        finally:
+            if self._loading_week == week_start:
+                self._loading_week = None
+
+        cache.put_if_unchanged(week_start, rows, version)
+        if cache.covers(self.selected_date) and self.page:
+            self._check_conflict()
+            request_update(self.page, self.conflict_text, reason="ScheduleEditorView._load_week_for_check")
+
     # ---------- 버튼 동작 ----------
 
     def on_cancel_clicked(self, e):
         # 그냥 대시보드로 돌아가기
         self.page.go("/dashboard")
 
-    def on_save_clicked(self, e):
+    async def on_save_clicked(self, e):
         # 1. 입력값 읽기
         title = (self.title_field.value or "").strip()
         if not title:
             self._show_snack("일정 이름을 입력하세요.")
             return
 
-        # DatePicker에서 선택된 날짜 사용 (Date 객체라고 가정)
-        if not self.date_picker.value:
+        # 화면에 표시된 선택 날짜 사용 (공용 DatePicker의 value는 다른 화면 것일 수 있음)
+        if not self.selected_date:
             self._show_snack("날짜를 선택하세요.")
             return
-        date_val: datetime.date = self.date_picker.value
+        date_val: date = self.selected_date
 
         if not self.block_start_dd.value or not self.block_end_dd.value:
             self._show_snack("시작/끝 블록을 모두 선택하세요.")
@@ -233,45 +296,39 @@ class ScheduleEditorView(ft.Column):
 
         description = (self.desc_field.value or "").strip()
 
-        # 2. ✅ 중복 일정 체크 (같은 날, 해당 블록 범위 겹치면 추가 불가)
+        # 2. 캐시 검사는 화면 경고용일 뿐 (다른 기기에서 고친 일정이 반영 안 됐을 수 있음)
+        #    → 저장 여부는 항상 RPC가 정함
+        cache = get_week_cache(self.page)
+        local_conflict = cache.find_conflict(date_val, start_block, end_block)
+
+        # 3. ✅ 중복 체크 + insert를 RPC 한 번으로 (겹치면 DB가 거절하고 그 일정 제목을 돌려줌)
         try:
-            res = (
-                supabase.table("schedules")
-                .select("start_block,end_block,title")
-                .eq("user_id", self.user_id)
-                .eq("date", date_val.isoformat())
-                .execute()
+            saved, exist_title = await repository.save_schedule(
+                self.user_id,
+                date_val,
+                start_block,
+                end_block,
+                title,
+                description,
+                is_movable=bool(self.is_movable_cb.value),
+                is_available=bool(self.is_available_cb.value),
             )
-            existing = res.data or []
-
-            for r in existing:
-                s = r.get("start_block", r.get("block", 1))
-                e_ = r.get("end_block", s)
-
-                # [start_block, end_block] 와 [s,e_] 가 하나라도 겹치면 충돌
-                if not (end_block < s or start_block > e_):
-                    # 겹치는 기존 일정 제목도 같이 보여주면 UX ↑
-                    exist_title = r.get("title") or "(제목 없음)"
-                    self._show_snack(
-                        f"해당 시간대에 이미 '{exist_title}' 일정이 있습니다."
-                    )
-                    return
-
-        except Exception as ex:
-            self._show_snack(f"중복 체크 중 오류: {ex}")
-            return
+            if exist_title is not None:
+                if local_conflict is None:
+                    # 캐시가 DB보다 오래됨 → 그 주를 다시 불러와 경고도 갱신
+                    cache.invalidate(date_val)
+                    self._check_conflict()
+                    request_update(self.page, self.conflict_text, reason="ScheduleEditorView.on_save_clicked")
+                self._show_snack(
+                    f"해당 시간대에 이미 '{exist_title}' 일정이 있습니다."
+                )
+                return
 
-        # 3. ✅ 중복 없으니 실제로 insert
-        try:
-            row = {
-                "user_id": self.user_id,
-                "date": date_val.isoformat(),
-                "start_block": start_block,
-                "end_block": end_block,
-                "title": title,
-                "description": description,
-            }
-            supabase.table("schedules").insert(row).execute()
+            if local_conflict is not None:
+                # 캐시에만 남아 있던 일정과 겹쳤던 것 → 그 주는 버리고 다음에 새로 불러옴
+                cache.invalidate(date_val)
+            else:
+                cache.upsert_row(saved)
             self._show_snack("일정이 저장되었습니다.")
             self.page.go("/dashboard")
 
@@ -281,5 +338,4 @@ class ScheduleEditorView(ft.Column):
     # ---------- 공통 ----------
 
     def _show_snack(self, msg: str):
-        self.page.open(ft.SnackBar(ft.Text(msg)))
-        self.page.update()
+        show_snack(self.page, msg)
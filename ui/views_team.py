@@ -1,11 +1,19 @@
 # ui/views_team.py
+import asyncio
 import flet as ft
 from datetime import date, timedelta
 from typing import Dict
 
-from supabase_client import supabase
+import repository
 from utils import get_block_count
-from domain_models import ScheduleManager
+from availability import MeetingSlot, TeamAvailability
+from rescheduler import ReschedulePlan
+from team_cache import team_week_cache
+from ui.widgets_heatmap import HeatmapCanvas
+from ui.widgets_date_picker import SharedDatePicker, get_date_picker
+from ui.update_batcher import request_update, show_snack
+
+BEST_SLOT_TOP_K = 5  # 히트맵 옆에 보여줄 추천 시간 개수
 
 
 class TeamView(ft.Column):
@@ -27,12 +35,24 @@ class TeamView(ft.Column):
         self.reference_date: date = date.today()
         # 주 시작(월요일)
         self.week_start: date = self.reference_date - timedelta(days=self.reference_date.weekday())
-        self.date_picker: ft.DatePicker | None = None
+        # 세션 공용 DatePicker (did_mount에서 가져옴)
+        self.date_picker: SharedDatePicker | None = None
 
         # 팀 정보
         self.team_name: str = "팀"
         self.team_size: int = 0  # 팀원 수
 
+        # 히트맵 로딩 task (가장 마지막 요청만 반영)
+        self._heatmap_seq: int = 0
+        self._heatmap_future = None
+
+        # 일정 조정 제안 다이얼로그 (한 번 만들고 내용만 바꿔 재사용)
+        self._plan_dialog: ft.AlertDialog | None = None
+
+        # 현재 그려진 히트맵 상태 (증분 갱신용)
+        self._avail: TeamAvailability | None = None
+        self._unsubscribe = None
+
         # --- UI 컨트롤 구성 ---
 
         # 상단 헤더: 뒤로가기 + 팀 이름 + 주간 라벨(= 기준 날짜 선택 버튼)
@@ -54,8 +74,30 @@ class TeamView(ft.Column):
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
         )
 
-        # 주간 히트맵 그리드를 담을 컬럼
-        self.heatmap_grid = ft.Column(spacing=6)
+        # 주간 히트맵 (Canvas 하나로 그림)
+        self.heatmap = HeatmapCanvas()
+
+        # 히트맵 옆: 이번 주 추천 회의 시간 (연속 블록 수 선택)
+        self.slot_duration_dd = ft.Dropdown(
+            label="회의 길이",
+            width=140,
+            options=[ft.dropdown.Option(str(i), f"{i}블록") for i in range(1, 4)],
+            value="1",
+            on_change=self.on_slot_duration_change,
+        )
+        self.slot_list = ft.Column(spacing=6)
+        slot_panel = ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Text("추천 회의 시간", size=14, weight=ft.FontWeight.BOLD),
+                    self.slot_duration_dd,
+                    self.slot_list,
+                ],
+                spacing=8,
+            ),
+            padding=10,
+            width=220,
+        )
 
         # 팀원 없을 때 안내 정도만
         self.info_text = ft.Text("", size=12, color=ft.Colors.GREY)
@@ -70,7 +112,11 @@ class TeamView(ft.Column):
                 color=ft.Colors.GREY,
             ),
             ft.Container(height=10),
-            self.heatmap_grid,
+            ft.Row(
+                controls=[self.heatmap, slot_panel],
+                vertical_alignment=ft.CrossAxisAlignment.START,
+                spacing=20,
+            ),
             ft.Container(height=10),
             self.info_text,
         ]
@@ -81,22 +127,28 @@ class TeamView(ft.Column):
     def did_mount(self):
         """
         컨트롤이 페이지에 붙은 뒤 호출됨.
-        여기서 DatePicker overlay 등록 + 팀 정보 및 히트맵 로딩.
+        여기서 공용 DatePicker 연결 + 팀 정보 및 히트맵 로딩.
         """
-        # DatePicker 생성
-        self.date_picker = ft.DatePicker(
-            on_change=self.on_date_change,
-            first_date=date(2024, 1, 1),
-            last_date=date(2026, 12, 31),
-        )
-        self.page.overlay.append(self.date_picker)
+        self.date_picker = get_date_picker(self.page)
 
-        # 데이터 로딩
-        self.load_team_info()
-        self.refresh_heatmap()
+        # 데이터 로딩은 비동기로 (화면은 먼저 그려 둠)
+        self.info_text.value = "불러오는 중..."
+        self.page.run_task(self._load_all)
+        request_update(self.page, self.info_text, reason="TeamView.did_mount")
+
+    def will_unmount(self):
+        # 떠나는 뷰는 더 이상 변경 알림 / 날짜 선택을 받지 않음
+        self._stop_listening()
+        if self.date_picker:
+            self.date_picker.release(self)
+        if self._plan_dialog is not None and self._plan_dialog.open:
+            self.page.close(self._plan_dialog)
 
-        self.update()
-        self.page.update()
+    async def _load_all(self):
+        # 히트맵은 팀원 수가 필요하므로 팀 정보 다음에
+        await self.load_team_info()
+        self.refresh_heatmap()
+        request_update(self.page, self, reason="TeamView._load_all")
 
     # === 내부 헬퍼 ===
     def _format_week_label(self) -> str:
@@ -106,41 +158,28 @@ class TeamView(ft.Column):
     # === 날짜 선택 ===
     def open_date_picker(self, e):
         if self.date_picker:
-            self.page.open(self.date_picker)
+            self.date_picker.open(self, self.on_date_change, value=self.reference_date)
 
-    def on_date_change(self, e):
-        if not self.date_picker:
-            return
-        self.reference_date = self.date_picker.value
+    def on_date_change(self, selected: date):
+        self.reference_date = selected
         self.week_start = self.reference_date - timedelta(days=self.reference_date.weekday())
         self.week_label_button.text = self._format_week_label()
         self.refresh_heatmap()
-        self.update()
-        self.page.update()
+        # 라벨 + 비운 추천 목록 (+ 팀원이 없으면 비운 히트맵)만. 새 주 데이터는 refresh 쪽에서 따로 그림
+        request_update(self.page, self.week_label_button, self.heatmap, self.slot_list, reason="TeamView.on_date_change")
 
     # === 팀 정보 로딩 ===
-    def load_team_info(self):
+    async def load_team_info(self):
         """
         teams / team_members에서 팀 이름과 팀원 수만 가져온다.
         여기서는 self.update() 호출하지 않음.
         """
         try:
+            name, size = await repository.fetch_team_info(self.team_id)
             # 팀 이름
-            res_team = supabase.table("teams").select("name").eq("id", self.team_id).execute()
-            if res_team.data:
-                self.team_name = res_team.data[0]["name"]
-            else:
-                self.team_name = "팀"
-
+            self.team_name = name or "팀"
             # 팀원 수
-            res_members = (
-                supabase.table("team_members")
-                .select("user_id")
-                .eq("team_id", self.team_id)
-                .execute()
-            )
-            members = res_members.data or []
-            self.team_size = len(members)
+            self.team_size = size
 
             self.team_name_text.value = self.team_name
 
@@ -162,118 +201,226 @@ class TeamView(ft.Column):
         week_start ~ week_start+6 일주일에 대해
         각 요일의 각 블록에 가능한 인원 수를 계산해서
         7×5 그리드 히트맵을 그린다.
+
+        조회는 비동기 task로 하고, 날짜를 연달아 바꾸면 이전 task는 취소,
+        가장 마지막에 요청된 주의 결과만 반영한다. (latest-wins)
         """
-        self.heatmap_grid.controls.clear()
+        self._heatmap_seq += 1
+        if self._heatmap_future is not None and not self._heatmap_future.done():
+            self._heatmap_future.cancel()
+        self._heatmap_future = None
+        # 이전 주 변경 알림은 그만 받음 (새 주를 그린 뒤 다시 구독)
+        self._stop_listening()
+        # 이전 주 추천 목록도 비움 (새 결과 전까지 지난 주 슬롯을 눌러 제안을 열지 않게)
+        self._avail = None
+        self.slot_list.controls = []
 
         # 팀원이 없다면 그리드까지는 그리지 않음
         if self.team_size == 0:
+            self.heatmap.clear()
             return
 
+        self._heatmap_future = self.page.run_task(
+            self._refresh_heatmap_async, self._heatmap_seq, self.week_start
+        )
+
+    async def _refresh_heatmap_async(self, seq: int, week_start: date):
         try:
-            # 1) 요일별 scores 계산
-            # day_scores[date_obj] = { block: available_count }
-            day_scores: Dict[date, Dict[int, int]] = {}
-            # 해당 날짜의 허용 블록 수
-            day_block_counts: Dict[date, int] = {}
-
-            max_block = 0
-
-            for i in range(7):
-                d = self.week_start + timedelta(days=i)
-                scores = ScheduleManager.suggest_team_blocks(self.team_id, d) or {}
-                day_scores[d] = scores
-                cnt = get_block_count(d)
-                day_block_counts[d] = cnt
-                if cnt > max_block:
-                    max_block = cnt
-
-            # 2) 헤더 (요일)
-            header_cells = [ft.Container(width=60)]
-            day_list = []
-            for i in range(7):
-                d = self.week_start + timedelta(days=i)
-                day_list.append(d)
-                weekday_kor = "월화수목금토일"[d.weekday()]
-                label_text = f"{weekday_kor}\n{d.strftime('%m-%d')}"
-                header_cells.append(
-                    ft.Container(
-                        content=ft.Text(label_text, text_align=ft.TextAlign.CENTER, size=11),
-                        width=90,
-                    )
-                )
+            # 일주일치 가용성 큐브 (세션 공유 캐시 → 없으면 팀원 1번 + 스케줄 1번)
+            avail = await repository.fetch_team_week_availability(self.team_id, week_start)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            if seq == self._heatmap_seq:
+                self._show_snack(f"히트맵 계산 중 오류: {ex}")
+            return
 
-            self.heatmap_grid.controls.append(
-                ft.Row(header_cells, spacing=4, vertical_alignment=ft.CrossAxisAlignment.START)
-            )
+        if seq != self._heatmap_seq:
+            # 그 사이 다른 날짜가 선택됨 → 버림
+            return
 
-            # 3) 블록 × 요일 그리드
-            for block in range(1, max_block + 1):
-                row_cells = [
-                    ft.Container(
-                        content=ft.Text(f"{block}블록"),
-                        width=60,
-                    )
-                ]
-
-                for d in day_list:
-                    allowed_blocks = day_block_counts[d]
-
-                    if block > allowed_blocks:
-                        # 해당 요일에 존재하지 않는 블록 (예: 평일 4,5블록)
-                        cell = ft.Container(
-                            bgcolor=ft.Colors.with_opacity(0.03, ft.Colors.GREY),
-                            width=90,
-                            height=40,
-                            border=ft.border.all(1, ft.Colors.GREY_200),
-                        )
+        self._render_heatmap(avail)
+        request_update(self.page, self, reason="TeamView._refresh_heatmap_async")
+
+        # 이 팀/주의 일정이 바뀌면 해당 칸만 다시 칠함
+        self._stop_listening()
+        self._unsubscribe = team_week_cache.subscribe(
+            self.team_id, week_start, self._on_availability_changed, self.page.run_task
+        )
+
+    def _stop_listening(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    async def _on_availability_changed(
+        self, avail: TeamAvailability | None, changed: list[tuple[date, int]] | None
+    ):
+        """
+        팀원 일정 추가/이동/삭제 알림 (다른 세션의 쓰기도 이 세션 루프에서 실행됨).
+        - 바뀐 칸만 색/숫자를 고치고 캔버스 update (바뀐 shape 속성만 전송)
+        - 캐시가 통째로 무효화된 경우(None)에만 전체 다시 계산
+        """
+        if avail is None or changed is None:
+            self.refresh_heatmap()
+            request_update(self.page, self.slot_list, reason="TeamView._on_availability_changed")
+            return
+        if avail.days[0] != self.week_start:
+            # 구독 해제 전에 보낸 이전 주 알림
+            return
+
+        # 알림이 여러 개면 도착 순서가 바뀔 수 있으므로 캐시의 최신 버전 기준으로 칠함
+        avail = team_week_cache.peek(self.team_id, self.week_start) or avail
+        self._avail = avail
+
+        dirty = False
+        for d, block in changed:
+            col = (d - self.week_start).days
+            count = avail.counts(d).get(block, 0)
+            ratio = avail.ratios(d).get(block, 0.0)
+            if self.heatmap.set_cell(block - 1, col, count, ratio):
+                dirty = True
+
+        if dirty and self.heatmap.page:
+            # 칸 숫자가 바뀌었으니 추천 순위도 다시
+            self._render_best_slots()
+            request_update(self.page, self.heatmap, self.slot_list, reason="TeamView._on_availability_changed")
+
+    def _render_heatmap(self, avail: TeamAvailability):
+        self._avail = avail
+
+        try:
+            # 1) 열 = 요일, 행 = 블록
+            day_list = [self.week_start + timedelta(days=i) for i in range(7)]
+            max_block = max(get_block_count(d) for d in day_list)
+
+            column_labels = [
+                f"{'월화수목금토일'[d.weekday()]}\n{d.strftime('%m-%d')}" for d in day_list
+            ]
+            row_labels = [f"{block}블록" for block in range(1, max_block + 1)]
+
+            # 2) 칸별 (가능 인원 수, 비율). 해당 요일에 없는 블록은 None
+            cells: Dict[tuple[int, int], tuple[int, float] | None] = {}
+            for col, d in enumerate(day_list):
+                scores = avail.counts(d)
+                ratios = avail.ratios(d)
+                for block in range(1, max_block + 1):
+                    if block > get_block_count(d):
+                        cells[(block - 1, col)] = None
                     else:
-                        scores = day_scores.get(d, {})
-                        count = scores.get(block, 0)
-                        ratio = count / self.team_size if self.team_size > 0 else 0.0
-
-                        # 색 진하기: 팀원 전원 가능일수록 진한 파랑
-                        base_color = ft.Colors.RED
-                        # 최소 0.1, 최대 0.8 정도로
-                        opacity = 0.4 + 0.55 * ratio
-                        bg_color = ft.Colors.with_opacity(opacity, base_color)
-
-                        text_color = ft.Colors.WHITE if ratio > 0.5 else ft.Colors.BLACK
-
-                        cell = ft.Container(
-                            bgcolor=bg_color,
-                            width=90,
-                            height=40,
-                            border_radius=4,
-                            border=ft.border.all(1, ft.Colors.GREY_200),
-                            padding=ft.padding.symmetric(horizontal=4),
-                            content=ft.Row(
-                                controls=[
-                                    ft.Text(
-                                        f"{count}",
-                                        color=text_color,
-                                        size=12,
-                                        weight=ft.FontWeight.BOLD,
-                                    ),
-                                ],
-                                alignment=ft.MainAxisAlignment.CENTER,
-                                vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                            ),
-                        )
-
-                    row_cells.append(cell)
-
-                self.heatmap_grid.controls.append(
-                    ft.Row(
-                        controls=row_cells,
-                        spacing=4,
-                        vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                    )
-                )
+                        cells[(block - 1, col)] = (scores.get(block, 0), ratios.get(block, 0.0))
+
+            self.heatmap.set_data(column_labels, row_labels, cells)
+            self._render_best_slots()
 
         except Exception as ex:
             self._show_snack(f"히트맵 계산 중 오류: {ex}")
 
+    # === 추천 회의 시간 ===
+    def on_slot_duration_change(self, e):
+        self._render_best_slots()
+        request_update(self.page, self.slot_list, reason="TeamView.on_slot_duration_change")
+
+    def _render_best_slots(self):
+        """
+        히트맵에 쓴 가용성(self._avail)으로 바로 계산 (추가 조회 X).
+        update는 호출하는 쪽에서.
+        """
+        if self._avail is None:
+            self.slot_list.controls = []
+            return
+
+        duration = int(self.slot_duration_dd.value or 1)
+        slots = self._avail.best_slots(duration, BEST_SLOT_TOP_K)
+        if not slots:
+            self.slot_list.controls = [
+                ft.Text("조건에 맞는 시간이 없습니다.", size=12, color=ft.Colors.GREY)
+            ]
+            return
+        self.slot_list.controls = [self._build_slot_row(slot) for slot in slots]
+
+    def _build_slot_row(self, slot: MeetingSlot) -> ft.Control:
+        full = slot.available == self._avail.size
+        return ft.Row(
+            controls=[
+                ft.Text(
+                    self._format_range(slot.date, slot.start_block, slot.end_block),
+                    size=12,
+                    expand=True,
+                ),
+                ft.Text(
+                    f"{slot.available}/{self._avail.size}명",
+                    size=12,
+                    weight=ft.FontWeight.BOLD,
+                    color=ft.Colors.RED if full else None,
+                ),
+                ft.IconButton(
+                    icon=ft.Icons.AUTO_FIX_HIGH,
+                    icon_size=16,
+                    tooltip="movable 일정을 옮겨서 더 모을 수 있는지 보기",
+                    disabled=full,
+                    on_click=lambda e, slot=slot, seq=self._heatmap_seq: self.page.run_task(
+                        self._propose_reschedule, slot, seq
+                    ),
+                ),
+            ],
+        )
+
+    @staticmethod
+    def _format_range(d: date, start_block: int, end_block: int) -> str:
+        day = f"{'월화수목금토일'[d.weekday()]} {d.strftime('%m-%d')}"
+        if start_block == end_block:
+            return f"{day} · {start_block}블록"
+        return f"{day} · {start_block}~{end_block}블록"
+
+    # === movable 일정 재배치 제안 ===
+    async def _propose_reschedule(self, slot: MeetingSlot, seq: int):
+        # 히트맵과 같은 latest-wins 번호: 그 사이 날짜가 바뀌었으면 지난 주 슬롯이므로 무시
+        if seq != self._heatmap_seq:
+            return
+        try:
+            plan = await repository.propose_reschedule(
+                self.team_id, slot.date, slot.start_block, slot.end_block
+            )
+        except Exception as ex:
+            if seq == self._heatmap_seq:
+                self._show_snack(f"일정 조정 계산 중 오류: {ex}")
+            return
+        if seq != self._heatmap_seq:
+            return
+        self.page.open(self._build_plan_dialog(plan))
+
+    def _build_plan_dialog(self, plan: ReschedulePlan) -> ft.AlertDialog:
+        """제안 다이얼로그 내용 채우기 (다이얼로그 컨트롤은 뷰당 하나)"""
+        if not plan.moves:
+            body = [ft.Text("옮겨서 더 모을 수 있는 movable 일정이 없습니다.", size=13)]
+        else:
+            body = [
+                ft.Text(
+                    f"참석 가능 {plan.available_before}명 → {plan.available_after}명",
+                    size=14,
+                    weight=ft.FontWeight.BOLD,
+                )
+            ]
+            for move in plan.moves:
+                body.append(
+                    ft.Text(
+                        f"'{move.title or '(제목 없음)'}': "
+                        f"{self._format_range(*move.old)} → {self._format_range(*move.new)}",
+                        size=12,
+                    )
+                )
+        if not plan.complete:
+            body.append(ft.Text("(시간 제한으로 일부만 탐색한 결과입니다)", size=11, color=ft.Colors.GREY))
+
+        if self._plan_dialog is None:
+            self._plan_dialog = ft.AlertDialog(
+                actions=[ft.TextButton("닫기", on_click=lambda e: self.page.close(self._plan_dialog))],
+            )
+        self._plan_dialog.title = ft.Text(f"일정 조정 제안 · {self._format_range(*plan.target)}")
+        self._plan_dialog.content = ft.Column(body, tight=True, spacing=6)
+        return self._plan_dialog
+
     # === 공통 스낵바 ===
     def _show_snack(self, msg: str):
-        self.page.open(ft.SnackBar(ft.Text(msg)))
-        self.page.update()
+        show_snack(self.page, msg)
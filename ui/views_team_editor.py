@@ -1,7 +1,11 @@
 # ui/views_team_editor.py
-import uuid
+import asyncio
 import flet as ft
-from supabase_client import supabase
+import repository
+from ui.widgets_lazy_list import LazyListView
+from ui.update_batcher import request_update, show_snack
+
+SEARCH_DEBOUNCE_SECONDS = 0.3
 
 
 class TeamEditorView(ft.Column):
@@ -9,7 +13,7 @@ class TeamEditorView(ft.Column):
     새 팀을 만드는 전용 페이지.
     - 팀 이름
     - 팀 설명(선택)
-    - 팀원 선택 (users 테이블의 이름 리스트에서 체크)
+    - 팀원 선택 (users 테이블을 이름/이메일로 검색해서 체크)
     """
 
     def __init__(self, page: ft.Page):
@@ -37,8 +41,25 @@ class TeamEditorView(ft.Column):
         )
 
         # --- 3) 팀원 선택 UI ---
-        self.member_list_column = ft.Column(spacing=5)
-        self.member_checkboxes: list[ft.Checkbox] = []
+        # 이름/이메일 앞부분으로 서버 검색 (입력이 멈추면 검색)
+        self.search_field = ft.TextField(
+            label="팀원 검색",
+            hint_text="이름 또는 이메일 앞부분",
+            prefix_icon=ft.Icons.SEARCH,
+            width=400,
+            on_change=self.on_search_changed,
+        )
+        # 검색 결과 (스크롤하면 다음 페이지)
+        self.member_list = LazyListView(
+            build_item=self._build_member_row,
+            empty_text="검색 결과가 없습니다.",
+            item_extent=48,
+            height=300,
+        )
+        # 선택된 팀원 (검색어가 바뀌어도 유지) user_id -> 이름
+        self.selected_members: dict[str, str] = {}
+        self.selected_chips = ft.Row(wrap=True, spacing=5)
+        self._search_seq = 0
 
         # --- 4) 버튼들 ---
         self.save_button = ft.FilledButton(
@@ -76,7 +97,9 @@ class TeamEditorView(ft.Column):
                         size=12,
                         color=ft.Colors.GREY,
                     ),
-                    self.member_list_column,
+                    self.selected_chips,
+                    self.search_field,
+                    self.member_list,
                     ft.Divider(),
                     ft.Row(
                         controls=[self.cancel_button, self.save_button],
@@ -90,52 +113,93 @@ class TeamEditorView(ft.Column):
 
     # 페이지에 attach된 다음에 멤버 후보 로드
     def did_mount(self):
-        self.load_member_candidates()
+        self.member_list.controls = [
+            ft.Text("불러오는 중...", size=12, color=ft.Colors.GREY)
+        ]
+        request_update(self.page, self, reason="TeamEditorView.did_mount")
+        self.page.run_task(self.load_member_candidates)
 
-    def load_member_candidates(self):
+    async def load_member_candidates(self):
         """
-        users 테이블에서 모든 사용자 이름을 불러와
-        체크박스 리스트로 만든다.
+        검색어(이름/이메일 앞부분)로 users를 서버에서 검색해
+        체크박스 리스트로 보여준다. 한 번에 한 페이지씩 (keyset 페이지네이션).
         (본인은 기본 체크 + 비활성화)
         """
-        try:
-            res = supabase.table("users").select("id,name,email").order("name").execute()
-            rows = res.data or []
-
-            self.member_list_column.controls.clear()
-            self.member_checkboxes.clear()
-
-            for row in rows:
-                user_id = row["id"]
-                name = row.get("name") or "(이름 없음)"
-
-                if user_id == self.user_id:
-                    # 본인은 항상 포함 + 수정 불가
-                    cb = ft.Checkbox(
-                        label=f"{name} (나)",
-                        value=True,
-                        disabled=True,
-                    )
-                else:
-                    cb = ft.Checkbox(
-                        label=name,
-                        value=False,
-                        data=user_id,  # 클릭 시 user_id를 여기서 꺼낼 수 있음
-                    )
-
-                self.member_checkboxes.append(cb)
-                self.member_list_column.controls.append(cb)
-
-            self.update()
+        query = (self.search_field.value or "").strip()
+        # 마지막으로 받은 (name, id) - 다음 페이지는 이 뒤부터
+        cursor: list[tuple[str, str] | None] = [None]
 
+        async def load_page(offset: int, limit: int) -> list[dict]:
+            rows = await repository.search_users(query, after=cursor[0], limit=limit)
+            if rows:
+                # 이름이 없으면 None 그대로 (""로 바꾸면 커서가 맨 앞으로 돌아감)
+                cursor[0] = (rows[-1].get("name"), rows[-1]["id"])
+            return rows
+
+        try:
+            await self.member_list.show_loader(load_page)
         except Exception as ex:
             self._show_snack(f"팀원 목록 불러오기 오류: {ex}")
 
+    def on_search_changed(self, e):
+        # 입력할 때마다 조회하지 않고 잠깐 멈췄을 때 한 번만
+        self._search_seq += 1
+        self.page.run_task(self._debounced_search, self._search_seq)
+
+    async def _debounced_search(self, seq: int):
+        await asyncio.sleep(SEARCH_DEBOUNCE_SECONDS)
+        if seq != self._search_seq:
+            return
+        await self.load_member_candidates()
+
+    def _build_member_row(self, row: dict) -> ft.Control:
+        user_id = row["id"]
+        name = row.get("name") or "(이름 없음)"
+
+        if user_id == self.user_id:
+            # 본인은 항상 포함 + 수정 불가
+            return ft.Checkbox(
+                label=f"{name} (나)",
+                value=True,
+                disabled=True,
+            )
+
+        return ft.Checkbox(
+            label=name,
+            value=user_id in self.selected_members,
+            data=(user_id, name),  # 클릭 시 user_id를 여기서 꺼낼 수 있음
+            on_change=self.on_member_toggled,
+        )
+
+    def on_member_toggled(self, e):
+        user_id, name = e.control.data
+        if e.control.value:
+            self.selected_members[user_id] = name
+        else:
+            self.selected_members.pop(user_id, None)
+        self._refresh_selected_chips()
+        request_update(self.page, self.selected_chips, reason="TeamEditorView.on_member_toggled")
+
+    def on_chip_deleted(self, e):
+        self.selected_members.pop(e.control.data, None)
+        self._refresh_selected_chips()
+        # 현재 검색 결과에 보이는 체크박스도 해제
+        for cb in self.member_list.controls:
+            if isinstance(cb, ft.Checkbox) and cb.data and cb.data[0] == e.control.data:
+                cb.value = False
+        request_update(self.page, self, reason="TeamEditorView.on_chip_deleted")
+
+    def _refresh_selected_chips(self):
+        self.selected_chips.controls = [
+            ft.Chip(label=ft.Text(name), data=uid, on_delete=self.on_chip_deleted)
+            for uid, name in self.selected_members.items()
+        ]
+
     # === 버튼 동작 ===
     def on_cancel_clicked(self, e):
         self.page.go("/dashboard")
 
-    def on_save_clicked(self, e):
+    async def on_save_clicked(self, e):
         try:
             name = self.name_field.value.strip()
             if not name:
@@ -144,48 +208,10 @@ class TeamEditorView(ft.Column):
 
             desc = self.desc_field.value.strip()
 
-            # 1) 팀 row 생성
-            team_id = str(uuid.uuid4())
-            team_row = {
-                "id": team_id,
-                "name": name,
-                "leader_id": self.user_id,
-                # teams 테이블에 description 컬럼 만들었다면 아래 줄 주석 해제
-                # "description": desc,
-            }
-
-            supabase.table("teams").insert(team_row).execute()
-
-            # 2) team_members row들 생성
-            member_rows = []
-
-            # (1) 리더 본인
-            member_rows.append(
-                {
-                    "id": str(uuid.uuid4()),
-                    "team_id": team_id,
-                    "user_id": self.user_id,
-                    "role": "leader",
-                }
-            )
-
-            # (2) 체크된 멤버들
-            for cb in self.member_checkboxes:
-                if cb.disabled:
-                    continue  # 본인은 이미 추가
-                if cb.value:
-                    uid = cb.data
-                    member_rows.append(
-                        {
-                            "id": str(uuid.uuid4()),
-                            "team_id": team_id,
-                            "user_id": uid,
-                            "role": "member",
-                        }
-                    )
-
-            if member_rows:
-                supabase.table("team_members").insert(member_rows).execute()
+            # 팀 + 팀장 + 선택된 팀원을 한 번에 생성 (본인은 팀장으로 자동 포함)
+            # teams 테이블에 description 컬럼 만들었다면 RPC 인자로 desc도 넘기기
+            member_ids = [uid for uid in self.selected_members if uid != self.user_id]
+            await repository.create_team(name, self.user_id, member_ids)
 
             self._show_snack("팀이 생성되었습니다.")
             self.page.go("/dashboard")
@@ -195,6 +221,4 @@ class TeamEditorView(ft.Column):
 
     # === 공통 snack ===
     def _show_snack(self, msg: str):
-        self.page.snack_bar = ft.SnackBar(ft.Text(msg))
-        self.page.snack_bar.open = True
-        self.page.update()
+        show_snack(self.page, msg)
@@ -1,10 +1,17 @@
 # ui/views_timetable.py
+import asyncio
 import flet as ft
 from datetime import date, timedelta
 from typing import Dict
 
-from supabase_client import supabase
+import repository
 from utils import get_block_count
+from schedule_cache import get_week_cache
+from ui.widgets_lazy_list import LazyListView
+from ui.update_batcher import request_update, show_snack
+
+GRID_MAX_BLOCK = 5      # 그리드 세로 칸 수 (주말 블록 수 기준)
+GRID_BLOCK_HEIGHT = 40  # 블록 한 칸 높이
 
 
 class TimetableView(ft.Column):
@@ -24,8 +31,19 @@ class TimetableView(ft.Column):
         self.today: date = date.today()
         self.week_start: date = self.today - timedelta(days=self.today.weekday())
 
-        # 타임테이블 그리드
+        # 세션별 주간 캐시 (주 이동 시 재조회 방지)
+        self.week_cache = get_week_cache(page)
+        # 백그라운드로 불러오는 중인 주 (중복 prefetch 방지)
+        self._prefetching: set[date] = set()
+        # 주 로딩 task (가장 마지막 요청만 반영)
+        self._load_seq: int = 0
+        self._load_future = None
+        # 라우트 캐시에서 다시 붙는 경우 구분용
+        self._mounted_once = False
+
+        # 타임테이블 그리드 (칸 컨트롤은 한 번만 만들고 주가 바뀌면 속성만 고침)
         self.timetable_grid = ft.Column(spacing=6)
+        self._init_timetable_grid()
 
         # 주 이동 컨트롤
         self.week_label = ft.Text("", size=16, weight=ft.FontWeight.BOLD)
@@ -40,8 +58,11 @@ class TimetableView(ft.Column):
             on_click=self.on_next_week,
         )
 
-        # 일정 리스트
-        self.schedule_list = ft.Column(spacing=5)
+        # 일정 리스트 (지연 로딩 ListView)
+        self.schedule_list = LazyListView(
+            build_item=self._build_schedule_row,
+            empty_text="이번 주에 등록된 일정이 없습니다.",
+        )
 
         # 색상 매핑 (id -> color)
         self._schedule_color_map: Dict[str, str] = {}
@@ -103,6 +124,14 @@ class TimetableView(ft.Column):
 
         self.load_week_schedules()
 
+    # === 라이프사이클 ===
+    def did_mount(self):
+        # 처음 붙을 때는 __init__에서 이미 불러옴.
+        # 라우트 캐시에서 다시 붙은 경우에만 보던 주를 새로 그림 (캐시 우선, 없으면 백그라운드 조회)
+        if self._mounted_once:
+            self.load_week_schedules()
+        self._mounted_once = True
+
     # === 주간 이동 ===
     def on_prev_week(self, e):
         self.week_start -= timedelta(days=7)
@@ -114,21 +143,60 @@ class TimetableView(ft.Column):
 
     # === 데이터 로딩 ===
     def load_week_schedules(self):
+        """
+        현재 week_start 주를 불러와 그린다. (latest-wins)
+
+        - 캐시에 있으면 쿼리 없이 바로 그림
+        - 없으면 비동기 task로 조회, 새 요청이 오면 이전 task는 취소하고
+          가장 마지막에 요청된 주의 결과만 그리드에 반영
+        """
+        # 이전 로딩 취소
+        self._load_seq += 1
+        if self._load_future is not None and not self._load_future.done():
+            self._load_future.cancel()
+        self._load_future = None
+
+        week_start = self.week_start
+        week_end = week_start + timedelta(days=6)
+        self.week_label.value = f"{week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')}"
+
+        # 캐시에 있으면 쿼리 없이 바로 사용
+        rows = self.week_cache.get(week_start)
+        if rows is not None:
+            self._render_week(rows)
+            return
+
+        # 조회를 기다리는 동안에도 새 주 라벨은 바로 보이게
+        dirty: list[ft.Control] = [self.week_label]
+
+        # 첫 로딩이면 빈 그리드(스켈레톤)부터 그려 둠
+        if not self.schedule_list.controls:
+            self._build_timetable_grid({})
+            self.schedule_list.controls = [
+                ft.Text("불러오는 중...", size=12, color=ft.Colors.GREY)
+            ]
+            dirty += [self.timetable_grid, self.schedule_list]
+
+        request_update(self.page, *dirty, reason="TimetableView.load_week_schedules")
+        self._load_future = self.page.run_task(self._load_week_async, self._load_seq, week_start)
+
+    async def _load_week_async(self, seq: int, week_start: date):
         try:
-            week_end = self.week_start + timedelta(days=6)
-            self.week_label.value = f"{self.week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')}"
-
-            res = (
-                supabase.table("schedules")
-                .select("*")
-                .eq("user_id", self.user_id)
-                .gte("date", self.week_start.isoformat())
-                .lte("date", week_end.isoformat())
-                .order("date")
-                .execute()
-            )
-            rows = res.data or []
+            version = self.week_cache.version
+            rows = await repository.fetch_week_schedules(self.user_id, week_start)
+            if seq != self._load_seq:
+                # 그 사이 다른 주로 이동함 → 버림
+                return
+            self.week_cache.put_if_unchanged(week_start, rows, version)
+            self._render_week(rows)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            if seq == self._load_seq:
+                self._show_snack(f"타임테이블 로딩 중 오류: {ex}")
 
+    def _render_week(self, rows: list[dict]):
+        try:
             # 색상 팔레트
             palette = [
                 ft.Colors.BLUE_300,
@@ -162,38 +230,54 @@ class TimetableView(ft.Column):
 
             self._build_timetable_grid(timetable_map)
             self._build_schedule_list(schedules_for_list)
-            self.update()
+            request_update(self.page, self, reason="TimetableView._render_week")
+
+            # 이전/다음 주는 백그라운드로 미리 불러 둠
+            self.page.run_task(self._prefetch_adjacent_weeks, self.week_start)
 
         except Exception as ex:
             self._show_snack(f"타임테이블 로딩 중 오류: {ex}")
 
-    # === 타임테이블 그리드 ===
-    def _build_timetable_grid(self, timetable_map: Dict[tuple[str, int], list[str]]):
-        self.timetable_grid.controls.clear()
-
-        max_block = 5
-        block_height = 40
+    async def _prefetch_adjacent_weeks(self, week_start: date):
+        """
+        week_start 기준 이전/다음 주를 캐시에 채워 둔다.
+        이미 캐시에 있으면 LRU에서 밀려나지 않게 touch만 한다.
+        """
+        for neighbour in (week_start + timedelta(days=7), week_start - timedelta(days=7)):
+            if self.week_cache.contains(neighbour):
+                self.week_cache.touch(neighbour)
+                continue
+            if neighbour in self._prefetching:
+                continue
+
+            self._prefetching.add(neighbour)
+            try:
+                version = self.week_cache.version
+                rows = await repository.fetch_week_schedules(self.user_id, neighbour)
+                self.week_cache.put_if_unchanged(neighbour, rows, version)
+            except Exception:
+                # prefetch 실패는 무시 (실제 이동 시 다시 조회)
+                pass
+            finally:
+                self._prefetching.discard(neighbour)
+
+        # 현재 보고 있는 주가 가장 최근 사용으로 남도록
+        self.week_cache.touch(week_start)
 
+    # === 타임테이블 그리드 ===
+    def _init_timetable_grid(self):
+        """
+        그리드 컨트롤은 처음 한 번만 만든다.
+        주가 바뀌면 _build_timetable_grid에서 각 칸의 속성(bgcolor, height, visible)만 고친다.
+        → 주 이동 때 바뀐 칸의 속성만 전송됨
+        """
         # 1) 헤더 (요일)
+        self._day_header_texts: list[ft.Text] = []
         header_cells = [ft.Container(width=60)]
-        day_labels = []
-        for i in range(7):
-            d = self.week_start + timedelta(days=i)
-            date_str = d.strftime("%Y-%m-%d")
-            weekday_kor = "월화수목금토일"[d.weekday()]
-            label_text = f"{weekday_kor}\n{d.strftime('%m-%d')}"
-            day_labels.append(date_str)
-
-            header_cells.append(
-                ft.Container(
-                    content=ft.Text(label_text, text_align=ft.TextAlign.CENTER, size=11),
-                    width=90,
-                )
-            )
-
-        self.timetable_grid.controls.append(
-            ft.Row(header_cells, spacing=4, vertical_alignment=ft.CrossAxisAlignment.START)
-        )
+        for _ in range(7):
+            label = ft.Text("", text_align=ft.TextAlign.CENTER, size=11)
+            self._day_header_texts.append(label)
+            header_cells.append(ft.Container(content=label, width=90))
 
         # 2) 왼쪽 블록 번호 컬럼
         block_label_column = ft.Column(
@@ -203,20 +287,55 @@ class TimetableView(ft.Column):
             spacing=0,
         )
 
-        for block in range(1, max_block + 1):
+        for block in range(1, GRID_MAX_BLOCK + 1):
             block_label_column.controls.append(
                 ft.Container(
                     content=ft.Text(f"{block}블록"),
                     width=60,
-                    height=block_height,
+                    height=GRID_BLOCK_HEIGHT,
                     alignment=ft.alignment.center_left,
                 )
             )
 
-        # 3) 각 요일별 세로 컬럼
+        # 3) 각 요일별 세로 컬럼 (블록당 칸 하나씩, 연속 구간은 첫 칸을 늘리고 나머지는 숨김)
+        self._grid_cells: list[list[ft.Container]] = []
         day_columns = []
-        for i, date_str in enumerate(day_labels):
+        for _ in range(7):
+            cells = [
+                ft.Container(
+                    width=90,
+                    height=GRID_BLOCK_HEIGHT,
+                    border=ft.border.all(1, ft.Colors.GREY_200),
+                )
+                for _ in range(GRID_MAX_BLOCK)
+            ]
+            self._grid_cells.append(cells)
+            day_columns.append(ft.Column(controls=cells, spacing=0))
+
+        body_row = ft.Row(
+            controls=[
+                block_label_column,
+                ft.Row(day_columns, spacing=4),
+            ],
+            spacing=4,
+            vertical_alignment=ft.CrossAxisAlignment.START,
+        )
+
+        self.timetable_grid.controls = [
+            ft.Row(header_cells, spacing=4, vertical_alignment=ft.CrossAxisAlignment.START),
+            body_row,
+        ]
+
+    def _build_timetable_grid(self, timetable_map: Dict[tuple[str, int], list[str]]):
+        max_block = GRID_MAX_BLOCK
+        block_height = GRID_BLOCK_HEIGHT
+
+        for i in range(7):
             d = self.week_start + timedelta(days=i)
+            date_str = d.strftime("%Y-%m-%d")
+            weekday_kor = "월화수목금토일"[d.weekday()]
+            self._day_header_texts[i].value = f"{weekday_kor}\n{d.strftime('%m-%d')}"
+
             allowed_blocks = get_block_count(d)
 
             block_sids: list[str | None] = []
@@ -241,113 +360,84 @@ class TimetableView(ft.Column):
                     length = 1
             segments.append((cur_sid, length))
 
-            col_controls = []
+            # 구간 첫 칸만 보이게 + 높이 늘리기, 나머지 칸은 숨김
+            cells = self._grid_cells[i]
+            b = 0
             for sid, length in segments:
-                h = block_height * length
+                head = cells[b]
+                head.visible = True
+                head.height = block_height * length
 
                 if sid == "__INVALID__":
-                    col_controls.append(
-                        ft.Container(
-                            width=90,
-                            height=h,
-                            bgcolor=ft.Colors.with_opacity(0.03, ft.Colors.GREY),
-                            border=ft.border.all(1, ft.Colors.GREY_200),
-                        )
-                    )
+                    head.bgcolor = ft.Colors.with_opacity(0.03, ft.Colors.GREY)
+                    head.border_radius = None
                 elif sid is None:
-                    col_controls.append(
-                        ft.Container(
-                            width=90,
-                            height=h,
-                            border=ft.border.all(1, ft.Colors.GREY_200),
-                        )
-                    )
+                    head.bgcolor = None
+                    head.border_radius = None
                 else:
-                    color = self._schedule_color_map.get(sid, ft.Colors.BLUE_200)
-                    col_controls.append(
-                        ft.Container(
-                            width=90,
-                            height=h,
-                            bgcolor=color,
-                            border_radius=6,
-                            border=ft.border.all(1, ft.Colors.GREY_200),
-                        )
-                    )
-
-            day_columns.append(ft.Column(controls=col_controls, spacing=0))
-
-        body_row = ft.Row(
-            controls=[
-                block_label_column,
-                ft.Row(day_columns, spacing=4),
-            ],
-            spacing=4,
-            vertical_alignment=ft.CrossAxisAlignment.START,
-        )
+                    head.bgcolor = self._schedule_color_map.get(sid, ft.Colors.BLUE_200)
+                    head.border_radius = 6
 
-        self.timetable_grid.controls.append(body_row)
+                for hidden in cells[b + 1:b + length]:
+                    hidden.visible = False
+                b += length
 
     # === 일정 목록 ===
     def _build_schedule_list(self, schedules: list[dict]):
-        self.schedule_list.controls.clear()
-
-        if not schedules:
-            self.schedule_list.controls.append(
-                ft.Text("이번 주에 등록된 일정이 없습니다.", size=12, color=ft.Colors.GREY)
-            )
-            return
-
-        for r in schedules:
-            sid = r["id"]
-            date_str = str(r["date"])[:10]
-            start_block = r.get("start_block", r.get("block", 1))
-            end_block = r.get("end_block", start_block)
-            title = r.get("title") or "(제목 없음)"
-            desc = r.get("description") or ""
-            color = self._schedule_color_map.get(sid, ft.Colors.BLUE_200)
-
-            subtitle_parts = [f"{date_str} / {start_block}~{end_block}블록"]
-            if desc:
-                subtitle_parts.append(desc)
-            subtitle = " | ".join(subtitle_parts)
-
-            row = ft.ListTile(
-                leading=ft.Container(
-                    width=20,
-                    height=4,
-                    bgcolor=color,
-                    border_radius=6,
-                ),
-                title=ft.Text(title, weight=ft.FontWeight.BOLD,expand = True),
-                trailing=ft.Row(
-                    controls=[
-                        ft.IconButton(
-                            icon=ft.Icons.EDIT,
-                            tooltip="수정",
-                            data=sid,
-                            on_click=self.on_edit_schedule_clicked,
-                        ),
-                        ft.IconButton(
-                            icon=ft.Icons.DELETE,
-                            tooltip="삭제",
-                            icon_color=ft.Colors.RED,
-                            data=sid,
-                            on_click=self.on_delete_schedule_clicked,
-                        ),
-                    ],
-                    spacing=0,
-                ),
-            )
-            self.schedule_list.controls.append(row)
+        # 보이는 만큼만 줄을 만듦 (스크롤하면 다음 페이지)
+        self.schedule_list.show_rows(schedules)
+
+    def _build_schedule_row(self, r: dict) -> ft.Control:
+        sid = r["id"]
+        date_str = str(r["date"])[:10]
+        start_block = r.get("start_block", r.get("block", 1))
+        end_block = r.get("end_block", start_block)
+        title = r.get("title") or "(제목 없음)"
+        desc = r.get("description") or ""
+        color = self._schedule_color_map.get(sid, ft.Colors.BLUE_200)
+
+        subtitle_parts = [f"{date_str} / {start_block}~{end_block}블록"]
+        if desc:
+            subtitle_parts.append(desc)
+        subtitle = " | ".join(subtitle_parts)
+
+        return ft.ListTile(
+            leading=ft.Container(
+                width=20,
+                height=4,
+                bgcolor=color,
+                border_radius=6,
+            ),
+            title=ft.Text(title, weight=ft.FontWeight.BOLD,expand = True),
+            trailing=ft.Row(
+                controls=[
+                    ft.IconButton(
+                        icon=ft.Icons.EDIT,
+                        tooltip="수정",
+                        data=sid,
+                        on_click=self.on_edit_schedule_clicked,
+                    ),
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE,
+                        tooltip="삭제",
+                        icon_color=ft.Colors.RED,
+                        data=sid,
+                        on_click=self.on_delete_schedule_clicked,
+                    ),
+                ],
+                spacing=0,
+            ),
+        )
 
     def on_edit_schedule_clicked(self, e):
         sid = e.control.data
         self.page.go(f"/schedule/edit/{sid}")
 
-    def on_delete_schedule_clicked(self, e):
+    async def on_delete_schedule_clicked(self, e):
         sid = e.control.data
         try:
-            supabase.table("schedules").delete().eq("id", sid).execute()
+            await repository.delete_schedule(sid)
+            self.week_cache.remove_row(sid)
             self._show_snack("일정이 삭제되었습니다.")
             self.load_week_schedules()
         except Exception as ex:
@@ -355,6 +445,4 @@ class TimetableView(ft.Column):
 
     # === 공통 스낵바 ===
     def _show_snack(self, msg: str):
-        self.page.snack_bar = ft.SnackBar(ft.Text(msg))
-        self.page.snack_bar.open = True
-        self.page.update()
+        show_snack(self.page, msg)
@@ -0,0 +1,86 @@
+# ui/widgets_date_picker.py
+from datetime import date, datetime
+from typing import Callable
+
+import flet as ft
+
+DATE_PICKER_SESSION_KEY = "date_picker"
+DATE_PICKER_FIRST_DATE = date(2024, 1, 1)
+DATE_PICKER_LAST_DATE = date(2026, 12, 31)
+
+
+class SharedDatePicker:
+    """
+    페이지(세션)당 하나만 overlay에 올려 두고 여러 뷰가 돌려 쓰는 DatePicker.
+
+    - 뷰마다 did_mount에서 DatePicker를 새로 만들어 overlay에 붙이면
+      화면을 오갈 때마다 overlay가 계속 커진다 → 하나만 만들어 재사용
+    - overlay에는 처음 열 때 page.open()이 한 번 붙이고, 이후엔 같은 컨트롤을 다시 연다
+    - open(owner, on_pick)으로 열면 고른 날짜는 그 뷰의 on_pick(date)으로만 전달
+    - 뷰는 will_unmount에서 release(self) → 떠난 뷰로는 더 이상 콜백이 가지 않음
+    - 로그아웃 때는 close_date_picker(page)로 닫고 페이지에서 떼어 낸다
+
+    사용 예:
+        self.date_picker = get_date_picker(self.page)
+        self.date_picker.open(self, self.on_date_change, value=self.selected_date)
+    """
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self.picker = ft.DatePicker(
+            on_change=self._on_change,
+            first_date=DATE_PICKER_FIRST_DATE,
+            last_date=DATE_PICKER_LAST_DATE,
+        )
+
+        self._owner: object | None = None
+        self._on_pick: Callable[[date], None] | None = None
+
+    def open(self, owner: object, on_pick: Callable[[date], None], value: date | None = None):
+        """owner 뷰 기준으로 열기. 날짜를 고르면 on_pick(date) 호출"""
+        self._owner = owner
+        self._on_pick = on_pick
+        self.picker.value = value
+        self.page.open(self.picker)
+
+    def release(self, owner: object):
+        """owner가 열어 둔 콜백 해제 (다른 뷰가 이미 가져갔으면 그대로 둠)"""
+        if self._owner is owner:
+            self._owner = None
+            self._on_pick = None
+
+    def dispose(self):
+        """열려 있으면 닫고 page.open()이 붙인 자리에서 떼어 냄"""
+        self._owner = None
+        self._on_pick = None
+        if self.picker.open:
+            self.page.close(self.picker)
+        if self.picker in self.page.overlay:
+            self.page.overlay.remove(self.picker)
+
+    def _on_change(self, e):
+        value = self.picker.value
+        if isinstance(value, str) and value:
+            value = datetime.fromisoformat(value)
+        if isinstance(value, datetime):
+            value = value.date()
+        if not isinstance(value, date) or self._on_pick is None:
+            return
+        self._on_pick(value)
+
+
+def get_date_picker(page: ft.Page) -> SharedDatePicker:
+    """현재 세션의 공용 DatePicker (없으면 생성)"""
+    shared = page.session.get(DATE_PICKER_SESSION_KEY)
+    if not isinstance(shared, SharedDatePicker):
+        shared = SharedDatePicker(page)
+        page.session.set(DATE_PICKER_SESSION_KEY, shared)
+    return shared
+
+
+def close_date_picker(page: ft.Page):
+    """현재 세션의 공용 DatePicker를 닫고 세션에서 지움 (로그아웃용)"""
+    shared = page.session.get(DATE_PICKER_SESSION_KEY)
+    if isinstance(shared, SharedDatePicker):
+        shared.dispose()
+        page.session.remove(DATE_PICKER_SESSION_KEY)
@@ -0,0 +1,151 @@
+# ui/widgets_heatmap.py
+import flet as ft
+import flet.canvas as cv
+
+
+class HeatmapCanvas(cv.Canvas):
+    """
+    히트맵 전체를 Canvas 하나로 그리는 위젯.
+
+    - 칸마다 Container/Row/Text를 만드는 대신 사각형 + 글자 shape만 그린다
+    - 7×5 주간 뷰뿐 아니라 한 달 / 학기 같은 큰 그리드도 컨트롤 하나로 처리
+    - set_cell()로 일부 칸만 고치면 그 shape의 바뀐 속성만 전송됨
+
+    사용 예:
+        heatmap.set_data(
+            column_labels=["월\\n03-03", ...],
+            row_labels=["1블록", ...],
+            cells={(row, col): (count, ratio) 또는 None(존재하지 않는 칸)},
+        )
+    """
+
+    def __init__(
+        self,
+        cell_width: int = 90,
+        cell_height: int = 40,
+        row_label_width: int = 60,
+        header_height: int = 36,
+        gap: int = 4,
+        base_color: str = ft.Colors.RED,
+    ):
+        super().__init__()
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.row_label_width = row_label_width
+        self.header_height = header_height
+        self.gap = gap
+        self.base_color = base_color
+
+        # (row, col) -> (사각형, 숫자) shape
+        self._cell_shapes: dict[tuple[int, int], tuple[cv.Rect, cv.Text]] = {}
+        self.width = 0
+        self.height = 0
+
+    # ---------- 공개 메서드 ----------
+    def set_data(
+        self,
+        column_labels: list[str],
+        row_labels: list[str],
+        cells: dict[tuple[int, int], tuple[int, float] | None],
+    ):
+        """그리드 전체를 다시 그린다. (update는 호출하는 쪽에서)"""
+        shapes: list[cv.Shape] = []
+        self._cell_shapes.clear()
+
+        self.width = self.row_label_width + len(column_labels) * (self.cell_width + self.gap)
+        self.height = self.header_height + len(row_labels) * (self.cell_height + self.gap)
+
+        # 1) 헤더 (열 라벨)
+        for col, label in enumerate(column_labels):
+            shapes.append(
+                cv.Text(
+                    self._cell_x(col) + self.cell_width / 2,
+                    self.header_height / 2,
+                    label,
+                    style=ft.TextStyle(size=11),
+                    alignment=ft.alignment.center,
+                    text_align=ft.TextAlign.CENTER,
+                )
+            )
+
+        # 2) 행 라벨
+        for row, label in enumerate(row_labels):
+            shapes.append(
+                cv.Text(
+                    0,
+                    self._cell_y(row) + self.cell_height / 2,
+                    label,
+                    alignment=ft.alignment.center_left,
+                )
+            )
+
+        # 3) 칸
+        for row in range(len(row_labels)):
+            for col in range(len(column_labels)):
+                x, y = self._cell_x(col), self._cell_y(row)
+                value = cells.get((row, col))
+
+                if value is None:
+                    # 존재하지 않는 칸 (예: 평일 4,5블록)
+                    shapes.append(
+                        cv.Rect(
+                            x, y, self.cell_width, self.cell_height,
+                            paint=ft.Paint(color=ft.Colors.with_opacity(0.03, ft.Colors.GREY)),
+                        )
+                    )
+                    shapes.append(self._border(x, y))
+                    continue
+
+                rect = cv.Rect(x, y, self.cell_width, self.cell_height, border_radius=4, paint=ft.Paint())
+                text = cv.Text(
+                    x + self.cell_width / 2,
+                    y + self.cell_height / 2,
+                    "",
+                    style=ft.TextStyle(size=12, weight=ft.FontWeight.BOLD),
+                    alignment=ft.alignment.center,
+                )
+                self._paint(rect, text, *value)
+                self._cell_shapes[(row, col)] = (rect, text)
+                shapes.extend([rect, self._border(x, y), text])
+
+        self.shapes = shapes
+
+    def set_cell(self, row: int, col: int, count: int, ratio: float) -> bool:
+        """한 칸의 숫자/색만 바꾼다. 없는 칸이면 False. (update는 호출하는 쪽에서)"""
+        shapes = self._cell_shapes.get((row, col))
+        if shapes is None:
+            return False
+        self._paint(*shapes, count, ratio)
+        return True
+
+    def clear(self):
+        self._cell_shapes.clear()
+        self.shapes = []
+        self.width = 0
+        self.height = 0
+
+    # ---------- 내부 ----------
+    def _cell_x(self, col: int) -> float:
+        return self.row_label_width + col * (self.cell_width + self.gap)
+
+    def _cell_y(self, row: int) -> float:
+        return self.header_height + row * (self.cell_height + self.gap)
+
+    def _border(self, x: float, y: float) -> cv.Rect:
+        return cv.Rect(
+            x, y, self.cell_width, self.cell_height,
+            border_radius=4,
+            paint=ft.Paint(color=ft.Colors.GREY_200, stroke_width=1, style=ft.PaintingStyle.STROKE),
+        )
+
+    def _paint(self, rect: cv.Rect, text: cv.Text, count: int, ratio: float):
+        # 색 진하기: 가능 인원 비율이 높을수록 진하게 (0.4 ~ 0.95)
+        opacity = 0.4 + 0.55 * ratio
+        rect.paint = ft.Paint(color=ft.Colors.with_opacity(opacity, self.base_color))
+
+        text.text = f"{count}"
+        text.style = ft.TextStyle(
+            size=12,
+            weight=ft.FontWeight.BOLD,
+            color=ft.Colors.WHITE if ratio > 0.5 else ft.Colors.BLACK,
+        )
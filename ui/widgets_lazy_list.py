@@ -0,0 +1,126 @@
+# ui/widgets_lazy_list.py
+from typing import Awaitable, Callable
+
+import flet as ft
+
+from ui.update_batcher import request_update
+
+LAZY_LIST_PAGE_SIZE = 20
+LAZY_LIST_LOAD_AHEAD_PX = 200  # 끝에서 이만큼 남으면 다음 페이지 로딩
+
+
+class LazyListView(ft.ListView):
+    """
+    긴 목록용 지연 로딩 ListView.
+
+    - item_extent 고정 → 클라이언트는 보이는 줄만 레이아웃
+    - 처음엔 한 페이지만 만들고, 스크롤이 끝에 가까워지면 다음 페이지를 만든다
+      (서버에서도 스크롤한 만큼만 컨트롤 생성/전송)
+
+    데이터 소스는 두 가지:
+    - show_rows(rows): 이미 메모리에 있는 row들 (예: 캐시된 주간 일정)
+    - show_loader(load_page): async load_page(offset, limit) -> rows (DB 페이지 조회)
+    """
+
+    def __init__(
+        self,
+        build_item: Callable[[dict], ft.Control],
+        empty_text: str = "항목이 없습니다.",
+        item_extent: int = 64,
+        height: int = 320,
+        page_size: int = LAZY_LIST_PAGE_SIZE,
+    ):
+        super().__init__()
+        self.build_item = build_item
+        self.empty_text = empty_text
+        self.item_extent = item_extent
+        self.height = height
+        self.spacing = 0
+        self.page_size = page_size
+        self.on_scroll_interval = 100
+        self.on_scroll = self._on_scroll
+
+        self._rows: list[dict] | None = None
+        self._load_page: Callable[[int, int], Awaitable[list[dict]]] | None = None
+        self._offset = 0
+        self._exhausted = True
+        self._loading = False
+        # show_* 가 다시 불리면 이전 소스의 늦은 응답은 버림
+        self._generation = 0
+
+    # ---------- 공개 메서드 ----------
+    def show_rows(self, rows: list[dict]):
+        """메모리에 있는 row들을 보여줌 (첫 페이지만 바로 만듦). update는 호출하는 쪽에서."""
+        self._reset()
+        self._rows = list(rows)
+        self._append(self._rows[:self.page_size])
+        self._offset = min(self.page_size, len(self._rows))
+        self._exhausted = self._offset >= len(self._rows)
+        self._show_empty_if_needed()
+
+    async def show_loader(self, load_page: Callable[[int, int], Awaitable[list[dict]]]):
+        """DB 페이지 조회 함수로 목록을 채움 (첫 페이지 로딩 후 update)."""
+        self._reset()
+        self._load_page = load_page
+        self._exhausted = False
+        await self._load_next()
+        self._show_empty_if_needed()
+        self._safe_update(reason="LazyListView.show_loader")
+
+    # ---------- 내부 ----------
+    def _reset(self):
+        self._generation += 1
+        self.controls = []
+        self._rows = None
+        self._load_page = None
+        self._offset = 0
+        self._exhausted = True
+        self._loading = False
+
+    def _append(self, rows: list[dict]):
+        for row in rows:
+            self.controls.append(self.build_item(row))
+
+    def _show_empty_if_needed(self):
+        if not self.controls:
+            self.controls.append(ft.Text(self.empty_text, size=12, color=ft.Colors.GREY))
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if self._exhausted or self._loading:
+            return
+        if e.pixels < e.max_scroll_extent - LAZY_LIST_LOAD_AHEAD_PX:
+            return
+        if self.page:
+            self.page.run_task(self._load_next_and_update)
+
+    async def _load_next_and_update(self):
+        await self._load_next()
+        self._safe_update(reason="LazyListView.load_next")
+
+    async def _load_next(self):
+        if self._exhausted or self._loading:
+            return
+
+        self._loading = True
+        generation = self._generation
+        try:
+            if self._rows is not None:
+                rows = self._rows[self._offset:self._offset + self.page_size]
+            else:
+                rows = await self._load_page(self._offset, self.page_size)
+        finally:
+            if generation == self._generation:
+                self._loading = False
+
+        if generation != self._generation:
+            return
+
+        self._append(rows)
+        self._offset += len(rows)
+        if len(rows) < self.page_size or (self._rows is not None and self._offset >= len(self._rows)):
+            self._exhausted = True
+
+    def _safe_update(self, reason: str):
+        # page가 붙어있을 때만, 세션 배처를 거쳐 이 리스트만 갱신
+        if self.page:
+            request_update(self.page, self, reason=reason)
@@ -16,9 +16,9 @@ class WeatherHeader(ft.Row):
     """
     상단에 현재 날씨를 간단히 보여주는 헤더.
 
-    DashboardView.did_mount() 에서
-        page.run_task(self.weather_header.fetch_weather)
-    로 비동기로 호출.
+    DashboardView.load_all() 에서
+        asyncio.gather(..., self.weather_header.fetch_weather())
+    로 다른 카드와 함께 비동기로 호출.
     """
 
     def __init__(self):
@@ -38,7 +38,7 @@ class WeatherHeader(ft.Row):
             ),
         ]
 
-    # ---------- 공개 메서드 (DashboardView에서 run_task로 호출) ----------
+    # ---------- 공개 메서드 (DashboardView.load_all에서 호출) ----------
     async def fetch_weather(self):
         """
         1) 캐시가 있으면 먼저 캐시 적용